@@ -24,6 +24,38 @@ class Config:
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID", "")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", "")
     S3_BUCKET = os.getenv("S3_BUCKET", "")
+    PDF_PROCESS_WORKERS = int(os.getenv("PDF_PROCESS_WORKERS", str(os.cpu_count() or 2)))
+    OCR_BACKEND = os.getenv("OCR_BACKEND", "textract").lower()
+    LOCAL_OCR_DPI = int(os.getenv("LOCAL_OCR_DPI", "300"))
+    LOCAL_OCR_LANGUAGE = os.getenv("LOCAL_OCR_LANGUAGE", "spa")
+    PAGE_PRUNING_ENABLED = os.getenv("PAGE_PRUNING_ENABLED", "true").lower() == "true"
+    PAGE_PRUNING_MIN_PAGES = int(os.getenv("PAGE_PRUNING_MIN_PAGES", "3"))
+    PAGE_PRUNING_SAMPLE_DPI = int(os.getenv("PAGE_PRUNING_SAMPLE_DPI", "72"))
+    BROWSER_POOL_MAX_CONTEXTS = int(os.getenv("BROWSER_POOL_MAX_CONTEXTS", "4"))
+    BROWSER_POOL_MAX_USES = int(os.getenv("BROWSER_POOL_MAX_USES", "50"))
+    BROWSER_POOL_HEADLESS = os.getenv("BROWSER_POOL_HEADLESS", "true").lower() == "true"
+    BROWSER_BLOCK_RESOURCES = os.getenv("BROWSER_BLOCK_RESOURCES", "true").lower() == "true"
+    BROWSER_BLOCKED_RESOURCE_TYPES = os.getenv("BROWSER_BLOCKED_RESOURCE_TYPES", "image,media,font")
+    BROWSER_BLOCKED_HOSTS = os.getenv("BROWSER_BLOCKED_HOSTS", "google-analytics.com,googletagmanager.com,doubleclick.net,facebook.net,hotjar.com")
+    BROWSER_ALLOWED_HOSTS = os.getenv("BROWSER_ALLOWED_HOSTS", "")
+    PJUD_DOWNLOAD_CONCURRENCY = int(os.getenv("PJUD_DOWNLOAD_CONCURRENCY", "4"))
+    PJUD_PROCESSING_CONCURRENCY = int(os.getenv("PJUD_PROCESSING_CONCURRENCY", "3"))
+    PJUD_BATCH_WORKERS = int(os.getenv("PJUD_BATCH_WORKERS", "2"))
+    PJUD_BATCH_MAX_ATTEMPTS = int(os.getenv("PJUD_BATCH_MAX_ATTEMPTS", "2"))
+    PJUD_BATCH_CONTEXT_MAX_CASES = int(os.getenv("PJUD_BATCH_CONTEXT_MAX_CASES", "25"))
+    PJUD_HOST_MAX_CONCURRENCY = int(os.getenv("PJUD_HOST_MAX_CONCURRENCY", "2"))
+    PJUD_HOST_MIN_INTERVAL = float(os.getenv("PJUD_HOST_MIN_INTERVAL", "2.0"))
+    PJUD_NOTEBOOK_SNAPSHOT_TTL = int(os.getenv("PJUD_NOTEBOOK_SNAPSHOT_TTL", "3600"))
+    PJUD_NOTEBOOK_SNAPSHOT_MAX_ENTRIES = int(os.getenv("PJUD_NOTEBOOK_SNAPSHOT_MAX_ENTRIES", "256"))
+    PJUD_SESSION_TTL = int(os.getenv("PJUD_SESSION_TTL", "1200"))
+    PJUD_SESSION_MAX_ENTRIES = int(os.getenv("PJUD_SESSION_MAX_ENTRIES", "100"))
+    PJUD_SUBMISSION_WORKERS = int(os.getenv("PJUD_SUBMISSION_WORKERS", "2"))
+    PJUD_SUBMISSION_MAX_ATTEMPTS = int(os.getenv("PJUD_SUBMISSION_MAX_ATTEMPTS", "3"))
+    PJUD_DEMAND_LIST_MAX_AGE = int(os.getenv("PJUD_DEMAND_LIST_MAX_AGE", "300"))
+    PROBABLE_STATS_CACHE_TTL = int(os.getenv("PROBABLE_STATS_CACHE_TTL", "3600"))
+    PROBABLE_STATS_CACHE_MAX_ENTRIES = int(os.getenv("PROBABLE_STATS_CACHE_MAX_ENTRIES", "1024"))
+    CASE_STATS_ENGINE_ENABLED = os.getenv("CASE_STATS_ENGINE_ENABLED", "true").lower() == "true"
+    CASE_STATS_ENGINE_REFRESH_INTERVAL = int(os.getenv("CASE_STATS_ENGINE_REFRESH_INTERVAL", "300"))
     TWO_CAPTCHA_KEY = os.getenv("TWO_CAPTCHA_KEY", "")
     DEBUG_MODE = os.getenv("DEBUG_MODE", "false").lower() == "true"
     MAX_FILE_SIZE_MB = 4
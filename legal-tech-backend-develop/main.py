@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from config import Config
 from database import ext_db
 from middleware.auth_middleware import OptimizedAuthMiddleware
 from routers.analyzer import router as analyze_router
@@ -22,6 +23,9 @@ from routers.tribunal import router as tribunal_router
 from routers.court import router as court_router
 from routers.law_firm import router as law_firm_router
 from routers.receptor import router as receptor_router
+from services.information.case_stats_engine import get_case_stats_engine
+from services.pjud.browser_pool import get_browser_pool
+from services.pjud.demand_queue import get_demand_submission_queue
 
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:\t  %(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
@@ -32,7 +36,15 @@ logging.getLogger("sqlalchemy.pool").setLevel(logging.ERROR)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     ext_db.init_db()
+    browser_pool = get_browser_pool()
+    await browser_pool.start()
+    case_stats_engine = get_case_stats_engine()
+    if Config.CASE_STATS_ENGINE_ENABLED:
+        await case_stats_engine.start()
     yield
+    await case_stats_engine.stop()
+    await get_demand_submission_queue().stop()
+    await browser_pool.stop()
 
 
 app = FastAPI(
@@ -0,0 +1,59 @@
+"""add pjud batch scrape tables
+
+Revision ID: 5b1e7c9a2d84
+Revises: 03c096fd0341
+Create Date: 2026-10-19 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c9a2d84'
+down_revision: Union[str, None] = '03c096fd0341'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('pjud_batch_scrapes',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('save_to_db', sa.Boolean(), nullable=False),
+    sa.Column('total_cases', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('pjud_batch_scrape_cases',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('batch_id', sa.Uuid(), nullable=False),
+    sa.Column('case_id', sa.Uuid(), nullable=False),
+    sa.Column('case_number', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('tribunal_id', sa.Uuid(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('total_items', sa.Integer(), nullable=True),
+    sa.Column('failure_reason', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+    sa.Column('failure_detail', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('duration', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['batch_id'], ['pjud_batch_scrapes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['case_id'], ['case.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pjud_batch_scrape_cases_batch_id'), 'pjud_batch_scrape_cases', ['batch_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pjud_batch_scrape_cases_batch_id'), table_name='pjud_batch_scrape_cases')
+    op.drop_table('pjud_batch_scrape_cases')
+    op.drop_table('pjud_batch_scrapes')
@@ -0,0 +1,46 @@
+"""add pjud demand submissions table
+
+Revision ID: 8c4f2a6d1e37
+Revises: 5b1e7c9a2d84
+Create Date: 2026-10-19 15:40:08.917342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f2a6d1e37'
+down_revision: Union[str, None] = '5b1e7c9a2d84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('pjud_demand_submissions',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('idempotency_key', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('rut', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('plaintiff_identifier', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('response_status', sa.Integer(), nullable=True),
+    sa.Column('message', sa.Text(), nullable=True),
+    sa.Column('case_id', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('duration', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['case_id'], ['case.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pjud_demand_submissions_idempotency_key'), 'pjud_demand_submissions', ['idempotency_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pjud_demand_submissions_idempotency_key'), table_name='pjud_demand_submissions')
+    op.drop_table('pjud_demand_submissions')
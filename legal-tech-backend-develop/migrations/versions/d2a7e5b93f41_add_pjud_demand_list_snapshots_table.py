@@ -0,0 +1,36 @@
+"""add pjud demand list snapshots table
+
+Revision ID: d2a7e5b93f41
+Revises: 8c4f2a6d1e37
+Create Date: 2026-10-19 17:05:52.264810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7e5b93f41'
+down_revision: Union[str, None] = '8c4f2a6d1e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('pjud_demand_list_snapshots',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('rut', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('hashed_password', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('demands', sa.JSON(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pjud_demand_list_snapshots_rut'), 'pjud_demand_list_snapshots', ['rut'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pjud_demand_list_snapshots_rut'), table_name='pjud_demand_list_snapshots')
+    op.drop_table('pjud_demand_list_snapshots')
@@ -0,0 +1,98 @@
+"""Add event summary columns to CaseStats
+
+Revision ID: e5c81f3a9b27
+Revises: d2a7e5b93f41
+Create Date: 2026-10-19 18:12:41.503127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c81f3a9b27'
+down_revision: Union[str, None] = 'd2a7e5b93f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('casestats', sa.Column('event_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('casestats', sa.Column('first_event_date', sa.Date(), nullable=True))
+    # El trigger que mantiene la duración también mantiene el resumen de eventos
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION update_case_duration() 
+        RETURNS TRIGGER AS $$
+        DECLARE
+            cs_id uuid;
+        BEGIN
+            -- Get the associated case_stats id from the event row.
+            cs_id := COALESCE(NEW.case_stats_id, OLD.case_stats_id);
+            
+            -- Update duration, event count and first event date of the corresponding case_stats row.
+            UPDATE casestats
+            SET duration = summary.duration,
+                event_count = summary.event_count,
+                first_event_date = summary.first_event_date
+            FROM (
+                SELECT (MAX(creation_date) - MIN(creation_date)) AS duration,
+                       COUNT(*) AS event_count,
+                       MIN(creation_date) AS first_event_date
+                FROM casestatsevent
+                WHERE case_stats_id = cs_id
+            ) AS summary
+            WHERE id = cs_id;
+            
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        UPDATE casestats
+        SET event_count = summary.event_count,
+            first_event_date = summary.first_event_date
+        FROM (
+            SELECT case_stats_id, COUNT(*) AS event_count, MIN(creation_date) AS first_event_date
+            FROM casestatsevent
+            GROUP BY case_stats_id
+        ) AS summary
+        WHERE casestats.id = summary.case_stats_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION update_case_duration() 
+        RETURNS TRIGGER AS $$
+        DECLARE
+            new_duration INTEGER;
+            cs_id uuid;
+        BEGIN
+            -- Get the associated case_stats id from the event row.
+            cs_id := COALESCE(NEW.case_stats_id, OLD.case_stats_id);
+            
+            -- Calculate duration in days using the earliest and latest event dates.
+            SELECT (MAX(creation_date) - MIN(creation_date))
+            INTO new_duration
+            FROM casestatsevent
+            WHERE case_stats_id = cs_id;
+            
+            -- Update the corresponding case_stats row.
+            UPDATE casestats
+            SET duration = new_duration
+            WHERE id = cs_id;
+            
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.drop_column('casestats', 'first_event_date')
+    op.drop_column('casestats', 'event_count')
@@ -0,0 +1,53 @@
+"""add hot query indexes
+
+Revision ID: f3b9d61c4a58
+Revises: e5c81f3a9b27
+Create Date: 2026-10-19 19:03:27.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d61c4a58'
+down_revision: Union[str, None] = 'e5c81f3a9b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nombre, tabla, columnas, opciones de create_index)
+INDEXES = [
+    ('ix_caseevent_case_id_created_at', 'caseevent', ['case_id', 'created_at'], {}),
+    ('ix_caseevent_case_id_type_live', 'caseevent', ['case_id', 'type'], {'postgresql_where': sa.text('simulated = false')}),
+    ('ix_case_created_at_id', 'case', ['created_at', 'id'], {}),
+    ('ix_case_status', 'case', ['status'], {}),
+    ('ix_litigant_case_id_role', 'litigant', ['case_id', 'role'], {}),
+    ('ix_document_case_event_id', 'document', ['case_event_id'], {}),
+    ('ix_caseeventsuggestion_case_event_id', 'caseeventsuggestion', ['case_event_id'], {}),
+    ('ix_courtcase_case_id', 'courtcase', ['case_id'], {}),
+    ('ix_casedetail_case_id', 'casedetail', ['case_id'], {}),
+    ('ix_action_case_id', 'action', ['case_id'], {}),
+    ('ix_casestats_bank_legal_stage', 'casestats', ['bank', 'legal_stage'], {}),
+    ('ix_casestats_case_type_currency_amount', 'casestats', ['case_type', 'currency', 'amount'], {}),
+    ('ix_casestats_title_trgm', 'casestats', ['title'], {'postgresql_using': 'gin', 'postgresql_ops': {'title': 'gin_trgm_ops'}}),
+    ('ix_casestatsevent_case_stats_id', 'casestatsevent', ['case_stats_id'], {}),
+    ('ix_casestatsevent_type_case_stats_id', 'casestatsevent', ['type', 'case_stats_id'], {}),
+    ('ix_pjud_folios_created_at_id_active', 'pjud_folios', ['created_at', 'id'], {'postgresql_where': sa.text('is_active = true')}),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY no bloquea escrituras en tablas grandes, pero no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True, **options)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -32,11 +32,25 @@ from .information import (
     CaseStatsInformation,
     CaseStatsResponse,
     LitigantInformation,
+    SimilarCaseStatsInformation,
+    SimilarCaseStatsResponse,
 )
 from .legal_compromise import (
     LegalCompromiseGenerationResponse,
 )
 from .suggestion import SuggestionRequest, SuggestionResponse
+from .browser_pool import BrowserPoolMetricsResponse
+from .pjud_batch_scrape import (
+    BatchScrapeCaseRequest,
+    BatchScrapeCaseResponse,
+    BatchScrapeRequest,
+    BatchScrapeResponse,
+)
+from .pjud_demand_submission import (
+    DemandSubmissionQueueMetricsResponse,
+    DemandSubmissionQueueResponse,
+    DemandSubmissionResponse,
+)
 from .pjud_folio import (
     FolioResponse,
     PaginatedFoliosResponse,
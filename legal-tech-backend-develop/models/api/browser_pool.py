@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+
+class BrowserPoolMetricsResponse(BaseModel):
+    """Response model for the shared Chromium pool utilisation"""
+    started: bool
+    browser_connected: bool
+    max_contexts: int
+    max_browser_uses: int
+    active_contexts: int
+    waiting_requests: int
+    peak_active_contexts: int
+    utilisation: float
+    current_browser_uses: int
+    total_contexts: int
+    browsers_launched: int
+    browsers_recycled: int
+    browsers_crashed: int
+    average_wait_time: float
+    blocked_requests: int
+    allowed_requests: int
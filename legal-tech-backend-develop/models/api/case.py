@@ -73,4 +73,5 @@ class ActionResponse(BaseModel):
 
 class ActionsResponse(BaseModel):
     actions: list[ActionResponse] = Field(..., description="List of actions")
-    total_count: int = Field(..., description="Total number of actions")
+    total_count: int | None = Field(..., description="Total number of actions")
+    next_cursor: str | None = Field(None, description="Cursor of the next page, None on the last page or without cursor pagination")
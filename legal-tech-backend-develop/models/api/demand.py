@@ -1,4 +1,5 @@
 import json
+from datetime import datetime
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -31,11 +32,13 @@ class DemandDeleteResponse(DemandBaseResponse):
 
 
 class DemandListGetRequest(DemandBaseRequest):
-    pass
+    refresh: bool = Field(False, description="Refresh the demand list from PJUD even if the stored snapshot is fresh")
 
 
 class DemandListGetResponse(DemandBaseResponse):
     data: list[DemandInformation] = Field([], description="Demand list")
+    fetched_at: datetime | None = Field(None, description="When the demand list was scraped from PJUD")
+    cached: bool = Field(False, description="Whether the demand list was served from the stored snapshot")
 
 
 class DemandSendRequest(DemandBaseRequest):
@@ -37,4 +37,21 @@ class CaseStatsInformation(BaseModel):
 
 class CaseStatsResponse(BaseModel):
     cases: list[CaseStatsInformation] = Field([], description="Cases information")
-    case_count: int = Field(0, description="Total amount of cases after applying filters")
+    case_count: int | None = Field(0, description="Total amount of cases after applying filters")
+    next_cursor: str | None = Field(None, description="Cursor of the next page, None on the last page or without cursor pagination")
+
+
+class SimilarCaseStatsInformation(BaseModel):
+    id: str = Field(..., description="Case stats ID")
+    title: str = Field(..., description="Case title")
+    bank: str = Field(..., description="Bank name")
+    amount: float | None = Field(None, description="Amount to pay")
+    currency: str | None = Field(None, description="Amount currency")
+    duration: int | None = Field(None, description="Case duration in days")
+    legal_stage: str = Field(..., description="Current legal stage")
+    result: str | None = Field(None, description="Case result")
+    distance: float = Field(..., description="Distance to the case by amount and duration, in standard deviations")
+
+
+class SimilarCaseStatsResponse(BaseModel):
+    cases: list[SimilarCaseStatsInformation] = Field([], description="Closest finished cases, closest first")
@@ -0,0 +1,48 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class BatchScrapeCaseRequest(BaseModel):
+    """Case to scrape in a PJUD batch"""
+    case_id: UUID
+    case_number: str = Field(..., max_length=20)
+    year: int
+    tribunal_id: UUID
+
+
+class BatchScrapeRequest(BaseModel):
+    """Request model for a PJUD batch scrape"""
+    cases: list[BatchScrapeCaseRequest] = Field(..., min_length=1)
+    save_to_db: bool = True
+
+
+class BatchScrapeCaseResponse(BaseModel):
+    """Response model for the outcome of one case of a PJUD batch scrape"""
+    case_id: UUID
+    case_number: str
+    year: int
+    status: str
+    attempts: int
+    total_items: int | None
+    failure_reason: str | None
+    failure_detail: str | None
+    duration: float | None
+
+
+class BatchScrapeResponse(BaseModel):
+    """Response model for a PJUD batch scrape with its throughput"""
+    id: UUID
+    status: str
+    total_cases: int
+    succeeded_cases: int
+    failed_cases: int
+    pending_cases: int
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    elapsed_time: float | None
+    cases_per_minute: float | None
+    failure_reasons: dict[str, int]
+    cases: list[BatchScrapeCaseResponse]
@@ -0,0 +1,39 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class DemandSubmissionResponse(BaseModel):
+    """Response model for the status of a queued demand submission"""
+    id: UUID
+    idempotency_key: str
+    title: str | None
+    status: str
+    attempts: int
+    response_status: int | None
+    message: str | None
+    case_id: UUID | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    duration: float | None
+    duplicate: bool = Field(False, description="Whether a submission with the same idempotency key was already queued or filed")
+
+
+class DemandSubmissionQueueResponse(BaseModel):
+    """Response model for a list of demands enqueued at once"""
+    submissions: list[DemandSubmissionResponse]
+
+
+class DemandSubmissionQueueMetricsResponse(BaseModel):
+    """Response model for the throughput of the demand submission queue"""
+    workers: int
+    queued: int
+    in_flight: int
+    enqueued: int
+    duplicates: int
+    succeeded: int
+    failed: int
+    average_duration: float
+    submissions_per_minute: float | None
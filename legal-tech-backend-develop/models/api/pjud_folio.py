@@ -26,12 +26,13 @@ class FolioResponse(BaseModel):
 class PaginatedFoliosResponse(BaseModel):
     """Response model for paginated folios"""
     items: List[FolioResponse]
-    total: int
+    total: Optional[int]
     offset: int
     limit: int
-    total_pages: int
+    total_pages: Optional[int]
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
 
 
 class FoliosStatsResponse(BaseModel):
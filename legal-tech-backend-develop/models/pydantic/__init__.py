@@ -89,6 +89,7 @@ from .pjud import (
     PJUDDDO,
     PJUDLegalRepresentative,
     PJUDRegion,
+    PJUDStepTiming,
     PJUDStreetType,
 )
 from .plaintiff import Plaintiff
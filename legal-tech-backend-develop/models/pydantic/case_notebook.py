@@ -1,6 +1,9 @@
+from datetime import datetime
 from typing import Optional, Union
 from pydantic import BaseModel, Field, field_validator
 
+from .pjud import PJUDStepTiming
+
 
 class CaseNotebookRequest(BaseModel):
     """Request model for case notebook extraction from PJUD"""
@@ -9,6 +12,7 @@ class CaseNotebookRequest(BaseModel):
     tribunal_id: Union[int, str] = Field(1, description="Tribunal ID (can be int or string, validated against available tribunals)")
     debug: bool = False
     save_to_db: bool = False
+    incremental: bool = Field(False, description="Only read and process the folios newer than the highest folio already stored for the case")
     
     @field_validator('tribunal_id')
     @classmethod
@@ -47,6 +51,7 @@ class CaseNotebookResponse(BaseModel):
     status: int
     data: list[CaseNotebookItem]
     total_items: int
+    timings: Optional[list[PJUDStepTiming]] = Field(None, description="Time spent on each step of the scrape")
 
 
 class PaginatedCaseNotebookResponse(BaseModel):
@@ -60,3 +65,6 @@ class PaginatedCaseNotebookResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    cached: bool = Field(False, description="Whether the page was served from a snapshot instead of a fresh scrape")
+    scraped_at: Optional[datetime] = Field(None, description="When the notebook was scraped from PJUD")
+    timings: Optional[list[PJUDStepTiming]] = Field(None, description="Time spent on each step of the scrape that produced the notebook")
@@ -575,3 +575,9 @@ class PJUDDDO(BaseModel):
     identifier: str = Field(..., description="RUT of the DDO. entity")
     legal_representatives: list[PJUDLegalRepresentative] = Field(default_factory=list, description="Legal representatives of the DDO. entity, if any")
     addresses: list[PJUDAddress] = Field(..., description="DDO. entity addresses")
+
+
+class PJUDStepTiming(BaseModel):
+    """Time spent on one step of a PJUD automation run."""
+    step: str = Field(..., description="Step name")
+    duration: float = Field(..., description="Duration of the step in seconds")
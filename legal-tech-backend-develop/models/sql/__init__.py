@@ -5,6 +5,9 @@ from .court import Court, CourtCase
 from .document import Document
 from .law_firm import LawFirm
 from .litigant import Litigant, LitigantRole
+from .pjud_batch_scrape import PJUDBatchScrape, PJUDBatchScrapeCase, PJUDBatchScrapeCaseStatus, PJUDBatchScrapeStatus
+from .pjud_demand_list import PJUDDemandListSnapshot
+from .pjud_demand_submission import PJUDDemandSubmission, PJUDDemandSubmissionStatus
 from .pjud_folio import PJUDFolio
 from .receptor import Receptor, ReceptorDetail
 from .statistic import CaseStats, CaseStatsEvent
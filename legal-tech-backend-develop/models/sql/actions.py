@@ -14,6 +14,7 @@ class Action(SQLModel, table=True):
         foreign_key="case.id",
         ondelete="CASCADE",
         nullable=False,
+        index=True,
         description="Case ID",
     )
     case: "Case" = Relationship(back_populates="actions")
@@ -3,7 +3,7 @@ from datetime import datetime, date
 from typing import Any
 
 from pydantic import model_validator
-from sqlalchemy import Column, DateTime, Enum as SQLAlchemyEnum, ForeignKey, JSON
+from sqlalchemy import Column, DateTime, Enum as SQLAlchemyEnum, ForeignKey, Index, JSON, text
 from sqlalchemy.sql import func
 from sqlmodel import Field, SQLModel, Relationship
 from uuid import UUID, uuid4
@@ -126,6 +126,11 @@ class CaseEvent(SQLModel, table=True):
         back_populates="case_event",
     )
 
+    __table_args__ = (
+        Index("ix_caseevent_case_id_created_at", "case_id", "created_at"),
+        Index("ix_caseevent_case_id_type_live", "case_id", "type", postgresql_where=text("simulated = false")),
+    )
+
 
     @model_validator(mode="before")
     def validate_event_chain(cls, values):
@@ -183,6 +188,11 @@ class Case(SQLModel, table=True):
         description="External recepthor system case ID for linking with other systems"
     )
 
+    __table_args__ = (
+        Index("ix_case_created_at_id", "created_at", "id"),
+        Index("ix_case_status", "status"),
+    )
+
     @model_validator(mode="before")
     def validate_winner(cls, values):
         status = values.get("status")
@@ -16,6 +16,7 @@ class CaseDetail(SQLModel, table=True):
         foreign_key="case.id",
         ondelete="CASCADE",
         nullable=False,
+        index=True,
         description="Case ID",
     )
     case: "Case" = Relationship(back_populates="details")
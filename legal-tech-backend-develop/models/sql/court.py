@@ -162,6 +162,7 @@ class CourtCase(SQLModel, table=True):
         foreign_key="case.id",
         ondelete="CASCADE",
         nullable=False,
+        index=True,
         description="Case ID",
     )
     case: "Case" = Relationship(
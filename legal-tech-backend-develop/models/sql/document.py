@@ -37,6 +37,7 @@ class Document(SQLModel, table=True):
         ondelete="CASCADE",
         foreign_key="caseevent.id",
         nullable=True,
+        index=True,
         description="CaseEvent ID",
     )
     case_event: "CaseEvent" = Relationship(
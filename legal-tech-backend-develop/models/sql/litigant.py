@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, Enum as SQLAlchemyEnum, ForeignKey
+from sqlalchemy import Column, Enum as SQLAlchemyEnum, ForeignKey, Index
 from sqlmodel import Field, SQLModel, Relationship
 from uuid import UUID, uuid4
 
@@ -69,3 +69,7 @@ class Litigant(SQLModel, table=True):
     )
     simulated: bool = Field(False, description="Whether the litigant is simulated or not")
     is_co_debtor: bool = Field(False, description="Whether the litigant is a co debtor or not")
+
+    __table_args__ = (
+        Index("ix_litigant_case_id_role", "case_id", "role"),
+    )
@@ -0,0 +1,65 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID, uuid4
+
+from sqlalchemy import Column, Text
+from sqlmodel import Field, SQLModel, Relationship
+
+
+class PJUDBatchScrapeStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class PJUDBatchScrapeCaseStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class PJUDBatchScrape(SQLModel, table=True):
+    """Batch of case notebooks scraped from PJUD in a single run"""
+    __tablename__ = "pjud_batch_scrapes"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    status: str = Field(PJUDBatchScrapeStatus.PENDING.value, max_length=20, description="Batch status")
+    save_to_db: bool = Field(True, description="Whether the scraped folios are saved")
+    total_cases: int = Field(..., description="Number of cases in the batch")
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
+    started_at: datetime | None = Field(None, description="Start of the run")
+    finished_at: datetime | None = Field(None, description="End of the run")
+    cases: list["PJUDBatchScrapeCase"] = Relationship(
+        back_populates="batch",
+        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+    )
+
+
+class PJUDBatchScrapeCase(SQLModel, table=True):
+    """Outcome of one case of a PJUD batch scrape"""
+    __tablename__ = "pjud_batch_scrape_cases"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    batch_id: UUID = Field(
+        ...,
+        foreign_key="pjud_batch_scrapes.id",
+        ondelete="CASCADE",
+        index=True,
+        description="Batch ID",
+    )
+    batch: PJUDBatchScrape = Relationship(back_populates="cases")
+    case_id: UUID = Field(..., foreign_key="case.id", ondelete="CASCADE", description="Case ID")
+    case_number: str = Field(..., max_length=20, description="Case number (RIT)")
+    year: int = Field(..., description="Case year")
+    tribunal_id: UUID = Field(..., description="Tribunal ID")
+    position: int = Field(..., description="Position of the case in the batch")
+    status: str = Field(PJUDBatchScrapeCaseStatus.PENDING.value, max_length=20, description="Case status")
+    attempts: int = Field(0, description="Number of scraping attempts")
+    total_items: int | None = Field(None, description="Number of folios scraped")
+    failure_reason: str | None = Field(None, max_length=50, description="Failure category")
+    failure_detail: str | None = Field(None, sa_column=Column(Text), description="Failure message")
+    started_at: datetime | None = Field(None, description="Start of the first attempt")
+    finished_at: datetime | None = Field(None, description="End of the last attempt")
+    duration: float | None = Field(None, description="Scraping duration in seconds")
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID, uuid4
+
+from passlib.hash import bcrypt
+from sqlalchemy import Column, JSON
+from sqlmodel import Field, SQLModel
+
+
+class PJUDDemandListSnapshot(SQLModel, table=True):
+    """Last demand list scraped from the PJUD account of a RUT"""
+    __tablename__ = "pjud_demand_list_snapshots"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    rut: str = Field(..., max_length=20, unique=True, index=True, description="PJUD RUT")
+    hashed_password: str = Field(..., description="Hashed PJUD password, required to read the snapshot")
+    demands: list[dict[str, Any]] = Field(
+        default_factory=list,
+        sa_column=Column(JSON, nullable=False),
+        description="Demand list as JSON, in PJUD order",
+    )
+    fetched_at: datetime = Field(default_factory=datetime.utcnow, description="When the demand list was scraped")
+
+    def set_password(self, password: str) -> None:
+        self.hashed_password = bcrypt.hash(password)
+
+    def verify_password(self, password: str) -> bool:
+        return bcrypt.verify(password, self.hashed_password)
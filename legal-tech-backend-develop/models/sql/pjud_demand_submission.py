@@ -0,0 +1,33 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID, uuid4
+
+from sqlalchemy import Column, Text
+from sqlmodel import Field, SQLModel
+
+
+class PJUDDemandSubmissionStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class PJUDDemandSubmission(SQLModel, table=True):
+    """Demand text queued to be filed in PJUD"""
+    __tablename__ = "pjud_demand_submissions"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    idempotency_key: str = Field(..., max_length=64, unique=True, index=True, description="Key identifying the demand, a retry with the same key is not filed twice")
+    rut: str = Field(..., max_length=20, description="PJUD RUT filing the demand")
+    plaintiff_identifier: str | None = Field(None, max_length=20, description="Plaintiff RUT")
+    title: str | None = Field(None, max_length=255, description="Plaintiff and defendants of the demand")
+    status: str = Field(PJUDDemandSubmissionStatus.QUEUED.value, max_length=20, description="Submission status")
+    attempts: int = Field(0, description="Number of filing attempts")
+    response_status: int | None = Field(None, description="HTTP status returned by the PJUD automation")
+    message: str | None = Field(None, sa_column=Column(Text), description="PJUD response or failure message")
+    case_id: UUID | None = Field(None, foreign_key="case.id", ondelete="SET NULL", description="Case created from the demand")
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="Enqueue timestamp")
+    started_at: datetime | None = Field(None, description="Start of the first attempt")
+    finished_at: datetime | None = Field(None, description="End of the last attempt")
+    duration: float | None = Field(None, description="Filing duration in seconds")
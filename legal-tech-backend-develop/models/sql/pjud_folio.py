@@ -1,5 +1,5 @@
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, UniqueConstraint, Date
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, UniqueConstraint, Date, Index, text
 from sqlmodel import Field, SQLModel
 
 
@@ -32,6 +32,7 @@ class PJUDFolio(SQLModel, table=True):
     
     __table_args__ = (
         UniqueConstraint('folio_number', 'case_number', 'year', 'procedure_description', name='uq_folio_case_year_description'),
+        Index('ix_pjud_folios_created_at_id_active', 'created_at', 'id', postgresql_where=text('is_active = true')),
     )
 
     def __repr__(self) -> str:
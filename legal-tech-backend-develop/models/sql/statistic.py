@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, ForeignKey, Index, event
 from sqlmodel import Field, SQLModel, Relationship
 from uuid import UUID, uuid4
 
@@ -15,6 +15,7 @@ class CaseStatsEvent(SQLModel, table=True):
         foreign_key="casestats.id",
         ondelete="CASCADE",
         nullable=False,
+        index=True,
         description="Case ID",
     )
     creation_date: date | None = Field(None, description="Event creation date")
@@ -23,6 +24,10 @@ class CaseStatsEvent(SQLModel, table=True):
     enumeration: str | None = Field(None, description="Event enumeration")
     page_index: int | None = Field(None, description="Event page index inside case ebook")
 
+    __table_args__ = (
+        Index("ix_casestatsevent_type_case_stats_id", "type", "case_stats_id"),
+    )
+
 
 class CaseStats(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
@@ -38,6 +43,18 @@ class CaseStats(SQLModel, table=True):
     currency: str | None = Field(None, description="Amount currency")
     result: str | None = Field(None, description="Case result")
     duration: int | None = Field(None, description="Case duration in days")
+    event_count: int = Field(0, description="Amount of case events, kept by a database trigger")
+    first_event_date: date | None = Field(None, description="Earliest event creation date, kept by a database trigger")
     events: list[CaseStatsEvent] = Relationship(
         back_populates="case_stats",
     )
+
+    __table_args__ = (
+        Index("ix_casestats_bank_legal_stage", "bank", "legal_stage"),
+        Index("ix_casestats_case_type_currency_amount", "case_type", "currency", "amount"),
+        Index("ix_casestats_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
+
+
+# El índice trigram del título necesita pg_trgm cuando la tabla se crea fuera de las migraciones
+event.listen(CaseStats.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
@@ -18,6 +18,7 @@ class CaseEventSuggestion(SQLModel, table=True):
         foreign_key="caseevent.id",
         ondelete="CASCADE",
         nullable=False,
+        index=True,
         description="CaseEvent ID",
     )
     case_event: "CaseEvent" = Relationship(
@@ -38,10 +38,23 @@ from services.tracker import CaseTracker
 from services.v2.document.dispatch_start.event_manager import DispatchStartEventManager
 from . import router
 from middleware.auth_middleware import get_current_session
+from util.pagination import CURSOR_DESCRIPTION, TOTAL_DESCRIPTION, InvalidCursor, TotalMode, count_rows, keyset_page
 
 
 MAX_RETRIES = 3
 
+# Etapa del listado de casos que marca el primer evento de cada tipo
+CASE_EVENT_STEPS = {
+    CaseEventType.DEMAND_START: "demand_start",
+    CaseEventType.DISPATCH_START: "dispatch_start",
+    CaseEventType.DISPATCH_RESOLUTION: "dipatch_resolution",
+    CaseEventType.EXCEPTIONS: "demand_exception",
+    CaseEventType.NOTIFICATION: "notification",
+    CaseEventType.TRANSLATION_EVACUATION: "translation_evacuation",
+    CaseEventType.ASSET_SEIZURE_ORDER: "asset_seizure",
+    CaseEventType.SENTENCE: "sentence",
+}
+
 
 # TODO: REMOVE WHEN TRACKED
 def simulate_first_documents_event_date(case_id: str, base_date: datetime) -> str:
@@ -63,17 +76,29 @@ async def get_cases(
     status: list[str] | None = Query(None, description="Filter by status (multi-select)"),
     order_by: str | None = Query(None, description="Field to order by: title, created_at, or events"),
     order_direction: str | None = Query("asc", description="Order direction: 'asc' or 'desc'"),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    total: TotalMode = Query(TotalMode.EXACT, description=TOTAL_DESCRIPTION),
     session: Session = Depends(get_current_session),
 ):
     """Returns all generated cases."""
     case_retriever = CaseRetriever()
     order_desc = order_direction.lower() == "desc" if order_direction else False
+    next_cursor: str | None = None
+    if cursor is not None and order_by and order_by.lower() != "created_at":
+        return error_response("Cursor pagination only supports ordering by created_at", 400)
     try:
-        case_count = case_retriever.get_case_count(session, status)
-        cases = case_retriever.get_cases(session, skip, limit, status, order_by, order_desc)
+        case_count = case_retriever.get_case_count(session, status, total)
+        if cursor is not None:
+            cases, next_cursor = case_retriever.get_cases_page(session, cursor, limit, status, order_desc)
+        else:
+            cases = case_retriever.get_cases(session, skip, limit, status, order_by, order_desc)
+        # Eventos y detalles de toda la página en una consulta cada uno, agrupados por caso
+        case_ids = [case.id for case in cases]
+        events_by_case = case_retriever.get_events_by_case(session, case_ids)
+        details_by_case = case_retriever.get_details_by_case(session, case_ids)
         information: list[CaseStatsInformation] = []
         for case in cases:
-            events = session.exec(select(CaseEvent).where(CaseEvent.case_id == case.id).order_by(CaseEvent.created_at)).all()
+            events = events_by_case.get(case.id, [])
             final_events: list[CaseStatsEventInformation] = [
                 CaseStatsEventInformation(type="documents")
             ]
@@ -84,64 +109,25 @@ async def get_cases(
                 simulated_date = simulate_first_documents_event_date(str(case.id), base_date)
                 final_events[0].date = simulated_date
 
-            for idx, sorted_event in enumerate(events):
+            # Solo el primer evento de cada tipo marca su etapa
+            seen_steps: set[str] = set()
+            for sorted_event in events:
+                step = CASE_EVENT_STEPS.get(sorted_event.type)
+                if step is None or step in seen_steps:
+                    continue
+                seen_steps.add(step)
                 final_date = None
                 if creation_date := sorted_event.created_at:
                     final_date = creation_date.isoformat()
-                if sorted_event.type == CaseEventType.DEMAND_START and not "demand_start" in [t.type for t in final_events]:
-                    final_events.append(
-                        CaseStatsEventInformation(date=final_date, type="demand_start")
-                    )
-                elif sorted_event.type in [CaseEventType.DISPATCH_START] and not "dispatch_start" in [t.type for t in final_events]:
-                    final_events.append(
-                        CaseStatsEventInformation(date=final_date, type="dispatch_start")
-                    )
-                elif sorted_event.type == CaseEventType.DISPATCH_RESOLUTION and not "dipatch_resolution" in [t.type for t in final_events]:
-                    final_events.append(
-                        CaseStatsEventInformation(date=final_date, type="dipatch_resolution")
-                    )
-                elif sorted_event.type == CaseEventType.EXCEPTIONS and not "demand_exception" in [t.type for t in final_events]:
-                    final_events.append(
-                        CaseStatsEventInformation(date=final_date, type="demand_exception")
-                    )
-                elif sorted_event.type == CaseEventType.NOTIFICATION and not "notification" in [t.type for t in final_events]:
-                    final_events.append(
-                        CaseStatsEventInformation(date=final_date, type="notification")
-                    )
-                elif sorted_event.type == CaseEventType.TRANSLATION_EVACUATION and not "translation_evacuation" in [t.type for t in final_events]:
-                    final_events.append(
-                        CaseStatsEventInformation(date=final_date, type="translation_evacuation")
-                    )
-                elif sorted_event.type == CaseEventType.ASSET_SEIZURE_ORDER and not "asset_seizure" in [t.type for t in final_events]:
-                    final_events.append(
-                        CaseStatsEventInformation(date=final_date, type="asset_seizure")
-                    )
-                elif sorted_event.type == CaseEventType.SENTENCE and not "sentence" in [t.type for t in final_events]:
-                    final_events.append(
-                        CaseStatsEventInformation(date=final_date, type="sentence")
-                    )
-                #elif sorted_event.type in [CaseEventType.SENTENCE] and not "finished" in [t.type for t in final_events]:
-                #    final_events.append(
-                #        CaseStatsEventInformation(date=final_date, type="finished")
-                #    )
-                # elif idx == len(events) - 1 and case.status in [CaseStatus.ARCHIVED, CaseStatus.FINISHED] and not "finished" in [t.type for t in final_events]:
-                #     final_events.append(
-                #         CaseStatsEventInformation(date=final_date, type="finished")
-                #     )
-
-            # Get case detail with tribunal and court information
-            case_detail = session.exec(
-                select(CaseDetail, Tribunal, Court)
-                .join(Tribunal, CaseDetail.tribunal_id == Tribunal.id)
-                .join(Court, CaseDetail.court_id == Court.id)
-                .where(CaseDetail.case_id == case.id)
-            ).first()
-            
+                final_events.append(
+                    CaseStatsEventInformation(date=final_date, type=step)
+                )
+
             court_name = "To be assigned"
             tribunal_name = "To be assigned"
             case_detail_obj = None
             
-            if case_detail:
+            if case_detail := details_by_case.get(case.id):
                 case_detail_obj, tribunal, court_obj = case_detail
                 tribunal_name = tribunal.name
                 court_name = court_obj.name
@@ -180,11 +166,14 @@ async def get_cases(
                     amount_currency=case.amount_currency.value if case.amount_currency else None,
                 )
             )
+    except InvalidCursor as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(f"Could not retrieve cases: {e}", 500, True)
     response = CaseStatsResponse(
         cases=information,
         case_count=case_count,
+        next_cursor=next_cursor,
     )
     return JSONResponse(status_code=200, content=response.model_dump())
 
@@ -193,17 +182,22 @@ async def get_cases(
 async def get_all_actions(
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination"),
     limit: int = Query(10, ge=1, description="Maximum number of records to return"),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    total: TotalMode = Query(TotalMode.EXACT, description=TOTAL_DESCRIPTION),
     session: Session = Depends(get_current_session),
 ):
     """Gets all actions created across all cases with pagination."""
+    next_cursor: str | None = None
     try:
         # Get total count
-        count_statement = select(func.count(Action.id))
-        total_count = session.exec(count_statement).first()
+        total_count = count_rows(session, select(Action), total)
         
         # Get paginated actions
-        statement = select(Action).offset(skip).limit(limit)
-        actions = session.exec(statement).all()
+        if cursor is not None:
+            actions, next_cursor = keyset_page(session, select(Action), [Action.id], lambda action: (action.id,), cursor, limit)
+        else:
+            statement = select(Action).offset(skip).limit(limit)
+            actions = session.exec(statement).all()
         
         action_responses = []
         for action in actions:
@@ -219,11 +213,14 @@ async def get_all_actions(
         
         response = ActionsResponse(
             actions=action_responses,
-            total_count=total_count
+            total_count=total_count,
+            next_cursor=next_cursor,
         )
         serialized_response = jsonable_encoder(response)
         return JSONResponse(status_code=200, content=serialized_response)
         
+    except InvalidCursor as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(f"Could not retrieve all actions: {e}", 500, True)
 
@@ -644,21 +641,27 @@ async def get_case_actions(
     case_id: UUID,
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination"),
     limit: int = Query(10, ge=1, description="Maximum number of records to return"),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    total: TotalMode = Query(TotalMode.EXACT, description=TOTAL_DESCRIPTION),
     session: Session = Depends(get_current_session),
 ):
     """Gets all actions for a specific case with pagination."""
+    next_cursor: str | None = None
     try:
         case = session.get(Case, case_id)
         if not case:
             return error_response(f"Case with ID {case_id} not found", 404, True)
         
         # Get total count for this case
-        count_statement = select(func.count(Action.id)).where(Action.case_id == case_id)
-        total_count = session.exec(count_statement).first()
+        case_actions = select(Action).where(Action.case_id == case_id)
+        total_count = count_rows(session, case_actions, total)
         
         # Get paginated actions for this case
-        statement = select(Action).where(Action.case_id == case_id).offset(skip).limit(limit)
-        actions = session.exec(statement).all()
+        if cursor is not None:
+            actions, next_cursor = keyset_page(session, case_actions, [Action.id], lambda action: (action.id,), cursor, limit)
+        else:
+            statement = case_actions.offset(skip).limit(limit)
+            actions = session.exec(statement).all()
         
         action_responses = []
         for action in actions:
@@ -674,11 +677,14 @@ async def get_case_actions(
         
         response = ActionsResponse(
             actions=action_responses,
-            total_count=total_count
+            total_count=total_count,
+            next_cursor=next_cursor,
         )
         serialized_response = jsonable_encoder(response)
         return JSONResponse(status_code=200, content=serialized_response)
         
+    except InvalidCursor as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(f"Could not retrieve actions: {e}", 500, True)
 
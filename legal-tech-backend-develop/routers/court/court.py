@@ -1,5 +1,5 @@
 import logging
-from fastapi import Depends, Query
+from fastapi import Depends, Query, Response
 from fastapi.responses import JSONResponse
 from sqlmodel import select
 from uuid import UUID
@@ -10,13 +10,16 @@ from models.api import (
 )
 from models.sql import Court
 from models.pydantic.court_response import CourtResponse
+from util.pagination import CURSOR_DESCRIPTION, NEXT_CURSOR_HEADER, InvalidCursor, keyset_page
 from . import router
 
 
 @router.get("", response_model=list[CourtResponse])
 async def get_courts(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination"),
     limit: int = Query(10, ge=1, description="Maximum number of records to return"),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
 ):
     """Returns all courts."""
     try:
@@ -26,8 +29,14 @@ async def get_courts(
         
         try:
             # Query courts with pagination
-            statement = select(Court).offset(skip).limit(limit)
-            courts = session.exec(statement).all()
+            if cursor is not None:
+                # El cursor de la página siguiente va en un header para no cambiar la lista de respuesta
+                courts, next_cursor = keyset_page(session, select(Court), [Court.id], lambda row: (row.id,), cursor, limit)
+                if next_cursor:
+                    response.headers[NEXT_CURSOR_HEADER] = next_cursor
+            else:
+                statement = select(Court).offset(skip).limit(limit)
+                courts = session.exec(statement).all()
             
             # Convert to response models
             result = []
@@ -43,6 +52,8 @@ async def get_courts(
         finally:
             session.close()
             
+    except InvalidCursor as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logging.error(f"Error getting courts: {e}")
         return error_response(f"Courts not found: {e}", 404, True)
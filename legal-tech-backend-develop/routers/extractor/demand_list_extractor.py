@@ -1,8 +1,10 @@
 import logging
 from fastapi import Body, Depends
+from sqlmodel import Session
 
+from database.ext_db import get_session
 from models.api import DemandListGetRequest, DemandListGetResponse, error_response
-from services.pjud import PJUDController
+from services.pjud.demand_list_snapshot import PJUDDemandListSnapshots
 from . import router
 
 
@@ -12,12 +14,16 @@ MAX_RETRIES = 3
 @router.post("/demand-list/", response_model=DemandListGetResponse)
 async def demand_list_post(
     input: DemandListGetRequest = Body(..., description="PJUD data"),
-    controller: PJUDController = Depends(),
+    session: Session = Depends(get_session),
+    snapshots: PJUDDemandListSnapshots = Depends(),
 ):
-    """Handles the extraction of demand information from PJUD."""
+    """
+    Handles the extraction of demand information from PJUD. The list is served from the account snapshot while it is
+    younger than PJUD_DEMAND_LIST_MAX_AGE seconds, unless `refresh` is set.
+    """
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            controller_response = await controller.get_demand_list_from_pjud(input)
+            controller_response = await snapshots.get_demand_list(session, input)
             if controller_response is not None:
                 return controller_response
         except Exception as e:
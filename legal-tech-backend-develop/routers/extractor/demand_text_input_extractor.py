@@ -83,7 +83,7 @@ async def demand_text_input_post(
                 logging.info(f"   📄 Procesamiento PDFs total: {real_pdf_time:.4f}s ({pdf_invocations} llamadas) - procesados en paralelo")
                 for i, submetric in enumerate(information.metrics.submetrics):
                     # Show Textract time
-                    textract_info = f" | Textract: {submetric.textract_time:.4f}s" if submetric.textract_time > 0 else ""
+                    textract_info = f" | Textract ({submetric.textract_mode}): {submetric.textract_time:.4f}s" if submetric.textract_time > 0 else ""
                     # Show individual OpenAI times (limit to first 5 for readability)
                     openai_times_str = ""
                     if submetric.openai_times:
@@ -1,18 +1,21 @@
 from datetime import datetime, time
+from uuid import UUID
 from fastapi import Depends, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 from sqlmodel import Session, select
 
 from database.ext_db import Session
-from models.api import error_response
+from models.api import SimilarCaseStatsInformation, SimilarCaseStatsResponse, error_response
 from models.api.information import (
     CaseStatsResponse,
     CaseStatsInformation,
     CaseStatsEventInformation,
 )
-from models.sql import Case, CaseEvent, CaseEventType, CaseStatus, CourtCase, CaseParty, CaseStatsEvent, CaseDetail, Tribunal, Court
+from models.sql import Case, CaseEvent, CaseEventType, CaseStatus, CourtCase, CaseParty, CaseStats, CaseStatsEvent
 from services.information import CaseRetriever, Statistics
+from services.information.case_stats_engine import get_case_stats_engine
 from middleware.auth_middleware import get_current_session
+from util.pagination import CURSOR_DESCRIPTION, TOTAL_DESCRIPTION, InvalidCursor, TotalMode
 from . import router
 
 
@@ -24,22 +27,34 @@ async def get_cases(
     status: list[str] | None = Query(None, description="Filter by status (multi-select)"),
     order_by: str | None = Query(None, description="Field to order by: title, created_at, or events"),
     order_direction: str | None = Query("asc", description="Order direction: 'asc' or 'desc'"),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    total: TotalMode = Query(TotalMode.EXACT, description=TOTAL_DESCRIPTION),
     session: Session = Depends(get_current_session),
 ):
     """Returns statistical information about cases."""
     statistics = Statistics()
     order_desc = order_direction.lower() == "desc" if order_direction else False
+    next_cursor: str | None = None
+    if cursor is not None and order_by:
+        return error_response("Cursor pagination does not support order_by", 400)
     try:
-        case_count = statistics.get_case_count(session, bank, status)
-        cases = statistics.get_cases(
-            session,
-            skip,
-            limit,
-            bank,
-            status,
-            order_by,
-            order_desc,
-        )
+        case_count = statistics.get_case_count(session, bank, status, total)
+        if cursor is not None:
+            cases, next_cursor = statistics.get_cases_page(session, cursor, limit, bank, status, order_desc)
+        else:
+            cases = statistics.get_cases(
+                session,
+                skip,
+                limit,
+                bank,
+                status,
+                order_by,
+                order_desc,
+            )
+        # Eventos y detalles de toda la página en una consulta cada uno
+        case_ids = [case.id for case in cases]
+        events_by_case = statistics.get_events_by_case(session, case_ids)
+        details_by_case = CaseRetriever().get_details_by_case(session, case_ids)
         information: list[CaseStatsInformation] = []
         for case in cases:
             status = "active"
@@ -47,7 +62,7 @@ async def get_cases(
                 status = case.legal_stage
             
             created_at: str | None = None
-            events = statistics.get_case_events(session, case.id)
+            events = events_by_case.get(case.id, [])
             sorted_events: list[CaseStatsEvent] = sorted(
                 (e for e in events if e.creation_date is not None),
                 key=lambda e: e.creation_date
@@ -83,16 +98,10 @@ async def get_cases(
                         CaseStatsEventInformation(date=final_date, type="finished")
                     )
 
-            case_detail_obj = session.exec(
-                select(CaseDetail, Tribunal, Court)
-                .join(Tribunal, CaseDetail.tribunal_id == Tribunal.id)
-                .join(Court, CaseDetail.court_id == Court.id)
-                .where(CaseDetail.case_id == case.id)
-            ).first()
             court = "To be assigned"
             tribunal = "To be assigned"
-            if case_detail_obj:
-                tribunal_obj, court_obj = case_detail_obj
+            if case_detail_obj := details_by_case.get(case.id):
+                _, tribunal_obj, court_obj = case_detail_obj
                 tribunal = tribunal_obj.name
                 court = court_obj.name
                 
@@ -128,11 +137,14 @@ async def get_cases(
                     simulated=False,
                 )
             )
+    except InvalidCursor as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(f"Could not retrieve cases: {e}", 500, True)
     response = CaseStatsResponse(
         cases=information,
         case_count=case_count,
+        next_cursor=next_cursor,
     )
     return JSONResponse(status_code=200, content=response.model_dump())
 
@@ -150,7 +162,51 @@ async def get_cases(
 async def get_cases_csv(bank: str, session: Session = Depends(get_current_session)):
     """Returns statistical information about bank cases as csv files."""
     statistics = Statistics()
-    zip_buffer = statistics.get_cases_csv(session, bank)
-    return StreamingResponse(zip_buffer, media_type="application/zip", headers={
+    return StreamingResponse(statistics.iter_cases_csv(bank), media_type="application/zip", headers={
         "Content-Disposition": "attachment; filename=casos.zip"
     })
+
+
+@router.get("/similar-cases/{case_id}/", response_model=SimilarCaseStatsResponse)
+async def get_similar_cases(
+    case_id: UUID,
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of similar cases to return"),
+    duration: int | None = Query(None, ge=0, description="Expected duration in days to also compare by"),
+    session: Session = Depends(get_current_session),
+):
+    """Returns the finished historical cases closest to a case by amount, duration and legal stage."""
+    engine = get_case_stats_engine()
+    if not engine.ready:
+        return error_response("Similar cases are not loaded yet", 503)
+    case = session.get(Case, case_id)
+    if case is None:
+        return error_response("Case not found", 404)
+    if not case.amount_currency or case.amount is None:
+        return JSONResponse(status_code=200, content=SimilarCaseStatsResponse().model_dump())
+
+    statistics = Statistics()
+    nearest = engine.nearest_cases(
+        statistics.get_case_type(case),
+        case.amount_currency.value,
+        case.amount,
+        duration=duration,
+        stage=statistics.get_case_legal_stage(session, case),
+        limit=limit,
+    )
+    rows = {row.id: row for row in session.exec(select(CaseStats).where(CaseStats.id.in_([case_stats_id for case_stats_id, _ in nearest]))).all()}
+    cases = [
+        SimilarCaseStatsInformation(
+            id=str(row.id),
+            title=row.title,
+            bank=row.bank,
+            amount=row.amount,
+            currency=row.currency,
+            duration=row.duration,
+            legal_stage=row.legal_stage,
+            result=row.result,
+            distance=round(distance, 4),
+        )
+        for case_stats_id, distance in nearest
+        if (row := rows.get(case_stats_id)) is not None
+    ]
+    return JSONResponse(status_code=200, content=SimilarCaseStatsResponse(cases=cases).model_dump())
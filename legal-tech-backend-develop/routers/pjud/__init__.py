@@ -4,3 +4,5 @@ router = APIRouter(prefix="/pjud", tags=["PJUD"])
 
 from . import case_scrapper
 from . import folios
+from . import browser_pool
+from . import batch_scrapper
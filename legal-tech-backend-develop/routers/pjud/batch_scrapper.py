@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from fastapi import Body, Depends, HTTPException
+from sqlmodel import Session
+
+from database.ext_db import get_session
+from models.api import BatchScrapeRequest, BatchScrapeResponse
+from services.pjud.batch_scrapper import PJUDBatchScrapper
+from . import router
+
+
+# Referencias a los batches en ejecución para que no sean recolectados antes de terminar
+_running_batches: set[asyncio.Task] = set()
+
+
+@router.post("/scraper/batch", response_model=BatchScrapeResponse, status_code=202)
+async def create_batch_scrape(
+    request: BatchScrapeRequest = Body(..., description="Cases to scrape"),
+    session: Session = Depends(get_session),
+):
+    """
+    Schedules the case notebook scraping of a list of cases. The batch runs in the background across several browser
+    contexts; its progress, throughput and failure reasons are available at GET /scraper/batch/{batch_id}.
+    """
+    batch_scrapper = PJUDBatchScrapper()
+    batch = batch_scrapper.create_batch(session, request)
+    logging.info(f"Scheduling PJUD batch scrape {batch.id} with {batch.total_cases} cases")
+
+    task = asyncio.create_task(batch_scrapper.run(batch.id))
+    _running_batches.add(task)
+    task.add_done_callback(_running_batches.discard)
+    return batch_scrapper.get_report(batch.id)
+
+
+@router.get("/scraper/batch/{batch_id}", response_model=BatchScrapeResponse)
+async def get_batch_scrape(batch_id: UUID):
+    """Returns the outcome of every case of a batch scrape, its throughput (cases/min) and failure reasons."""
+    report = PJUDBatchScrapper().get_report(batch_id)
+    if not report:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return report
@@ -0,0 +1,9 @@
+from models.api import BrowserPoolMetricsResponse
+from services.pjud.browser_pool import get_browser_pool
+from . import router
+
+
+@router.get("/browser-pool/metrics", response_model=BrowserPoolMetricsResponse)
+async def get_browser_pool_metrics():
+    """Returns the utilisation of the shared Chromium pool used by PJUD automations."""
+    return get_browser_pool().metrics()
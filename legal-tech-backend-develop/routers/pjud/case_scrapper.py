@@ -1,9 +1,11 @@
 import logging
+import time
 from fastapi import Body, Depends, Query
 from typing import Dict, Any, Tuple, List, Optional
 from uuid import UUID
 
 from models.pydantic import CaseNotebookRequest, CaseNotebookResponse, PaginatedCaseNotebookResponse, CaseNotebookItem
+from services.pjud.notebook_snapshot import get_notebook_snapshot_cache, notebook_snapshot_key
 from services.pjud.pjud_scrapper import PJUDScrapper
 from . import router
 
@@ -29,68 +31,69 @@ def apply_pagination_to_case_notebook(
     return paginated_data, total, offset, limit, total_pages, has_next, has_prev
     
 
+async def _scrape_case_notebook(scrapper: PJUDScrapper, request: CaseNotebookRequest, case_id: UUID) -> CaseNotebookResponse:
+    """Runs the full PJUD scrape of a case notebook, retrying up to MAX_RETRIES times."""
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            return await scrapper.extract_case_notebook(request, case_id=str(case_id))
+        except Exception as e:
+            logging.warning(f"Attempt {attempt} to extract case notebook failed with error: {e}")
+            if attempt == MAX_RETRIES:
+                return CaseNotebookResponse(message=f"Internal error: {e}", status=500, data=[], total_items=0)
+
+    return CaseNotebookResponse(message=f"Could not extract case notebook after {MAX_RETRIES} retries", status=500, data=[], total_items=0)
+
+
 @router.post("/scraper/{case_id}/case-notebook", response_model=PaginatedCaseNotebookResponse)
 async def extract_case_notebook(
     case_id: UUID,
     request: CaseNotebookRequest = Body(..., description="Case notebook extraction request"),
     offset: int = Query(0, ge=0, description="Number of records to skip (starts from 0)"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of records to return (max 100)"),
+    refresh: bool = Query(False, description="Scrape PJUD again even if a fresh snapshot of the notebook exists"),
     scrapper: PJUDScrapper = Depends(),
 ):
     """
     Extract case notebook information from PJUD for a specific case (RIT and year) with pagination.
     If case_id is provided, also downloads PDF from Hito 5 (Opone excepciones) and processes it
     to create demand exception event with suggestions.
+
+    The scraped notebook is kept as a snapshot for PJUD_NOTEBOOK_SNAPSHOT_TTL seconds, so further pages are served
+    without scraping again until it expires or `refresh` is set. Snapshots are kept apart by `save_to_db` and `debug`,
+    so only a request with the same side effects as the one that scraped the notebook is served from it. Incremental
+    syncs only return the new folios and are never served from or stored in the snapshot.
     """
     logging.info(f"Extracting case notebook for case_id: {case_id}")
 
-    scrapper._current_case_id = str(case_id)
-    scrapper._current_case_number = request.case_number
-    scrapper._current_year = request.year
-    
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            scrapper_response = await scrapper.extract_case_notebook(request)
-            
-            # Apply pagination to the extracted data
-            paginated_data, total, offset, limit, total_pages, has_next, has_prev = apply_pagination_to_case_notebook(
-                scrapper_response.data, offset, limit
-            )
-            
-            return PaginatedCaseNotebookResponse(
-                message=scrapper_response.message,
-                status=scrapper_response.status,
-                data=paginated_data,
-                total_items=total,
-                offset=offset,
-                limit=limit,
-                total_pages=total_pages,
-                has_next=has_next,
-                has_prev=has_prev
-            )
-        except Exception as e:
-            logging.warning(f"Attempt {attempt} to extract case notebook failed with error: {e}")
-            if attempt == MAX_RETRIES:
-                return PaginatedCaseNotebookResponse(
-                    message=f"Internal error: {e}", 
-                    status=500, 
-                    data=[], 
-                    total_items=0,
-                    offset=offset,
-                    limit=limit,
-                    total_pages=0,
-                    has_next=False,
-                    has_prev=False
-                )
+    requested_at = time.monotonic()
+    if request.incremental:
+        scrapper_response = await _scrape_case_notebook(scrapper, request, case_id)
+        snapshot = None
+    else:
+        scrapper_response, snapshot = await get_notebook_snapshot_cache().get_or_scrape(
+            notebook_snapshot_key(case_id, request),
+            lambda: _scrape_case_notebook(scrapper, request, case_id),
+            refresh=refresh,
+        )
+    # Un snapshot creado antes de esta petición significa que no se scrapeó PJUD
+    cached = snapshot is not None and snapshot.created < requested_at
+
+    # Apply pagination to the extracted data
+    paginated_data, total, offset, limit, total_pages, has_next, has_prev = apply_pagination_to_case_notebook(
+        scrapper_response.data, offset, limit
+    )
     
     return PaginatedCaseNotebookResponse(
-        message=f"Could not extract case notebook after {MAX_RETRIES} retries", 
-        status=500, 
-        data=[], 
-        total_items=0,
+        message=scrapper_response.message,
+        status=scrapper_response.status,
+        data=paginated_data,
+        total_items=total,
         offset=offset,
         limit=limit,
-        total_pages=0,
-        has_next=False,
-        has_prev=False
+        total_pages=total_pages,
+        has_next=has_next,
+        has_prev=has_prev,
+        cached=cached,
+        scraped_at=snapshot.scraped_at if snapshot else None,
+        timings=scrapper_response.timings,
     )
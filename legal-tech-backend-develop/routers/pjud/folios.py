@@ -7,6 +7,7 @@ from sqlmodel import Session, select, and_, or_, func
 from models.sql.pjud_folio import PJUDFolio
 from models.api.pjud_folio import FolioResponse, PaginatedFoliosResponse, FoliosStatsResponse
 from database.ext_db import get_session
+from util.pagination import CURSOR_DESCRIPTION, TOTAL_DESCRIPTION, InvalidCursor, TotalMode, count_rows, keyset_page
 from . import router
 
 
@@ -14,20 +15,46 @@ def apply_pagination(
     query: select,
     offset: int,
     limit: int,
-    session: Session
-) -> Tuple[List[PJUDFolio], int, int, int, bool, bool]:
-    total = len(session.exec(query).all())
+    session: Session,
+    total_mode: TotalMode = TotalMode.EXACT
+) -> Tuple[List[PJUDFolio], Optional[int], int, int, Optional[int], bool, bool]:
+    total = count_rows(session, query, total_mode)
     
-    total_pages = (total + limit - 1) // limit if limit > 0 else 1
+    total_pages = (total + limit - 1) // limit if total is not None else None
     
-    paginated_query = query.order_by(PJUDFolio.created_at.desc()).offset(offset).limit(limit)
+    # Se pide una fila extra para saber si hay página siguiente sin depender del total
+    paginated_query = query.order_by(PJUDFolio.created_at.desc()).offset(offset).limit(limit + 1)
     
     items = session.exec(paginated_query).all()
     
-    has_next = (offset + limit) < total
+    has_next = len(items) > limit
     has_prev = offset > 0
     
-    return items, total, offset, limit, total_pages, has_next, has_prev
+    return items[:limit], total, offset, limit, total_pages, has_next, has_prev
+
+
+def apply_keyset_pagination(
+    query: select,
+    cursor: str,
+    limit: int,
+    session: Session,
+    total_mode: TotalMode = TotalMode.EXACT
+) -> Tuple[List[PJUDFolio], Optional[int], Optional[int], Optional[str]]:
+    total = count_rows(session, query, total_mode)
+    
+    total_pages = (total + limit - 1) // limit if total is not None else None
+    
+    items, next_cursor = keyset_page(
+        session,
+        query,
+        [PJUDFolio.created_at, PJUDFolio.id],
+        lambda folio: (folio.created_at, folio.id),
+        cursor,
+        limit,
+        descending=True,
+    )
+    
+    return items, total, total_pages, next_cursor
 
 
 def build_folios_query(
@@ -71,14 +98,23 @@ async def get_folios(
     start_date: Optional[date] = Query(None, description="Filter by start date (created_at)"),
     end_date: Optional[date] = Query(None, description="Filter by end date (created_at)"),
     hito: Optional[str] = Query(None, description="Filter by hito"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    total_mode: TotalMode = Query(TotalMode.EXACT, alias="total", description=TOTAL_DESCRIPTION),
     session: Session = Depends(get_session)
 ):
     try:
         query = build_folios_query(rol, case_number, year, start_date, end_date, hito)
         
-        folios, total, offset, limit, total_pages, has_next, has_prev = apply_pagination(
-            query, offset, limit, session
-        )
+        next_cursor = None
+        if cursor is not None:
+            folios, total, total_pages, next_cursor = apply_keyset_pagination(
+                query, cursor, limit, session, total_mode
+            )
+            offset, has_next, has_prev = 0, next_cursor is not None, bool(cursor)
+        else:
+            folios, total, offset, limit, total_pages, has_next, has_prev = apply_pagination(
+                query, offset, limit, session, total_mode
+            )
         
         items = []
         for folio in folios:
@@ -108,9 +144,12 @@ async def get_folios(
             limit=limit,
             total_pages=total_pages,
             has_next=has_next,
-            has_prev=has_prev
+            has_prev=has_prev,
+            next_cursor=next_cursor
         )
         
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Error getting folios: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
@@ -1,27 +1,39 @@
 import logging
 from uuid import UUID
-from fastapi import Query
+from fastapi import Query, Response
 
 from database.ext_db import get_session
 from models.api import error_response, ReceptorResponse
 from services.receptor.receptor_service import (
     get_receptors as get_receptors_service,
+    get_receptors_page as get_receptors_page_service,
     get_receptors_by_tribunal as get_receptors_by_tribunal_service
 )
+from util.pagination import CURSOR_DESCRIPTION, NEXT_CURSOR_HEADER, InvalidCursor
 from . import router
 
 
 @router.get("/", response_model=list[ReceptorResponse])
 async def get_receptors(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination"),
     limit: int = Query(10, ge=1, description="Maximum number of records to return"),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
 ):
     """Returns all receptors with their tribunal associations."""
     try:
         session_gen = get_session()
         session = next(session_gen)
         
+        if cursor is not None:
+            # El cursor de la página siguiente va en un header para no cambiar la lista de respuesta
+            receptors, next_cursor = get_receptors_page_service(session, cursor, limit)
+            if next_cursor:
+                response.headers[NEXT_CURSOR_HEADER] = next_cursor
+            return receptors
         return get_receptors_service(session, skip, limit)
+    except InvalidCursor as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logging.error(f"Error getting receptors: {e}")
         return error_response(f"Receptors not found: {e}", 404, True)
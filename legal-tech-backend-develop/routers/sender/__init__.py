@@ -3,6 +3,7 @@ from fastapi import APIRouter
 router = APIRouter(prefix="/send", tags=["Send"])
 
 from . import (
+    demand_queue,
     demand_sender,
     demand_text_sender,
 )
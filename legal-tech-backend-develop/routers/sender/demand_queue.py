@@ -0,0 +1,65 @@
+import logging
+from uuid import UUID
+
+from fastapi import Body, Depends, File, HTTPException, UploadFile
+
+from database.ext_db import Session
+from models.api import (
+    DemandSubmissionQueueMetricsResponse,
+    DemandSubmissionQueueResponse,
+    DemandSubmissionResponse,
+    error_response,
+)
+from services.pjud.demand_queue import get_demand_submission_queue
+from services.v2.document.demand_text import DemandTextQueueItem
+from middleware.auth_middleware import get_current_session
+from . import router
+
+
+ALLOWED_FILE_TYPE = "application/pdf"
+
+
+@router.post("/demand-text/queue/", response_model=DemandSubmissionQueueResponse, status_code=202)
+async def enqueue_demand_texts(
+    items: list[DemandTextQueueItem] = Body(..., description="Demand texts to file, referencing their PDF files by filename"),
+    files: list[UploadFile] = File(..., description="PDF files referenced by the demand texts"),
+    session: Session = Depends(get_current_session),
+):
+    """
+    Enqueues several demand texts to be filed in PJUD by a bounded pool of browser contexts. A demand whose
+    idempotency key was already queued or filed is returned as a duplicate instead of being filed again. The status of
+    each submission is available at GET /send/demand-text/queue/{submission_id}.
+    """
+    uploads = {file.filename: file for file in files}
+    for file in files:
+        if file.content_type != ALLOWED_FILE_TYPE:
+            return error_response(f"Invalid file type for {file.filename}", 400)
+    for position, item in enumerate(items):
+        missing = [filename for filename in item.referenced_files() if filename not in uploads]
+        if missing:
+            return error_response(f"Demand {position} references missing files: {', '.join(missing)}", 400)
+
+    queue = get_demand_submission_queue()
+    submissions = []
+    for item in items:
+        submissions.append(await queue.enqueue(session, item, uploads))
+    logging.info(f"Enqueued {sum(not submission.duplicate for submission in submissions)} of {len(items)} demand texts")
+    return DemandSubmissionQueueResponse(submissions=submissions)
+
+
+@router.get("/demand-text/queue/metrics", response_model=DemandSubmissionQueueMetricsResponse)
+async def get_demand_queue_metrics():
+    """Returns the depth and throughput (submissions/min) of the demand submission queue."""
+    return get_demand_submission_queue().metrics()
+
+
+@router.get("/demand-text/queue/{submission_id}", response_model=DemandSubmissionResponse)
+async def get_demand_submission(
+    submission_id: UUID,
+    session: Session = Depends(get_current_session),
+):
+    """Returns the status of a queued demand text submission."""
+    submission = get_demand_submission_queue().get_submission(session, submission_id)
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    return submission
@@ -3,6 +3,7 @@ from fastapi import Body, Depends
 
 from models.api import DemandDeleteRequest, DemandDeleteResponse, DemandSendRequest, DemandSendResponse, error_response
 from services.pjud import PJUDController
+from services.pjud.demand_list_snapshot import expire_demand_list_snapshot
 from . import router
 
 
@@ -18,6 +19,8 @@ async def demand_post(
     for attempt in range(1, MAX_RETRIES + 1):
         try:
             if controller_response := await controller.send_demand_to_court(input):
+                if controller_response.status == 200:
+                    expire_demand_list_snapshot(input.rut)
                 return controller_response
         except Exception as e:
             logging.warning(f"Attempt {attempt} to send demand failed with error: {e}")
@@ -35,6 +38,8 @@ async def demand_delete(
     for attempt in range(1, MAX_RETRIES + 1):
         try:
             if controller_response := await controller.delete_demand(input):
+                if controller_response.status == 200:
+                    expire_demand_list_snapshot(input.rut)
                 return controller_response
         except Exception as e:
             logging.warning(f"Attempt {attempt} to delete demand failed with error: {e}")
@@ -4,9 +4,11 @@ from fastapi import Body, Depends, File, UploadFile
 
 from database.ext_db import Session
 from models.api import error_response
-from models.pydantic import AnnexFile, PJUDDDO, PJUDLegalRepresentative
+from models.pydantic import AnnexFile
 from services.extractor import AddressExtractor
 from services.pjud import PJUDController
+from services.pjud.demand_list_snapshot import expire_demand_list_snapshot
+from services.pjud.demand_queue import build_pjud_defendants
 from services.tracker import CaseTracker
 from services.v2.document.demand_text import DemandTextSenderInput, DemandTextSendResponse
 from middleware.auth_middleware import get_current_session
@@ -57,20 +59,8 @@ async def demand_text(
         for label, file in zip(extra_files_labels, extra_files)
     )
 
-    defendants: list[PJUDDDO] = []
     try:
-        for defendant in input.information.defendants or []:
-            pjud_ddo = PJUDDDO(
-                raw_address=defendant.address or "",
-                raw_name=defendant.name or "",
-                identifier=defendant.identifier or "",
-                legal_representatives=[
-                    PJUDLegalRepresentative(raw_name=representative.name or "", identifier=representative.identifier or "")
-                    for representative in defendant.legal_representatives or []
-                ],
-                addresses=[address_extractor.extract_from_text(defendant.address)] if defendant.address else [],
-            )
-            defendants.append(pjud_ddo)
+        defendants = build_pjud_defendants(input.information, address_extractor)
     except Exception as e:
         return error_response(f"Invalid or incomplete defendant address: {e}", 400, True)
 
@@ -90,6 +80,8 @@ async def demand_text(
     
     if not controller_response:
         return error_response(f"Could not send demand text after {MAX_RETRIES} retries", 500)
+    if controller_response.status == 200 and not input.debug:
+        expire_demand_list_snapshot(input.rut)
     
     case_id = None
     try:
@@ -103,4 +95,5 @@ async def demand_text(
         message=controller_response.message,
         status=controller_response.status,
         case_id=case_id,
+        timings=controller_response.timings,
     )
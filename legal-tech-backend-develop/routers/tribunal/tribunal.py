@@ -1,5 +1,5 @@
 import logging
-from fastapi import Depends, Query
+from fastapi import Depends, Query, Response
 from fastapi.responses import JSONResponse
 from sqlmodel import select
 from uuid import UUID
@@ -10,13 +10,16 @@ from models.api import (
 )
 from models.sql import Tribunal
 from models.pydantic.tribunal import TribunalResponse
+from util.pagination import CURSOR_DESCRIPTION, NEXT_CURSOR_HEADER, InvalidCursor, keyset_page
 from . import router
 
 
 @router.get("", response_model=list[TribunalResponse])
 async def get_all_tribunals(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination"),
     limit: int = Query(10, ge=1, description="Maximum number of records to return"),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
 ):
     """Returns all tribunals."""
     try:
@@ -26,8 +29,14 @@ async def get_all_tribunals(
         
         try:
             # Query tribunals with pagination
-            statement = select(Tribunal).offset(skip).limit(limit)
-            tribunals = session.exec(statement).all()
+            if cursor is not None:
+                # El cursor de la página siguiente va en un header para no cambiar la lista de respuesta
+                tribunals, next_cursor = keyset_page(session, select(Tribunal), [Tribunal.id], lambda row: (row.id,), cursor, limit)
+                if next_cursor:
+                    response.headers[NEXT_CURSOR_HEADER] = next_cursor
+            else:
+                statement = select(Tribunal).offset(skip).limit(limit)
+                tribunals = session.exec(statement).all()
             
             # Convert to response models
             result = []
@@ -44,6 +53,8 @@ async def get_all_tribunals(
         finally:
             session.close()
             
+    except InvalidCursor as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logging.error(f"Error getting tribunals: {e}")
         return error_response(f"Tribunals not found: {e}", 404, True)
@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import time
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import event
+from sqlmodel import Session, func, select
+
+from config import Config
+from database.ext_db import get_session
+from models.pydantic import ProbableCaseStats
+from models.sql import CaseStats, CaseStatsEvent
+from services.information.probable_stats import SIMILAR_CASE_STAGES, OutcomeSummary, build_probable_case_stats
+
+
+# Códigos de resultado; todo lo que no sea pendiente, avenimiento o desistimiento terminó por vía judicial
+RESULT_UNKNOWN, RESULT_PENDING, RESULT_SETTLEMENT, RESULT_DESISTED, RESULT_JUDICIAL = range(5)
+RESULT_CODES = {None: RESULT_UNKNOWN, "pending": RESULT_PENDING, "settlement": RESULT_SETTLEMENT, "desisted": RESULT_DESISTED}
+# Bit de cada etapa legal en la máscara de etapas por las que pasó una causa
+STAGE_BITS = {stage: 1 << index for index, stage in enumerate(SIMILAR_CASE_STAGES)}
+
+
+def _mean(values: np.ndarray) -> float | None:
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if values.size else None
+
+
+def _summarize(result: np.ndarray, duration: np.ndarray) -> OutcomeSummary:
+    """Outcome counts and average durations of a set of cases, with the same semantics as the SQL aggregates."""
+    settled = result == RESULT_SETTLEMENT
+    return (
+        int(np.count_nonzero(result >= RESULT_SETTLEMENT)),
+        int(np.count_nonzero(settled)),
+        int(np.count_nonzero(result == RESULT_DESISTED)),
+        _mean(duration[settled]),
+        _mean(duration[result == RESULT_JUDICIAL]),
+    )
+
+
+class CaseTypeColumns:
+    """
+    Columnar arrays of the CaseStats rows of one case type, sorted by currency and then amount, with the rows without
+    amount last in each currency. `currencies` maps each currency to the row range of its cases with amount.
+    """
+
+    def __init__(self, rows: list[tuple], stages: dict[UUID, int]) -> None:
+        currency_names = sorted({row[2] or "" for row in rows})
+        currency_index = {name: index for index, name in enumerate(currency_names)}
+        amount = np.array([np.nan if row[1] is None else row[1] for row in rows], dtype=np.float64)
+        currency = np.array([currency_index[row[2] or ""] for row in rows], dtype=np.int32)
+        order = np.lexsort((amount, currency))
+
+        self.ids = np.array([row[0] for row in rows], dtype=object)[order]
+        self.amount = amount[order]
+        self.currency = currency[order]
+        self.duration = np.array([np.nan if row[3] is None else row[3] for row in rows], dtype=np.float64)[order]
+        self.result = np.array([RESULT_CODES.get(row[4], RESULT_JUDICIAL) for row in rows], dtype=np.int8)[order]
+        self.stages = np.array([stages.get(row[0], 0) for row in rows], dtype=np.uint8)[order]
+        self.currencies: dict[str, tuple[int, int]] = {}
+        for name, index in currency_index.items():
+            start, stop = np.searchsorted(self.currency, [index, index + 1])
+            with_amount = int(np.count_nonzero(~np.isnan(self.amount[start:stop])))
+            self.currencies[name] = (int(start), int(start) + with_amount)
+        self.overall = _summarize(self.result, self.duration)
+
+    def window(self, currency: str, amount: float, stage: str | None) -> np.ndarray:
+        """Row indices of the cases of `currency` with an amount within ±20% of `amount` that went through `stage`."""
+        start, stop = self.currencies.get(currency, (0, 0))
+        amounts = self.amount[start:stop]
+        lower = start + int(np.searchsorted(amounts, amount * 0.8, side="left"))
+        upper = start + int(np.searchsorted(amounts, amount * 1.2, side="right"))
+        indices = np.arange(lower, upper)
+        if bit := STAGE_BITS.get(stage):
+            indices = indices[(self.stages[lower:upper] & bit) != 0]
+        return indices
+
+
+class CaseStatsSnapshot:
+    """Read-only columnar copy of CaseStats at one point in time, grouped by case type."""
+
+    def __init__(self, rows: list[tuple], stages: dict[UUID, int], fingerprint: tuple) -> None:
+        grouped: dict[str, list[tuple]] = {}
+        for row in rows:
+            grouped.setdefault(row[5], []).append(row)
+        self.case_types = {case_type: CaseTypeColumns(type_rows, stages) for case_type, type_rows in grouped.items()}
+        self.fingerprint = fingerprint
+        self.size = len(rows)
+        self.loaded_at = time.monotonic()
+
+
+class CaseStatsEngine:
+    """
+    In-memory similar-case statistics over the historical CaseStats dataset.
+
+    The dataset is snapshotted into numpy arrays sorted by amount within each case type and currency, so the ±20%
+    amount window of a case is found with two binary searches and its outcomes are counted without a database round
+    trip. A background task compares a cheap fingerprint of the tables every CASE_STATS_ENGINE_REFRESH_INTERVAL
+    seconds and, when it changed or the ORM wrote to them, builds a new snapshot and swaps it in as a whole.
+    """
+
+    def __init__(self, refresh_interval: float | None = None) -> None:
+        self.refresh_interval = Config.CASE_STATS_ENGINE_REFRESH_INTERVAL if refresh_interval is None else refresh_interval
+        self._snapshot: CaseStatsSnapshot | None = None
+        self._stale = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def mark_stale(self, *_) -> None:
+        self._stale = True
+
+    async def start(self) -> None:
+        """Loads the first snapshot and starts the refresh task. A failed load leaves the SQL path in use."""
+        try:
+            await asyncio.to_thread(self.refresh)
+        except Exception as e:
+            logging.warning(f">>> ⚠️ [CaseStatsEngine] No se pudo cargar CaseStats en memoria: {e}")
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def refresh(self, force: bool = True) -> bool:
+        """
+        Rebuilds the snapshot from the database.
+
+        Args:
+            force: Rebuild even if the tables fingerprint did not change
+
+        Returns:
+            bool: Whether a new snapshot was swapped in
+        """
+        session = next(get_session())
+        try:
+            fingerprint = self._fingerprint(session)
+            current = self._snapshot
+            if not force and not self._stale and current is not None and current.fingerprint == fingerprint:
+                return False
+            self._stale = False
+            start = time.perf_counter()
+            rows = session.exec(
+                select(CaseStats.id, CaseStats.amount, CaseStats.currency, CaseStats.duration, CaseStats.result, CaseStats.case_type)
+            ).all()
+            stage_rows = session.exec(
+                select(CaseStatsEvent.case_stats_id, CaseStatsEvent.type)
+                .where(CaseStatsEvent.type.in_(SIMILAR_CASE_STAGES))
+                .distinct()
+            ).all()
+        finally:
+            session.close()
+
+        stages: dict[UUID, int] = {}
+        for case_stats_id, stage in stage_rows:
+            stages[case_stats_id] = stages.get(case_stats_id, 0) | STAGE_BITS[stage]
+        snapshot = CaseStatsSnapshot([tuple(row) for row in rows], stages, fingerprint)
+        self._snapshot = snapshot
+        logging.info(f">>> 📊 [CaseStatsEngine] {snapshot.size} causas cargadas en memoria ({time.perf_counter() - start:.2f}s)")
+        return True
+
+    def probable_stats(self, case_type: str, currency: str | None, amount: float | None, stage: str | None) -> ProbableCaseStats:
+        """Probable statistics of a case, see `build_probable_case_stats`. Requires a loaded snapshot."""
+        # Una sola lectura del snapshot, un refresco concurrente lo reemplaza completo
+        snapshot = self._snapshot
+        columns = snapshot.case_types.get(case_type)
+        if columns is None:
+            return build_probable_case_stats((0, 0, 0, None, None), None)
+        similar = None
+        if currency is not None and amount is not None:
+            indices = columns.window(currency, amount, stage)
+            similar = _summarize(columns.result[indices], columns.duration[indices])
+        return build_probable_case_stats(columns.overall, similar)
+
+    def nearest_cases(
+            self,
+            case_type: str,
+            currency: str,
+            amount: float,
+            duration: float | None = None,
+            stage: str | None = None,
+            limit: int = 10,
+        ) -> list[tuple[UUID, float]]:
+        """
+        Closest finished cases of the same type and currency by amount (log scale) and, if given, duration, both
+        measured in standard deviations of the candidates. With `stage`, only cases that went through it are
+        candidates.
+
+        Returns:
+            list[tuple[UUID, float]]: CaseStats ids with their distance, closest first
+        """
+        snapshot = self._snapshot
+        columns = snapshot.case_types.get(case_type) if snapshot else None
+        if columns is None:
+            return []
+        start, stop = columns.currencies.get(currency, (0, 0))
+        candidates = np.arange(start, stop)
+        candidates = candidates[columns.result[candidates] >= RESULT_SETTLEMENT]
+        if bit := STAGE_BITS.get(stage):
+            candidates = candidates[(columns.stages[candidates] & bit) != 0]
+        if not candidates.size:
+            return []
+
+        amounts = np.log1p(np.clip(columns.amount[candidates], 0, None))
+        distance = ((amounts - np.log1p(max(amount, 0))) / (amounts.std() or 1.0)) ** 2
+        if duration is not None:
+            durations = columns.duration[candidates]
+            known = ~np.isnan(durations)
+            candidates, distance, durations = candidates[known], distance[known], durations[known]
+            distance = distance + ((durations - duration) / (durations.std() or 1.0)) ** 2
+        if not candidates.size:
+            return []
+
+        limit = min(limit, candidates.size)
+        closest = np.argpartition(distance, limit - 1)[:limit]
+        closest = closest[np.argsort(distance[closest])]
+        return [(columns.ids[candidates[index]], float(np.sqrt(distance[index]))) for index in closest]
+
+    def _fingerprint(self, session: Session) -> tuple:
+        # Conteos y sumas cambian con cualquier carga o corrección de la tabla
+        stats = session.exec(select(func.count(CaseStats.id), func.sum(CaseStats.duration), func.sum(CaseStats.amount))).one()
+        events = session.exec(select(func.count(CaseStatsEvent.id))).one()
+        return tuple(stats) + (events,)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await asyncio.to_thread(self.refresh, False)
+            except Exception as e:
+                logging.warning(f">>> ⚠️ [CaseStatsEngine] Error refrescando CaseStats en memoria: {e}")
+
+
+_case_stats_engine: CaseStatsEngine | None = None
+
+
+def get_case_stats_engine() -> CaseStatsEngine:
+    """Returns the in-memory CaseStats engine shared by every request, loaded by the app lifespan."""
+    global _case_stats_engine
+    if _case_stats_engine is None:
+        _case_stats_engine = CaseStatsEngine()
+    return _case_stats_engine
+
+
+for _model in (CaseStats, CaseStatsEvent):
+    for _operation in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _operation, get_case_stats_engine().mark_stale)
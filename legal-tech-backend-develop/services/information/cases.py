@@ -1,17 +1,19 @@
+from collections import defaultdict
+from uuid import UUID
+
 from sqlmodel import func, select, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
 from database.ext_db import Session
-from models.sql import Case, CaseEvent, CaseStatus, Litigant
+from models.sql import Case, CaseDetail, CaseEvent, CaseStatus, Court, Litigant, Tribunal
+from util.pagination import TotalMode, count_rows, keyset_page
 
 
 class CaseRetriever:
     """Cases retriever."""
 
-    def get_case_count(self, session: Session, status: list[str] | None) -> int:
-        """Returns the amount of cases that satisfy the filters."""
-        query = select(func.count(Case.id))
-        
+    def filter_cases(self, query, status: list[str] | None):
+        """Applies the status filter shared by the case count and the case page."""
         if status:
             conditions = []
             if "active" in status:
@@ -20,8 +22,11 @@ class CaseRetriever:
             if other_statuses:
                 conditions.append(Case.status.in_(other_statuses))
             query = query.where(or_(*conditions))
-        count = session.exec(query).first()
-        return count or 0
+        return query
+
+    def get_case_count(self, session: Session, status: list[str] | None, total: TotalMode = TotalMode.EXACT) -> int | None:
+        """Returns the amount of cases that satisfy the filters, see `count_rows`."""
+        return count_rows(session, self.filter_cases(select(Case), status), total)
 
     def get_cases(self, 
             session: Session,
@@ -31,17 +36,8 @@ class CaseRetriever:
             order_by: str | None,
             order_desc: bool | None,
         ) -> list[Case]:
-        """Filters, orders, and returns a paginated list of cases with litigants."""
-        query = select(Case).options(selectinload(Case.litigants))
-
-        if status:
-            conditions = []
-            if "active" in status:
-                conditions.append(~Case.status.in_([CaseStatus.DRAFT, CaseStatus.FINISHED, CaseStatus.ARCHIVED]))
-            other_statuses = [s for s in status if s != CaseStatus.ACTIVE]
-            if other_statuses:
-                conditions.append(Case.status.in_(other_statuses))
-            query = query.where(or_(*conditions))
+        """Filters, orders, and returns a paginated list of cases with litigants, loaded in the same query."""
+        query = self.filter_cases(select(Case).options(joinedload(Case.litigants)), status)
 
         if order_by:
             order_by = order_by.lower()
@@ -57,6 +53,56 @@ class CaseRetriever:
                     ordering = ordering.asc()
                 query = query.order_by(ordering)
 
+        # Con joinedload el límite se aplica a una subconsulta de casos, unique() junta las filas de cada litigante
         query = query.offset(skip).limit(min(limit, 100))
-        results = list(session.exec(query).all())
+        results = list(session.exec(query).unique().all())
         return results
+
+    def get_cases_page(
+            self,
+            session: Session,
+            cursor: str,
+            limit: int,
+            status: list[str] | None,
+            order_desc: bool | None,
+        ) -> tuple[list[Case], str | None]:
+        """Returns the page of cases with litigants after `cursor`, ordered by (created_at, id), see `keyset_page`."""
+        query = self.filter_cases(select(Case).options(joinedload(Case.litigants)), status)
+        return keyset_page(
+            session,
+            query,
+            [Case.created_at, Case.id],
+            lambda case: (case.created_at, case.id),
+            cursor,
+            min(limit, 100),
+            bool(order_desc),
+        )
+
+    def get_events_by_case(self, session: Session, case_ids: list[UUID]) -> dict[UUID, list[CaseEvent]]:
+        """Returns the events of every case in `case_ids` in a single query, grouped by case and ordered by creation."""
+        events_by_case: dict[UUID, list[CaseEvent]] = defaultdict(list)
+        if not case_ids:
+            return events_by_case
+        events = session.exec(
+            select(CaseEvent)
+            .where(CaseEvent.case_id.in_(case_ids))
+            .order_by(CaseEvent.case_id, CaseEvent.created_at)
+        ).all()
+        for event in events:
+            events_by_case[event.case_id].append(event)
+        return events_by_case
+
+    def get_details_by_case(self, session: Session, case_ids: list[UUID]) -> dict[UUID, tuple[CaseDetail, Tribunal, Court]]:
+        """Returns the detail of every case in `case_ids` with its tribunal and court, in a single query."""
+        if not case_ids:
+            return {}
+        rows = session.exec(
+            select(CaseDetail, Tribunal, Court)
+            .join(Tribunal, CaseDetail.tribunal_id == Tribunal.id)
+            .join(Court, CaseDetail.court_id == Court.id)
+            .where(CaseDetail.case_id.in_(case_ids))
+        ).all()
+        details_by_case: dict[UUID, tuple[CaseDetail, Tribunal, Court]] = {}
+        for case_detail, tribunal, court in rows:
+            details_by_case.setdefault(case_detail.case_id, (case_detail, tribunal, court))
+        return details_by_case
@@ -0,0 +1,114 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+
+from config import Config
+from models.pydantic import ProbableCaseStats
+from models.sql import CaseStats, CaseStatsEvent
+
+
+# (tipo de causa, moneda, banda de monto, etapa legal); moneda y monto son None si la causa no tiene monto
+ProbableStatsKey = tuple[str, str | None, float | None, str | None]
+# (terminadas, avenimientos, desistimientos, duración media con avenimiento, duración media por vía judicial)
+OutcomeSummary = tuple[int, int, int, float | None, float | None]
+
+# Etapas legales que acotan las causas similares a las que pasaron por ella
+SIMILAR_CASE_STAGES = ("exceptions", "exceptions_response", "demand_notification")
+# Mínimo de causas similares para preferir sus cifras a las del tipo de causa completo
+MIN_SIMILAR_CASES = 50
+# Razón entre los límites de cada banda de monto: los montos a menos de un 5% comparten estadísticas
+AMOUNT_BAND_RATIO = 1.05
+
+
+def amount_band(amount: float) -> float:
+    """
+    Snaps an amount to the geometric center of its log-scaled band, so nearby amounts share one cache entry. Only the
+    cache key is banded: the ±20% similar-case window is computed on the exact amount of the case that fills the entry.
+    """
+    if amount <= 0:
+        return amount
+    band = math.floor(math.log(amount) / math.log(AMOUNT_BAND_RATIO))
+    return AMOUNT_BAND_RATIO ** (band + 0.5)
+
+
+def build_probable_case_stats(overall: OutcomeSummary, similar: OutcomeSummary | None) -> ProbableCaseStats:
+    """
+    Builds the probable statistics of a case from the outcomes of every case of its type and, when the case has an
+    amount, of the similar cases. Similar case figures are used only when there are more than MIN_SIMILAR_CASES.
+    """
+    total_count, compromise_count, withdrawal_count, avg_settlement_duration, avg_non_settlement_duration = overall
+    compromise_chance = compromise_count / total_count if total_count > 0 else None
+    withdrawal_chance = withdrawal_count / total_count if total_count > 0 else None
+    days_to_resolve = max(int((avg_non_settlement_duration or 0) - (avg_settlement_duration or 0)), 0)
+
+    if similar is not None and similar[0] > MIN_SIMILAR_CASES:
+        similar_total_count, similar_compromise_count, similar_withdrawal_count, avg_similar_settlement_duration, avg_similar_non_settlement_duration = similar
+        compromise_chance = similar_compromise_count / similar_total_count
+        withdrawal_chance = similar_withdrawal_count / similar_total_count
+        days_to_resolve = max(int((avg_similar_non_settlement_duration or 0) - (avg_similar_settlement_duration or 0)), 0)
+
+    return ProbableCaseStats(
+        compromise_amount_percentage=None, #TODO: Add settlement for amount in CaseStats
+        compromise_chance=compromise_chance,
+        days_to_resolve=days_to_resolve,
+        withdrawal_chance=withdrawal_chance,
+    )
+
+
+class ProbableStatsCache:
+    """
+    Probable case statistics already computed for a (case type, currency, amount band, legal stage) combination, kept
+    for `ttl` seconds with at most `max_entries` (least recently used first out). Any write to CaseStats or its events
+    made through the ORM clears the whole cache; bulk loads made outside the app are picked up once entries expire.
+    """
+
+    def __init__(self, ttl: float | None = None, max_entries: int | None = None) -> None:
+        self.ttl = Config.PROBABLE_STATS_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or Config.PROBABLE_STATS_CACHE_MAX_ENTRIES
+        self._entries: OrderedDict[ProbableStatsKey, tuple[float, ProbableCaseStats]] = OrderedDict()
+
+    def get(self, key: ProbableStatsKey) -> ProbableCaseStats | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, stats = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return stats.model_copy()
+
+    def store(self, key: ProbableStatsKey, stats: ProbableCaseStats) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, stats.model_copy())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        if self._entries:
+            logging.info(f">>> 🧹 Caché de estadísticas probables invalidada ({len(self._entries)} entradas)")
+        self._entries.clear()
+
+
+_probable_stats_cache: ProbableStatsCache | None = None
+
+
+def get_probable_stats_cache() -> ProbableStatsCache:
+    """Returns the probable case statistics cache shared by every request."""
+    global _probable_stats_cache
+    if _probable_stats_cache is None:
+        _probable_stats_cache = ProbableStatsCache()
+    return _probable_stats_cache
+
+
+def invalidate_probable_stats_cache(*_) -> None:
+    """Clears the probable case statistics, to be called after CaseStats data is reloaded."""
+    get_probable_stats_cache().clear()
+
+
+for _model in (CaseStats, CaseStatsEvent):
+    for _operation in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _operation, invalidate_probable_stats_cache)
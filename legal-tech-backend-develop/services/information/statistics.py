@@ -1,12 +1,17 @@
+import csv
 import io
-import pandas as pd
+from collections import defaultdict
 import zipfile
 from sqlmodel import func, select, or_
+from typing import Iterator
 from uuid import UUID
 
-from database.ext_db import Session
+from database.ext_db import Session, get_session
 from models.pydantic import LegalSubject, ProbableCaseStats
 from models.sql import Case, CaseEvent, CaseEventType, CaseStats, CaseStatsEvent
+from services.information.case_stats_engine import get_case_stats_engine
+from services.information.probable_stats import SIMILAR_CASE_STAGES, amount_band, build_probable_case_stats, get_probable_stats_cache
+from util.pagination import TotalMode, count_rows, keyset_page
 
 
 BANK_FILTER = {
@@ -63,6 +68,62 @@ RESULT_TRANSLATIONS = {
 }
 
 
+# Columnas del csv de casos con su encabezado, en orden
+CSV_COLUMN_HEADERS = {
+    "title": "Caratulado",
+    "case_role": "Rol",
+    "case_type": "Tipo",
+    "result": "Resultado",
+    "bank": "Banco",
+    "year": "Año",
+    "court_city": "Ciudad del juzgado",
+    "court_number": "Número de causa",
+    "legal_stage": "Etapa legal",
+    "amount": "Monto",
+    "currency": "Moneda",
+}
+CSV_COLUMNS = list(CSV_COLUMN_HEADERS)
+CSV_HEADERS = list(CSV_COLUMN_HEADERS.values())
+CSV_TRANSLATIONS = {
+    "bank": BANK_TRANSLATION,
+    "case_type": CASE_TYPE_TRANSLATIONS,
+    "legal_stage": LEGAL_STAGE_TRANSLATIONS,
+    "result": RESULT_TRANSLATIONS,
+}
+CSV_CHUNK_SIZE = 10000
+CSV_FETCH_SIZE = 1000
+
+
+def _csv_row(row) -> list:
+    values = []
+    for column, value in zip(CSV_COLUMNS, row):
+        if translations := CSV_TRANSLATIONS.get(column):
+            value = translations.get(value, value)
+        elif column == "currency" and value is not None:
+            value = value.upper()
+        values.append(value)
+    return values
+
+
+class _ZipOutput(io.RawIOBase):
+    """Write-only, unseekable sink for a ZipFile whose written bytes are collected with `drain`."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
 def map_events_to_legal_stage(event_types: list[CaseEventType]) -> str:
     events_set = set(event_types)
     if CaseEventType.EXCEPTIONS_RESPONSE in events_set:
@@ -81,9 +142,8 @@ def map_events_to_legal_stage(event_types: list[CaseEventType]) -> str:
 class Statistics:
     """Statistics handlers."""
 
-    def get_case_count(self, session: Session, bank: str, status: list[str] | None) -> int:
-        """Returns the amount of cases that satisfy the filters."""
-        query = select(func.count(CaseStats.id))
+    def filter_cases(self, query, bank: str, status: list[str] | None):
+        """Applies the bank and status filters shared by the case count and the case page."""
         if bank:
             query = query.where(CaseStats.bank == bank)
             if title_filter := BANK_FILTER.get(bank):
@@ -96,14 +156,27 @@ class Statistics:
             if other_statuses:
                 conditions.append(CaseStats.legal_stage.in_(other_statuses))
             query = query.where(or_(*conditions))
-        count = session.exec(query).first()
-        return count or 0
+        return query
+
+    def get_case_count(self, session: Session, bank: str, status: list[str] | None, total: TotalMode = TotalMode.EXACT) -> int | None:
+        """Returns the amount of cases that satisfy the filters, see `count_rows`."""
+        return count_rows(session, self.filter_cases(select(CaseStats), bank, status), total)
 
     def get_case_events(self, session: Session, case_id: UUID) -> list[CaseStatsEvent]:
         """Returns the events of a case given its id."""
         query = select(CaseStatsEvent).where(CaseStatsEvent.case_stats_id == case_id)
         return list(session.exec(query).all())
 
+    def get_events_by_case(self, session: Session, case_ids: list[UUID]) -> dict[UUID, list[CaseStatsEvent]]:
+        """Returns the events of every case in `case_ids` in a single query, grouped by case."""
+        events_by_case: dict[UUID, list[CaseStatsEvent]] = defaultdict(list)
+        if not case_ids:
+            return events_by_case
+        query = select(CaseStatsEvent).where(CaseStatsEvent.case_stats_id.in_(case_ids))
+        for event in session.exec(query).all():
+            events_by_case[event.case_stats_id].append(event)
+        return events_by_case
+
     def get_cases(self, 
             session: Session,
             skip: int,
@@ -114,31 +187,16 @@ class Statistics:
             order_desc: bool | None,
         ) -> list[CaseStats]:
         """Filters, orders, and returns a paginated list of cases."""
-        query = select(CaseStats)
-
-        if bank:
-            query = query.where(CaseStats.bank == bank)
-            if title_filter := BANK_FILTER.get(bank):
-                query = query.where(CaseStats.title.ilike(f"%{title_filter}%"))
-        if status:
-            conditions = []
-            if "active" in status:
-                conditions.append(~CaseStats.legal_stage.in_(["draft", "finished", "archived"]))
-            other_statuses = [s for s in status if s != "active"]
-            if other_statuses:
-                conditions.append(CaseStats.legal_stage.in_(other_statuses))
-            query = query.where(or_(*conditions))
+        query = self.filter_cases(select(CaseStats), bank, status)
 
         if order_by:
             order_by = order_by.lower()
             if order_by in ("title", "created_at", "events"):
+                # Conteo y primer evento vienen precalculados por trigger, sin join ni group by
                 if order_by == "events":
-                    query = query.outerjoin(CaseStatsEvent, CaseStatsEvent.case_stats_id == CaseStats.id).group_by(CaseStats.id)
-                    ordering = func.count(CaseStatsEvent.id)
+                    ordering = CaseStats.event_count
                 elif order_by == "created_at":
-                    query = query.outerjoin(CaseStatsEvent, CaseStatsEvent.case_stats_id == CaseStats.id)\
-                                .group_by(CaseStats.id)
-                    ordering = func.min(CaseStatsEvent.creation_date)
+                    ordering = CaseStats.first_event_date
                 else:
                     ordering = getattr(CaseStats, order_by)
                 if order_desc:
@@ -151,194 +209,123 @@ class Statistics:
         results = list(session.exec(query).all())
         return results
 
-    def get_cases_csv(self, session: Session, bank: str) -> io.BytesIO:
-        """Returns the all bank cases information as csv files."""
-        query = select(CaseStats).where(CaseStats.bank == bank)
-
-        results = list(session.exec(query).all())
-        if not results:
-            return []
-        
-        df = pd.DataFrame([case.model_dump() for case in results]).drop(columns=["id"], errors="ignore")
-
-        df["bank"] = df["bank"].map(BANK_TRANSLATION).fillna(df["bank"])
-        df["case_type"] = df["case_type"].map(CASE_TYPE_TRANSLATIONS).fillna(df["case_type"])
-        df["legal_stage"] = df["legal_stage"].map(LEGAL_STAGE_TRANSLATIONS).fillna(df["legal_stage"])
-        df["result"] = df["result"].map(RESULT_TRANSLATIONS).fillna(df["result"])
-
-        column_order = [
-            "title", "case_role", "case_type", "result", "bank", "year", "court_city",
-            "court_number", "legal_stage", "amount", "currency",
-        ]
-        
-        column_rename_map = {
-            "court_city": "Ciudad del juzgado",
-            "year": "Año",
-            "legal_stage": "Etapa legal",
-            "amount": "Monto",
-            "result": "Resultado",
-            "bank": "Banco",
-            "court_number": "Número de causa",
-            "case_role": "Rol",
-            "case_type": "Tipo",
-            "title": "Caratulado",
-            "currency": "Moneda"
-        }
-
-        df = df[column_order].rename(columns=column_rename_map)
-        if "Moneda" in df.columns:
-            df["Moneda"] = df["Moneda"].astype(str).str.upper()
-
-        chunk_size = 10000
-        num_chunks = (len(df) // chunk_size) + (1 if len(df) % chunk_size else 0)
-        zip_buffer = io.BytesIO()
-
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for i in range(num_chunks):
-                chunk_df = df.iloc[i * chunk_size:(i + 1) * chunk_size]
-                csv_buffer = io.StringIO()
-                chunk_df.to_csv(csv_buffer, index=False, encoding="utf-8-sig")
-                zip_file.writestr(f"casos_p{i + 1}.csv", csv_buffer.getvalue())
-
-        zip_buffer.seek(0)
-        return zip_buffer
-
-    def get_probable_case_stats(self, session: Session, case: Case) -> ProbableCaseStats | None:
-        case_type = (
+    def get_cases_page(
+            self,
+            session: Session,
+            cursor: str,
+            limit: int,
+            bank: str,
+            status: list[str] | None,
+            order_desc: bool | None,
+        ) -> tuple[list[CaseStats], str | None]:
+        """Returns the page of cases after `cursor`, ordered by id, see `keyset_page`."""
+        query = self.filter_cases(select(CaseStats), bank, status)
+        return keyset_page(session, query, [CaseStats.id], lambda case: (case.id,), cursor, min(limit, 100), bool(order_desc))
+
+    def iter_cases_csv(self, bank: str) -> Iterator[bytes]:
+        """
+        Streams all the bank cases information as a zip of csv files of CSV_CHUNK_SIZE rows each. Rows are read with a
+        server-side cursor and compressed bytes are yielded as soon as they are written, so memory stays constant.
+        The generator opens its own session because it runs after the request handler returned.
+        """
+        columns = [getattr(CaseStats, column) for column in CSV_COLUMNS]
+        query = select(*columns).where(CaseStats.bank == bank).execution_options(yield_per=CSV_FETCH_SIZE)
+        output = _ZipOutput()
+        session = next(get_session())
+        try:
+            with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                csv_file: io.TextIOWrapper | None = None
+                rows_in_file = 0
+                for index, row in enumerate(session.exec(query)):
+                    if csv_file is None or rows_in_file == CSV_CHUNK_SIZE:
+                        if csv_file is not None:
+                            csv_file.close()
+                        csv_file = io.TextIOWrapper(
+                            zip_file.open(f"casos_p{index // CSV_CHUNK_SIZE + 1}.csv", "w"),
+                            encoding="utf-8-sig",
+                            newline="",
+                        )
+                        writer = csv.writer(csv_file)
+                        writer.writerow(CSV_HEADERS)
+                        rows_in_file = 0
+                    writer.writerow(_csv_row(row))
+                    rows_in_file += 1
+                    if rows_in_file % CSV_FETCH_SIZE == 0:
+                        csv_file.flush()
+                        yield output.drain()
+                if csv_file is not None:
+                    csv_file.close()
+            yield output.drain()
+        finally:
+            session.close()
+
+    def get_case_type(self, case: Case) -> str:
+        """Returns the CaseStats case type matching the legal subject of a case."""
+        return (
             "promissory_note_collection"
             if case.legal_subject == LegalSubject.PROMISSORY_NOTE_COLLECTION
             else case.legal_subject.value
         )
 
-        # Event types for the current case
+    def get_case_legal_stage(self, session: Session, case: Case) -> str | None:
+        """Returns the CaseStats legal stage reached by a case, given its event types."""
         events_query = select(CaseEvent.type).where(CaseEvent.case_id == case.id)
         events = session.exec(events_query).all()
-        case_legal_stage = map_events_to_legal_stage(events) if events else None
-
-        # Total, compromise, and withdrawal query
-        total_query = select(func.count(CaseStats.id)).where(
-            CaseStats.case_type == case_type,
-            CaseStats.result != "pending"
-        )
-        total_count = session.exec(total_query).first() or 0
-
-        compromise_query = select(func.count(CaseStats.id)).where(
-            CaseStats.case_type == case_type,
-            CaseStats.result == "settlement",
-        )
-        compromise_count = session.exec(compromise_query).first() or 0
-        overall_compromise_chance = compromise_count / total_count if total_count > 0 else None
-
-        withdrawal_query = select(func.count(CaseStats.id)).where(
-            CaseStats.case_type == case_type,
-            CaseStats.result == "desisted",
-        )
-        withdrawal_count = session.exec(withdrawal_query).first() or 0
-        overall_withdrawal_chance = withdrawal_count / total_count if total_count > 0 else None
-
-        similar_total_count = 0
-        similar_compromise_chance = None
-        similar_withdrawal_chance = None
+        return map_events_to_legal_stage(events) if events else None
 
-        if case.amount_currency and case.amount is not None:
-            lower_bound = case.amount * 0.8
-            upper_bound = case.amount * 1.2
-
-            base_filters = [
-                CaseStats.case_type == case_type,
-                CaseStats.result != "pending",
+    def get_probable_case_stats(self, session: Session, case: Case) -> ProbableCaseStats | None:
+        case_type = self.get_case_type(case)
+        case_legal_stage = self.get_case_legal_stage(session, case)
+
+        has_amount = bool(case.amount_currency) and case.amount is not None
+        currency = case.amount_currency.value if has_amount else None
+        amount = case.amount if has_amount else None
+        engine = get_case_stats_engine()
+        if engine.ready:
+            return engine.probable_stats(case_type, currency, amount, case_legal_stage)
+
+        # Sin el motor en memoria se calcula en Postgres y se guarda en caché. La clave agrupa los montos en bandas,
+        # si no cada causa tendría su propia entrada, pero la ventana de causas similares usa el monto exacto
+        cache_key = (case_type, currency, amount_band(amount) if has_amount else None, case_legal_stage)
+        cache = get_probable_stats_cache()
+        if (cached := cache.get(cache_key)) is not None:
+            return cached
+
+        settled = CaseStats.result == "settlement"
+        desisted = CaseStats.result == "desisted"
+        resolved = CaseStats.result != "pending"
+        # Terminadas por sentencia u otra vía judicial, sin avenimiento ni desistimiento
+        judicial = CaseStats.result.not_in(["pending", "desisted", "settlement"])
+        aggregates = [
+            func.count(CaseStats.id).filter(resolved),
+            func.count(CaseStats.id).filter(settled),
+            func.count(CaseStats.id).filter(desisted),
+            func.avg(CaseStats.duration).filter(settled),
+            func.avg(CaseStats.duration).filter(judicial),
+        ]
+        if has_amount:
+            # Causas similares: mismo tipo y moneda, monto en ±20% y, si aplica, que pasaron por la misma etapa
+            similar = [
                 CaseStats.amount.is_not(None),
-                CaseStats.currency == case.amount_currency.value,
-                CaseStats.amount.between(lower_bound, upper_bound),
+                CaseStats.currency == currency,
+                CaseStats.amount.between(amount * 0.8, amount * 1.2),
             ]
-
-            if case_legal_stage in ["exceptions", "exceptions_response", "demand_notification"]:
-                base_filters.append(
+            if case_legal_stage in SIMILAR_CASE_STAGES:
+                similar.append(
                     CaseStats.id.in_(
                         select(CaseStatsEvent.case_stats_id)
                         .where(CaseStatsEvent.type == case_legal_stage)
                     )
                 )
-
-            similar_total_query = select(func.count(CaseStats.id)).where(*base_filters)
-            similar_total_count = session.exec(similar_total_query).first() or 0
-
-            similar_compromise_query = select(func.count(CaseStats.id)).where(
-                *base_filters,
-                CaseStats.result == "settlement",
-            )
-            similar_compromise_count = session.exec(similar_compromise_query).first() or 0
-
-            similar_withdrawal_query = select(func.count(CaseStats.id)).where(
-                *base_filters,
-                CaseStats.result == "desisted",
-            )
-            similar_withdrawal_count = session.exec(similar_withdrawal_query).first() or 0
-
-            if similar_total_count > 50:
-                similar_compromise_chance = similar_compromise_count / similar_total_count
-                similar_withdrawal_chance = similar_withdrawal_count / similar_total_count
-        
-        compromise_chance = similar_compromise_chance if similar_compromise_chance is not None else overall_compromise_chance
-        withdrawal_chance = similar_withdrawal_chance if similar_withdrawal_chance is not None else overall_withdrawal_chance
-
-        # Average duration query
-        avg_settlement_query = select(func.avg(CaseStats.duration)).where(
-            CaseStats.case_type == case_type,
-            CaseStats.result == "settlement"
-        )
-        avg_settlement_duration = session.exec(avg_settlement_query).first() or 0
-
-        avg_non_settlement_query = select(func.avg(CaseStats.duration)).where(
-            CaseStats.case_type == case_type,
-            CaseStats.result.not_in(["pending", "desisted", "settlement"])
-        )
-        avg_non_settlement_duration = session.exec(avg_non_settlement_query).first() or 0
-
-        if avg_non_settlement_duration is not None and avg_settlement_duration is not None:
-            days_saved = int(avg_non_settlement_duration - avg_settlement_duration)
-            overall_days_to_resolve = max(days_saved, 0)
-        else:
-            overall_days_to_resolve = None
-        
-        similar_days_to_resolve = None
-
-        if similar_total_count > 50 and case.amount_currency and case.amount is not None:
-            lower_bound = case.amount * 0.8
-            upper_bound = case.amount * 1.2
-                        
-            base_filters = [
-                CaseStats.case_type == case_type,
-                CaseStats.result.not_in(["pending", "desisted", "settlement"]),
-                CaseStats.amount.is_not(None),
-                CaseStats.currency == case.amount_currency.value,
-                CaseStats.amount.between(lower_bound, upper_bound)
+            aggregates += [
+                func.count(CaseStats.id).filter(resolved, *similar),
+                func.count(CaseStats.id).filter(settled, *similar),
+                func.count(CaseStats.id).filter(desisted, *similar),
+                func.avg(CaseStats.duration).filter(settled, *similar),
+                func.avg(CaseStats.duration).filter(judicial, *similar),
             ]
 
-            if case_legal_stage in ["exceptions", "exceptions_response", "demand_notification"]:
-                base_filters.append(
-                    CaseStats.id.in_(
-                        select(CaseStatsEvent.case_stats_id)
-                        .where(CaseStatsEvent.type == case_legal_stage)
-                    )
-                )
-
-            similar_non_settlement_query = select(func.avg(CaseStats.duration)).where(*base_filters)
-            avg_similar_non_settlement_duration = session.exec(similar_non_settlement_query).first() or 0
-
-            similar_settlement_query = select(func.avg(CaseStats.duration)).where(
-                *base_filters,
-                CaseStats.result == "settlement",
-            )
-            avg_similar_settlement_duration = session.exec(similar_settlement_query).first() or 0
-
-            similar_days_to_resolve = max(int(avg_similar_non_settlement_duration - avg_similar_settlement_duration), 0)
-        
-        days_to_resolve = similar_days_to_resolve if similar_days_to_resolve is not None else overall_days_to_resolve
-
-        return ProbableCaseStats(
-            compromise_amount_percentage=None, #TODO: Add settlement for amount in CaseStats
-            compromise_chance=compromise_chance,
-            days_to_resolve=days_to_resolve,
-            withdrawal_chance=withdrawal_chance,
-        )
+        row = session.exec(select(*aggregates).where(CaseStats.case_type == case_type)).one()
+        stats = build_probable_case_stats(tuple(row[:5]), tuple(row[5:]) if has_amount else None)
+        cache.store(cache_key, stats)
+        return stats
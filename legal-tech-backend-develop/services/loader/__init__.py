@@ -1 +1,3 @@
+from .ocr_backend import LocalOcrBackend, OcrBackend, TextractOcrBackend, get_ocr_backend
+from .page_pruner import PagePruner
 from .pdf_loader import PdfLoader
\ No newline at end of file
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+import pikepdf
+
+
+# A file to load, either a path on disk or an open binary handle (e.g. the spooled body of an UploadFile)
+FileSource = str | BinaryIO
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def source_name(source: FileSource) -> str:
+    """Returns a printable name for a file source, used in logs and document metadata."""
+    if isinstance(source, str):
+        return source
+    name = getattr(source, "name", None)
+    return name if isinstance(name, str) else "<stream>"
+
+
+def source_size(source: FileSource) -> int:
+    """Returns the size in bytes of a file source without reading it."""
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    position = source.tell()
+    source.seek(0, os.SEEK_END)
+    size = source.tell()
+    source.seek(position)
+    return size
+
+
+def count_source_pages(source: FileSource) -> int:
+    """Returns the page count of a PDF source, or 0 if it cannot be read as a PDF."""
+    try:
+        with open_source(source) as stream, pikepdf.open(stream) as pdf:
+            return len(pdf.pages)
+    except Exception:
+        return 0
+
+
+@contextmanager
+def open_source(source: FileSource) -> Iterator[BinaryIO]:
+    """Yields a binary handle positioned at the start, only closing it if it was opened here."""
+    if isinstance(source, str):
+        with open(source, "rb") as file:
+            yield file
+    else:
+        source.seek(0)
+        yield source
+
+
+@contextmanager
+def as_file_path(source: FileSource) -> Iterator[str]:
+    """
+    Yields a path on disk for the source. Handles are spilled to a temporary file in chunks,
+    only for consumers that need a real path (e.g. worker processes), and removed afterwards.
+    """
+    if isinstance(source, str):
+        yield source
+        return
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
+        temp_file_path = temp_file.name
+        source.seek(0)
+        shutil.copyfileobj(source, temp_file, COPY_CHUNK_SIZE)
+    try:
+        yield temp_file_path
+    finally:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
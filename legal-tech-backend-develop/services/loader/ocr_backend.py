@@ -0,0 +1,297 @@
+import io
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from abc import ABC, abstractmethod
+from typing import Iterator
+
+import pikepdf
+import pypdfium2
+from botocore.exceptions import ClientError
+from langchain_core.documents import Document
+
+from config import Config
+from storage import S3Storage, TextractWrapper
+from .file_source import FileSource, as_file_path, open_source, source_name, source_size
+from .pdfium_pool import count_pages, get_pdfium_pool
+
+
+OCR_BACKEND_TEXTRACT = "textract"
+OCR_BACKEND_LOCAL = "local"
+
+# Límites de la API síncrona de Textract (detect_document_text): 1 página y 10 MB en memoria
+TEXTRACT_MODE_SYNC = "sync"
+TEXTRACT_MODE_ASYNC = "async"
+TEXTRACT_SYNC_MAX_PAGES = 1
+TEXTRACT_SYNC_MAX_BYTES = 10 * 1024 * 1024
+TEXTRACT_SYNC_FALLBACK_ERRORS = {"UnsupportedDocumentException", "DocumentTooLargeException", "BadDocumentException"}
+PDF_MAGIC = b"%PDF"
+
+LOCAL_MODE_TESSERACT = "tesseract"
+LOCAL_MODE_NATIVE = "native"
+
+# Mínimo de caracteres en la capa de texto nativa para omitir OCR en una página (backend local)
+LOCAL_OCR_MIN_NATIVE_CHARACTERS = 32
+
+
+def count_pdf_pages(data: bytes) -> int | None:
+    """Returns the page count of a PDF given its bytes, 1 for images, or None if it cannot be read."""
+    if not data.startswith(PDF_MAGIC):
+        return 1
+    try:
+        with pikepdf.open(io.BytesIO(data)) as pdf:
+            return len(pdf.pages)
+    except Exception as e:
+        logging.warning(f"  ⚠️ [OCR] No se pudo contar páginas del PDF: {e}")
+        return None
+
+
+def documents_from_page_texts(pages_text: dict[int, str], file_path: str) -> Iterator[Document]:
+    """Yields one Document per non-empty page, or a single empty Document if there is no text at all."""
+    thread_id = threading.current_thread().ident
+    yielded = False
+    for page_number in sorted(pages_text.keys()):
+        page_text = pages_text[page_number].strip()
+        if page_text:
+            yielded = True
+            yield Document(
+                page_content=page_text,
+                metadata={"source": file_path, "page": page_number}
+            )
+            logging.info(f"  📄 [OCR] [Thread {thread_id}] Página {page_number + 1} procesada: {len(page_text)} caracteres")
+    if yielded:
+        logging.info(f"  📄 [OCR] [Thread {thread_id}] Total de páginas procesadas: {len(pages_text)}")
+    else:
+        logging.warning(f"  📄 [OCR] [Thread {thread_id}] No se extrajo texto del documento")
+        # Yield empty document to maintain consistency
+        yield Document(
+            page_content="",
+            metadata={"source": file_path, "page": 0}
+        )
+
+
+class OcrBackend(ABC):
+    """Base class for OCR engines used by PdfLoader."""
+    name: str = ""
+
+    def __init__(self) -> None:
+        self.time: float = 0.0  # Time spent in the OCR engine during the last parse, in seconds
+        self.mode: str | None = None  # Engine specific execution mode used during the last parse
+
+    @abstractmethod
+    def parse(self, source: FileSource) -> Iterator[Document]:
+        """Subclasses must implement this method to yield one Document per page of the given file path or handle."""
+        pass
+
+
+class TextractOcrBackend(OcrBackend):
+    """
+    OCR using Amazon Textract.
+    Small documents (single page, within the synchronous size limit) are sent as bytes to the
+    synchronous API, otherwise the PDF is uploaded to S3 and processed with the async method.
+    """
+    name = OCR_BACKEND_TEXTRACT
+
+    def parse(self, source: FileSource) -> Iterator[Document]:
+        thread_id = threading.current_thread().ident
+        file_path = source_name(source)
+        logging.info(f"  📄 [Textract] [Thread {thread_id}] Iniciando parse() para: {file_path}")
+
+        s3_storage = None
+        s3_key = None
+
+        try:
+            # Step 1: Choose Textract API, only reading in memory files that fit the synchronous limits
+            file_size = source_size(source)
+            file_size_mb = file_size / (1024 * 1024)
+            pdf_data: bytes | None = None
+            self.mode = TEXTRACT_MODE_ASYNC
+            if file_size <= TEXTRACT_SYNC_MAX_BYTES:
+                with open_source(source) as stream:
+                    pdf_data = stream.read()
+                page_count = count_pdf_pages(pdf_data)
+                if page_count is not None and page_count <= TEXTRACT_SYNC_MAX_PAGES:
+                    self.mode = TEXTRACT_MODE_SYNC
+            logging.info(f"  📄 [Textract] [Thread {thread_id}] Archivo de {file_size_mb:.2f} MB, modo Textract seleccionado: {self.mode}")
+
+            textract_wrapper = TextractWrapper()
+            raw_results: list[dict] | None = None
+            textract_start = time.time()
+            if self.mode == TEXTRACT_MODE_SYNC:
+                # Step 2 (sync): Send bytes directly to Textract
+                logging.info(f"  📄 [Textract] [Thread {thread_id}] Iniciando extracción de texto (método síncrono)...")
+                try:
+                    raw_results = [textract_wrapper.detect_file_text(document_bytes=pdf_data)]
+                except ClientError as e:
+                    error_code = e.response.get("Error", {}).get("Code", "Unknown")
+                    if error_code not in TEXTRACT_SYNC_FALLBACK_ERRORS:
+                        raise
+                    logging.warning(f"  ⚠️ [Textract] [Thread {thread_id}] Textract síncrono rechazó el documento ({error_code}), usando método asíncrono")
+                    self.mode = TEXTRACT_MODE_ASYNC
+            pdf_data = None
+
+            if raw_results is None:
+                # Step 2 (async): Stream PDF to S3 (multipart for large files)
+                logging.info(f"  📄 [Textract] [Thread {thread_id}] Subiendo PDF a S3...")
+                s3_storage = S3Storage()
+
+                # Generate unique S3 key for this PDF
+                s3_key = f"textract-temp/{uuid.uuid4()}.pdf"
+
+                upload_start = time.time()
+                with open_source(source) as stream:
+                    s3_storage.save_stream(s3_key, stream)
+                upload_time = time.time() - upload_start
+                logging.info(f"  📄 [Textract] [Thread {thread_id}] PDF subido a S3: s3://{s3_storage.bucket}/{s3_key} en {upload_time:.4f}s")
+
+                # Step 3 (async): Extract text using Textract async method
+                logging.info(f"  📄 [Textract] [Thread {thread_id}] Iniciando extracción de texto (método asíncrono)...")
+                raw_results = textract_wrapper.detect_document_text_from_s3(
+                    bucket=s3_storage.bucket,
+                    document_key=s3_key,
+                    poll_interval=5,
+                    return_raw_results=True
+                )
+            self.time = round(time.time() - textract_start, 4)
+            logging.info(f"  🔍 [Textract] Tiempo total de procesamiento ({self.mode}): {self.time:.4f}s")
+
+            # Step 4: Convert extracted text to LangChain Documents by page
+            yield from documents_from_page_texts(self._group_lines_by_page(raw_results), file_path)
+
+        except Exception as e:
+            logging.error(f"  ❌ [Textract] [Thread {thread_id}] Error en parse(): {type(e).__name__}: {e}")
+            logging.error(f"  📋 [Textract] Stack trace: {traceback.format_exc()}")
+            raise
+        finally:
+            # Cleanup: Delete PDF from S3
+            if s3_storage and s3_key:
+                try:
+                    s3_storage.delete(s3_key)
+                    logging.info(f"  📄 [Textract] [Thread {thread_id}] Archivo temporal eliminado de S3: {s3_key}")
+                except Exception as cleanup_error:
+                    logging.warning(f"  ⚠️ [Textract] [Thread {thread_id}] Error eliminando archivo temporal de S3: {cleanup_error}")
+
+    def _group_lines_by_page(self, raw_results: list[dict]) -> dict[int, str]:
+        """Groups Textract LINE blocks by 0-based page number."""
+        pages_lines: dict[int, list[str]] = {}
+        block_count = 0
+        for page_result in raw_results:
+            for block in page_result.get("Blocks", []):
+                block_count += 1
+                if block.get("BlockType") == "LINE":
+                    page_num = block.get("Page", 1) - 1  # Convert to 0-based index
+                    pages_lines.setdefault(page_num, []).append(block.get("Text", ""))
+        logging.info(f"  📄 [Textract] Procesados {block_count} bloques de Textract")
+        return {page_num: "\n".join(lines) for page_num, lines in pages_lines.items()}
+
+
+def _run_tesseract(image_path: str, language: str) -> str:
+    result = subprocess.run(
+        ["tesseract", image_path, "stdout", "-l", language],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def ocr_pdf_page(file_path: str, page_number: int, dpi: int, language: str) -> tuple[int, str, bool]:
+    """
+    Worker function, runs inside a pool process with its own pdfium instance.
+    Uses the native text layer when available, otherwise rasterizes the page and runs Tesseract.
+
+    Returns:
+        tuple[int, str, bool]: Page number, extracted text, and whether OCR was applied
+    """
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        page = pdf[page_number]
+        text_page = page.get_textpage()
+        content = text_page.get_text_range().strip()
+        text_page.close()
+        if len(content) >= LOCAL_OCR_MIN_NATIVE_CHARACTERS:
+            page.close()
+            return page_number, content, False
+        bitmap = page.render(scale=dpi / 72)
+        image = bitmap.to_pil()
+        bitmap.close()
+        page.close()
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
+            temp_file_path = temp_file.name
+        try:
+            image.save(temp_file_path)
+            return page_number, _run_tesseract(temp_file_path, language), True
+        finally:
+            os.remove(temp_file_path)
+    finally:
+        pdf.close()
+
+
+def _ocr_image(file_path: str, language: str) -> tuple[int, str, bool]:
+    """Worker function that runs Tesseract over a single image file."""
+    return 0, _run_tesseract(file_path, language), True
+
+
+class LocalOcrBackend(OcrBackend):
+    """
+    OCR using a local Tesseract installation, without network access.
+    Pages are rasterized with pypdfium2 and recognized in parallel worker processes.
+    """
+    name = OCR_BACKEND_LOCAL
+
+    def __init__(self, dpi: int | None = None, language: str | None = None) -> None:
+        super().__init__()
+        self.dpi = dpi or Config.LOCAL_OCR_DPI
+        self.language = language or Config.LOCAL_OCR_LANGUAGE
+
+    def parse(self, source: FileSource) -> Iterator[Document]:
+        thread_id = threading.current_thread().ident
+        file_path = source_name(source)
+        logging.info(f"  📄 [LocalOCR] [Thread {thread_id}] Iniciando parse() para: {file_path}")
+        ocr_start = time.time()
+        try:
+            with open_source(source) as stream:
+                header = stream.read(len(PDF_MAGIC))
+            pool = get_pdfium_pool()
+            # Worker processes need a path on disk, handles are spilled only for this backend
+            with as_file_path(source) as local_path:
+                if header != PDF_MAGIC:
+                    futures = [pool.submit(_ocr_image, local_path, self.language)]
+                else:
+                    futures = [
+                        pool.submit(ocr_pdf_page, local_path, page_number, self.dpi, self.language)
+                        for page_number in range(count_pages(local_path))
+                    ]
+                pages_text: dict[int, str] = {}
+                ocr_pages = 0
+                for future in futures:
+                    page_number, content, applied_ocr = future.result()
+                    pages_text[page_number] = content
+                    ocr_pages += int(applied_ocr)
+            self.mode = LOCAL_MODE_TESSERACT if ocr_pages else LOCAL_MODE_NATIVE
+            self.time = round(time.time() - ocr_start, 4)
+            logging.info(f"  🔍 [LocalOCR] {len(futures)} páginas ({ocr_pages} con OCR) en {self.time:.4f}s")
+        except Exception as e:
+            logging.error(f"  ❌ [LocalOCR] [Thread {thread_id}] Error en parse(): {type(e).__name__}: {e}")
+            logging.error(f"  📋 [LocalOCR] Stack trace: {traceback.format_exc()}")
+            raise
+        yield from documents_from_page_texts(pages_text, file_path)
+
+
+OCR_BACKENDS: dict[str, type[OcrBackend]] = {
+    OCR_BACKEND_TEXTRACT: TextractOcrBackend,
+    OCR_BACKEND_LOCAL: LocalOcrBackend,
+}
+
+
+def get_ocr_backend(name: str | None = None) -> OcrBackend:
+    """Creates the OCR backend with the given name, or the deployment default (OCR_BACKEND)."""
+    backend_name = (name or Config.OCR_BACKEND).lower()
+    if backend_name not in OCR_BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {backend_name}, expected one of {list(OCR_BACKENDS.keys())}")
+    return OCR_BACKENDS[backend_name]()
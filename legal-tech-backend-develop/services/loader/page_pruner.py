@@ -0,0 +1,115 @@
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import traceback
+import unicodedata
+
+import pikepdf
+
+from config import Config
+from .ocr_backend import LOCAL_OCR_MIN_NATIVE_CHARACTERS, ocr_pdf_page
+from .pdfium_pool import count_pages, extract_text_pages, get_pdfium_pool
+
+
+def normalize_text(text: str) -> str:
+    """Lowercases text and removes accents, so keyword matching tolerates OCR and casing differences."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class PagePruner:
+    """
+    Selects the pages of a PDF worth sending to full OCR and LLM extraction.
+    Pages are scored by whole-word keyword hits over their native text layer. Scanned pages are scored over a single
+    low resolution Tesseract pass (`sample_dpi`, 0 to disable), and kept unscored if the sample cannot be taken.
+    """
+
+    def __init__(self, keywords: list[str], min_score: int = 1, min_pages: int | None = None, sample_dpi: int | None = None, language: str | None = None) -> None:
+        self.keywords = [normalize_text(keyword) for keyword in keywords]
+        # Palabras completas, para que "rol" o "rut" no cuenten dentro de "control" o "bruto"
+        self.patterns = [re.compile(rf"\b{re.escape(keyword)}\b") for keyword in self.keywords]
+        self.min_score = min_score
+        self.min_pages = min_pages if min_pages is not None else Config.PAGE_PRUNING_MIN_PAGES
+        self.sample_dpi = sample_dpi if sample_dpi is not None else Config.PAGE_PRUNING_SAMPLE_DPI
+        self.language = language or Config.LOCAL_OCR_LANGUAGE
+        self.time: float = 0.0
+
+    def score(self, text: str) -> int:
+        """Counts how many keywords of the profile appear as whole words in the given text."""
+        normalized = normalize_text(text)
+        return sum(1 for pattern in self.patterns if pattern.search(normalized))
+
+    def select_pages(self, file_path: str) -> tuple[int, list[int], dict[int, int], list[int], list[int]]:
+        """
+        Scores every page and selects the relevant ones.
+        Files shorter than min_pages are not scored, so their scanned pages are never sampled. The first page and
+        every unscored page are always kept, and if no scored page reaches the minimum score every page is kept.
+
+        Returns:
+            tuple: Total pages, kept 0-based page numbers, score per scored page, pages scored from an OCR sample,
+            and pages kept without a score
+        """
+        thread_id = threading.current_thread().ident
+        start_time = time.time()
+        page_count = count_pages(file_path)
+        if page_count < self.min_pages:
+            return page_count, list(range(page_count)), {}, [], []
+
+        scores: dict[int, int] = {}
+        scanned_pages: list[int] = []
+        for page_number, content in sorted(extract_text_pages(file_path).items()):
+            if len(content) >= LOCAL_OCR_MIN_NATIVE_CHARACTERS:
+                scores[page_number] = self.score(content)
+            else:
+                scanned_pages.append(page_number)
+        sampled_pages, unscored_pages = self._sample_scanned_pages(file_path, scanned_pages, scores)
+
+        relevant_pages = {page_number for page_number, score in scores.items() if score >= self.min_score}
+        if relevant_pages:
+            kept_pages = sorted(relevant_pages | set(unscored_pages) | {0})
+        else:
+            kept_pages = list(range(page_count))
+        self.time = round(time.time() - start_time, 4)
+        logging.info(f"  ✂️ [PagePruner] [Thread {thread_id}] {len(kept_pages)}/{page_count} páginas relevantes ({len(sampled_pages)} muestreadas con OCR, {len(unscored_pages)} sin puntaje) en {self.time:.4f}s")
+        return page_count, kept_pages, scores, sampled_pages, unscored_pages
+
+    def _sample_scanned_pages(self, file_path: str, page_numbers: list[int], scores: dict[int, int]) -> tuple[list[int], list[int]]:
+        """Scores pages without a text layer over a low resolution OCR pass in the pdfium pool, returns sampled and unscored pages."""
+        if not page_numbers or self.sample_dpi <= 0:
+            return [], list(page_numbers)
+        pool = get_pdfium_pool()
+        futures = {
+            page_number: pool.submit(ocr_pdf_page, file_path, page_number, self.sample_dpi, self.language)
+            for page_number in page_numbers
+        }
+        sampled_pages: list[int] = []
+        unscored_pages: list[int] = []
+        for page_number, future in futures.items():
+            try:
+                _, content, _ = future.result()
+            except Exception as e:
+                logging.warning(f"  ⚠️ [PagePruner] No se pudo muestrear la página {page_number + 1} con OCR, se conservará: {type(e).__name__}: {e}")
+                unscored_pages.append(page_number)
+                continue
+            scores[page_number] = self.score(content)
+            sampled_pages.append(page_number)
+        return sampled_pages, unscored_pages
+
+    def write_subset(self, file_path: str, page_numbers: list[int]) -> str:
+        """Writes a new temporary PDF with only the given pages, the caller must remove it."""
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
+            subset_path = temp_file.name
+        try:
+            with pikepdf.open(file_path) as source, pikepdf.new() as subset:
+                for page_number in page_numbers:
+                    subset.pages.append(source.pages[page_number])
+                subset.save(subset_path)
+        except Exception:
+            logging.error(f"  ❌ [PagePruner] Error escribiendo PDF reducido: {traceback.format_exc()}")
+            if os.path.exists(subset_path):
+                os.remove(subset_path)
+            raise
+        return subset_path
@@ -0,0 +1,118 @@
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import pikepdf
+import pypdfium2
+
+from config import Config
+
+
+# PDFium no es seguro para hilos: no se puede llamar a pdfium simultáneamente en distintos hilos,
+# ni siquiera con documentos distintos. En lugar de serializar todo con un lock global, cada
+# proceso del pool tiene su propia instancia de pdfium y las páginas se reparten entre procesos.
+_pdfium_pool: ProcessPoolExecutor | None = None
+_pdfium_pool_lock = threading.Lock()
+
+
+def get_pdfium_pool() -> ProcessPoolExecutor:
+    """Returns the shared process pool for pdfium work, created on first use."""
+    global _pdfium_pool
+    with _pdfium_pool_lock:
+        if _pdfium_pool is None:
+            # spawn evita heredar locks de otros hilos del servidor al hacer fork
+            _pdfium_pool = ProcessPoolExecutor(
+                max_workers=Config.PDF_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logging.info(f"  📄 [PdfiumPool] Pool de procesos creado con {Config.PDF_PROCESS_WORKERS} workers")
+        return _pdfium_pool
+
+
+def count_pages(file_path: str) -> int:
+    """Returns the page count of a PDF file without touching pdfium in the calling process."""
+    with pikepdf.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def _chunk_pages(page_count: int, chunks: int) -> list[list[int]]:
+    """Splits page numbers into contiguous chunks, so each worker opens the document once per chunk."""
+    chunks = max(1, min(chunks, page_count))
+    size, remainder = divmod(page_count, chunks)
+    result = []
+    start = 0
+    for index in range(chunks):
+        end = start + size + (1 if index < remainder else 0)
+        result.append(list(range(start, end)))
+        start = end
+    return result
+
+
+def _extract_pages_text(file_path: str, page_numbers: list[int]) -> list[tuple[int, str]]:
+    """Worker function, extracts the native text layer of the given pages."""
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        result = []
+        for page_number in page_numbers:
+            page = pdf[page_number]
+            text_page = page.get_textpage()
+            result.append((page_number, text_page.get_text_range().strip()))
+            text_page.close()
+            page.close()
+        return result
+    finally:
+        pdf.close()
+
+
+def _render_page(file_path: str, page_number: int, scale: float) -> bytes:
+    """Worker function, rasterizes a page and returns it as PNG bytes."""
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        page = pdf[page_number]
+        bitmap = page.render(scale=scale)
+        image = bitmap.to_pil()
+        bitmap.close()
+        page.close()
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+    finally:
+        pdf.close()
+
+
+def extract_text_pages(file_path: str, page_numbers: list[int] | None = None) -> dict[int, str]:
+    """
+    Extracts the native text layer of a PDF, fanning pages out across the pdfium process pool.
+
+    Returns:
+        dict[int, str]: Text per 0-based page number
+    """
+    if page_numbers is None:
+        page_numbers = list(range(count_pages(file_path)))
+    if not page_numbers:
+        return {}
+    pool = get_pdfium_pool()
+    futures: list[Future] = [
+        pool.submit(_extract_pages_text, file_path, [page_numbers[i] for i in chunk])
+        for chunk in _chunk_pages(len(page_numbers), Config.PDF_PROCESS_WORKERS)
+    ]
+    pages_text: dict[int, str] = {}
+    for future in futures:
+        pages_text.update(future.result())
+    return pages_text
+
+
+def render_pages(file_path: str, scale: float, page_numbers: list[int] | None = None) -> dict[int, bytes]:
+    """
+    Rasterizes PDF pages in the pdfium process pool, one task per page.
+
+    Returns:
+        dict[int, bytes]: PNG bytes per 0-based page number
+    """
+    if page_numbers is None:
+        page_numbers = list(range(count_pages(file_path)))
+    pool = get_pdfium_pool()
+    futures = {page_number: pool.submit(_render_page, file_path, page_number, scale) for page_number in page_numbers}
+    return {page_number: future.result() for page_number, future in futures.items()}
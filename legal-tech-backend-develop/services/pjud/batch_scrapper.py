@@ -0,0 +1,302 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator
+from urllib.parse import urlparse
+from uuid import UUID
+
+from playwright.async_api import Page, TimeoutError
+from sqlmodel import Session, select
+
+from config import Config
+from database.ext_db import get_session
+from models.api import BatchScrapeCaseResponse, BatchScrapeRequest, BatchScrapeResponse
+from models.pydantic import CaseNotebookRequest, CaseNotebookResponse
+from models.sql import PJUDBatchScrape, PJUDBatchScrapeCase, PJUDBatchScrapeCaseStatus, PJUDBatchScrapeStatus
+from services.pjud.browser_pool import PJUD_CONTEXT_OPTIONS, get_browser_pool
+from services.pjud.download_manager import PJUDDownloadManager
+from services.pjud.notebook_snapshot import get_notebook_snapshot_cache, notebook_snapshot_key
+from services.pjud.pjud_scrapper import PJUD_URL, PJUDScrapper
+from services.pjud.step_profile import StepProfile
+
+
+# Categorías de fallo reportadas por caso
+FAILURE_NOT_FOUND = "not_found"
+FAILURE_TIMEOUT = "timeout"
+FAILURE_NAVIGATION = "navigation"
+FAILURE_ERROR = "error"
+
+
+class HostPoliteness:
+    """
+    Per-host politeness limits shared by every batch: at most `max_concurrency` lookups run against the same host,
+    and two lookups never start less than `min_interval` seconds apart.
+    """
+
+    def __init__(self, max_concurrency: int | None = None, min_interval: float | None = None) -> None:
+        self.max_concurrency = max_concurrency or Config.PJUD_HOST_MAX_CONCURRENCY
+        self.min_interval = Config.PJUD_HOST_MIN_INTERVAL if min_interval is None else min_interval
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._last_start: dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Waits for a free slot on the host of `url`, spacing the start of consecutive lookups."""
+        host = urlparse(url).netloc
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.max_concurrency))
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with semaphore:
+            async with lock:
+                wait_time = self._last_start.get(host, 0.0) + self.min_interval - time.monotonic()
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+                self._last_start[host] = time.monotonic()
+            yield
+
+
+_host_politeness: HostPoliteness | None = None
+
+
+def get_host_politeness() -> HostPoliteness:
+    """Returns the politeness limits shared by every batch scrape."""
+    global _host_politeness
+    if _host_politeness is None:
+        _host_politeness = HostPoliteness()
+    return _host_politeness
+
+
+class PJUDBatchScrapper:
+    """
+    Scrapes the case notebooks of many cases in a single run.
+
+    Cases are spread across `workers` browser contexts taken from the shared pool. Each worker keeps its page on the
+    search by RIT form between consecutive lookups, and only navigates from the home page again after a failure or
+    when its context is renewed every `PJUD_BATCH_CONTEXT_MAX_CASES` cases. The outcome of every case is persisted.
+    """
+
+    def __init__(self, scrapper: PJUDScrapper | None = None, workers: int | None = None, max_attempts: int | None = None) -> None:
+        self.scrapper = scrapper or PJUDScrapper()
+        self.workers = workers or Config.PJUD_BATCH_WORKERS
+        self.max_attempts = max_attempts or Config.PJUD_BATCH_MAX_ATTEMPTS
+        self.politeness = get_host_politeness()
+
+    def create_batch(self, session: Session, request: BatchScrapeRequest) -> PJUDBatchScrape:
+        """Persists a pending batch with one pending outcome per case."""
+        batch = PJUDBatchScrape(save_to_db=request.save_to_db, total_cases=len(request.cases))
+        batch.cases = [
+            PJUDBatchScrapeCase(
+                case_id=case.case_id,
+                case_number=case.case_number,
+                year=case.year,
+                tribunal_id=case.tribunal_id,
+                position=position,
+            )
+            for position, case in enumerate(request.cases)
+        ]
+        session.add(batch)
+        session.commit()
+        session.refresh(batch)
+        return batch
+
+    async def run(self, batch_id: UUID) -> None:
+        """Scrapes every pending case of the batch and records the outcome of each one."""
+        session = next(get_session())
+        try:
+            batch = session.get(PJUDBatchScrape, batch_id)
+            if not batch:
+                logging.error(f">>> ❌ [Batch] Batch {batch_id} no encontrado")
+                return
+            pending_ids = session.exec(
+                select(PJUDBatchScrapeCase.id)
+                .where(PJUDBatchScrapeCase.batch_id == batch_id)
+                .where(PJUDBatchScrapeCase.status != PJUDBatchScrapeCaseStatus.SUCCEEDED.value)
+                .order_by(PJUDBatchScrapeCase.position)
+            ).all()
+            save_to_db = batch.save_to_db
+            batch.status = PJUDBatchScrapeStatus.RUNNING.value
+            batch.started_at = batch.started_at or datetime.utcnow()
+            session.add(batch)
+            session.commit()
+        finally:
+            session.close()
+
+        queue: asyncio.Queue[UUID] = asyncio.Queue()
+        for case_result_id in pending_ids:
+            queue.put_nowait(case_result_id)
+        workers = min(self.workers, len(pending_ids)) or 1
+        logging.info(f">>> 🚀 [Batch] Iniciando batch {batch_id}: {len(pending_ids)} casos, {workers} workers")
+
+        status = PJUDBatchScrapeStatus.COMPLETED
+        try:
+            results = await asyncio.gather(
+                *(self._worker(number, queue, save_to_db) for number in range(1, workers + 1)),
+                return_exceptions=True,
+            )
+            for number, result in enumerate(results, 1):
+                if isinstance(result, Exception):
+                    logging.error(f">>> 💥 [Batch] Worker {number} del batch {batch_id} interrumpido: {result}")
+                    status = PJUDBatchScrapeStatus.FAILED
+        finally:
+            session = next(get_session())
+            try:
+                batch = session.get(PJUDBatchScrape, batch_id)
+                batch.status = status.value
+                batch.finished_at = datetime.utcnow()
+                session.add(batch)
+                session.commit()
+            finally:
+                session.close()
+
+        report = self.get_report(batch_id)
+        logging.info(f">>> 🏁 [Batch] Batch {batch_id} terminado: {report.succeeded_cases} exitosos, {report.failed_cases} fallidos, {report.cases_per_minute} casos/min")
+
+    def get_report(self, batch_id: UUID) -> BatchScrapeResponse | None:
+        """Returns the outcome of every case of the batch, its throughput and the count of each failure reason."""
+        session = next(get_session())
+        try:
+            batch = session.get(PJUDBatchScrape, batch_id)
+            if not batch:
+                return None
+            cases = sorted(batch.cases, key=lambda case_result: case_result.position)
+            statuses = Counter(case_result.status for case_result in cases)
+            finished = statuses[PJUDBatchScrapeCaseStatus.SUCCEEDED.value] + statuses[PJUDBatchScrapeCaseStatus.FAILED.value]
+
+            elapsed_time = None
+            cases_per_minute = None
+            if batch.started_at:
+                elapsed_time = round(((batch.finished_at or datetime.utcnow()) - batch.started_at).total_seconds(), 2)
+                cases_per_minute = round(finished / (elapsed_time / 60), 2) if elapsed_time > 0 else None
+
+            return BatchScrapeResponse(
+                id=batch.id,
+                status=batch.status,
+                total_cases=batch.total_cases,
+                succeeded_cases=statuses[PJUDBatchScrapeCaseStatus.SUCCEEDED.value],
+                failed_cases=statuses[PJUDBatchScrapeCaseStatus.FAILED.value],
+                pending_cases=batch.total_cases - finished,
+                created_at=batch.created_at,
+                started_at=batch.started_at,
+                finished_at=batch.finished_at,
+                elapsed_time=elapsed_time,
+                cases_per_minute=cases_per_minute,
+                failure_reasons=dict(Counter(case_result.failure_reason for case_result in cases if case_result.failure_reason)),
+                cases=[
+                    BatchScrapeCaseResponse(
+                        case_id=case_result.case_id,
+                        case_number=case_result.case_number,
+                        year=case_result.year,
+                        status=case_result.status,
+                        attempts=case_result.attempts,
+                        total_items=case_result.total_items,
+                        failure_reason=case_result.failure_reason,
+                        failure_detail=case_result.failure_detail,
+                        duration=case_result.duration,
+                    )
+                    for case_result in cases
+                ],
+            )
+        finally:
+            session.close()
+
+    async def _worker(self, number: int, queue: asyncio.Queue, save_to_db: bool) -> None:
+        """Takes cases from the queue until it is empty, renewing its browser context every few cases."""
+        while not queue.empty():
+            async with get_browser_pool().context(**PJUD_CONTEXT_OPTIONS) as context:
+                page = await context.new_page()
+                search_ready = False
+                for _ in range(Config.PJUD_BATCH_CONTEXT_MAX_CASES):
+                    try:
+                        case_result_id = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    search_ready = await self._scrape_case(number, page, case_result_id, search_ready, save_to_db)
+            logging.info(f">>> ♻️ [Batch] Worker {number} renueva su contexto de navegador")
+
+    async def _scrape_case(self, number: int, page: Page, case_result_id: UUID, search_ready: bool, save_to_db: bool) -> bool:
+        """
+        Scrapes one case, retrying from the home page on failure, and records its outcome.
+
+        Returns:
+            bool: Whether the page was left on the search by RIT form, ready for the next lookup
+        """
+        case_result = self._update_case_result(
+            case_result_id,
+            status=PJUDBatchScrapeCaseStatus.RUNNING.value,
+            started_at=datetime.utcnow(),
+        )
+        request = CaseNotebookRequest(
+            case_number=case_result.case_number,
+            year=case_result.year,
+            tribunal_id=str(case_result.tribunal_id),
+            save_to_db=save_to_db,
+        )
+        case_id = str(case_result.case_id)
+        logging.info(f">>> 🔎 [Batch] Worker {number}: ROL {request.case_number}-{request.year} (búsqueda reutilizada: {search_ready})")
+
+        start_time = time.time()
+        profile = StepProfile(f"Batch ROL {request.case_number}-{request.year}")
+        outcome: dict = {}
+        for attempt in range(1, self.max_attempts + 1):
+            reused_search = search_ready
+            try:
+                async with PJUDDownloadManager() as downloads:
+                    async with self.politeness.slot(PJUD_URL):
+                        scraped = await self.scrapper.scrape_case_notebook(page, request, downloads, case_id, search_ready=search_ready, profile=profile)
+                    if isinstance(scraped, CaseNotebookResponse):
+                        search_ready = False
+                        reason = FAILURE_NOT_FOUND if scraped.status == 404 else FAILURE_TIMEOUT
+                        outcome = {"failure_reason": reason, "failure_detail": scraped.message}
+                        # Un 404 con la página recién cargada es definitivo; con la búsqueda reutilizada se reintenta
+                        if reason == FAILURE_NOT_FOUND and not reused_search:
+                            break
+                    else:
+                        search_ready = True
+                        response = await self.scrapper.store_case_notebook(scraped, request, case_id, profile=profile)
+                        # El cuaderno recién scrapeado queda disponible para la paginación del endpoint por caso
+                        get_notebook_snapshot_cache().store(notebook_snapshot_key(case_id, request), response)
+                        outcome = {"total_items": response.total_items, "failure_reason": None, "failure_detail": None}
+                        break
+            except TimeoutError as e:
+                search_ready = False
+                outcome = {"failure_reason": FAILURE_TIMEOUT, "failure_detail": str(e)}
+            except RuntimeError as e:
+                search_ready = False
+                outcome = {"failure_reason": FAILURE_NAVIGATION, "failure_detail": str(e)}
+            except Exception as e:
+                search_ready = False
+                outcome = {"failure_reason": FAILURE_ERROR, "failure_detail": str(e)}
+            logging.warning(f">>> ⚠️ [Batch] Worker {number}: intento {attempt}/{self.max_attempts} fallido para ROL {request.case_number}-{request.year}: {outcome.get('failure_detail')}")
+
+        succeeded = outcome.get("failure_reason") is None
+        self._update_case_result(
+            case_result_id,
+            status=(PJUDBatchScrapeCaseStatus.SUCCEEDED if succeeded else PJUDBatchScrapeCaseStatus.FAILED).value,
+            attempts=case_result.attempts + attempt,
+            finished_at=datetime.utcnow(),
+            duration=round(time.time() - start_time, 2),
+            **outcome,
+        )
+        if succeeded:
+            logging.info(f">>> ✅ [Batch] Worker {number}: ROL {request.case_number}-{request.year} completado ({outcome['total_items']} folios)")
+        else:
+            logging.error(f">>> ❌ [Batch] Worker {number}: ROL {request.case_number}-{request.year} fallido ({outcome['failure_reason']})")
+        profile.log_summary()
+        return search_ready
+
+    def _update_case_result(self, case_result_id: UUID, **fields) -> PJUDBatchScrapeCase:
+        session = next(get_session())
+        try:
+            case_result = session.get(PJUDBatchScrapeCase, case_result_id)
+            for field, value in fields.items():
+                setattr(case_result, field, value)
+            session.add(case_result)
+            session.commit()
+            session.refresh(case_result)
+            session.expunge(case_result)
+            return case_result
+        finally:
+            session.close()
@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlparse
+
+from playwright.async_api import Browser, BrowserContext, Playwright, Route, async_playwright
+
+from config import Config
+from models.api import BrowserPoolMetricsResponse
+
+
+BROWSER_LAUNCH_ARGS = [
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor',
+    '--no-sandbox',
+    '--disable-setuid-sandbox'
+]
+
+# Opciones de contexto que usa PJUD para parecer un navegador de escritorio chileno
+PJUD_CONTEXT_OPTIONS = {
+    "viewport": {"width": 1366, "height": 900},
+    "user_agent": 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    "locale": 'es-CL',
+    "timezone_id": 'America/Santiago',
+}
+
+
+def _config_list(value: str) -> list[str]:
+    return [item.strip().lower() for item in value.split(",") if item.strip()]
+
+
+def _host_matches(host: str, domains: list[str]) -> bool:
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+class ResourceBlocker:
+    """
+    Aborts the requests a PJUD automation does not need: resource types in `blocked_types` (images, media and fonts
+    by default) and any request to `blocked_hosts` (analytics and other third-party scripts). Requests to
+    `allowed_hosts` are never aborted. Documents, scripts, XHR and form posts from PJUD always go through.
+    """
+
+    def __init__(self, blocked_types: list[str] | None = None, blocked_hosts: list[str] | None = None, allowed_hosts: list[str] | None = None) -> None:
+        self.blocked_types = set(_config_list(Config.BROWSER_BLOCKED_RESOURCE_TYPES) if blocked_types is None else blocked_types)
+        self.blocked_hosts = _config_list(Config.BROWSER_BLOCKED_HOSTS) if blocked_hosts is None else blocked_hosts
+        self.allowed_hosts = _config_list(Config.BROWSER_ALLOWED_HOSTS) if allowed_hosts is None else allowed_hosts
+        self.blocked_requests = 0
+        self.allowed_requests = 0
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        if _host_matches(host, self.allowed_hosts):
+            return False
+        return resource_type in self.blocked_types or _host_matches(host, self.blocked_hosts)
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self.blocked_requests += 1
+            await route.abort("blockedbyclient")
+        else:
+            self.allowed_requests += 1
+            await route.continue_()
+
+
+class _PooledBrowser:
+    """Chromium instance tracked by the pool, with its use and active context counters."""
+
+    def __init__(self, browser: Browser, generation: int) -> None:
+        self.browser = browser
+        self.generation = generation
+        self.uses = 0
+        self.active = 0
+        self.retired = False
+        self.crashed = False
+
+    @property
+    def usable(self) -> bool:
+        return not self.retired and not self.crashed and self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    Long-lived Chromium shared by every PJUD automation.
+
+    Each caller gets its own isolated BrowserContext (cookies, storage and cache are not shared), while the
+    browser process is reused. The browser is recycled after `max_browser_uses` contexts, or as soon as it
+    disconnects, and the number of simultaneous contexts is capped by `max_contexts`.
+    """
+
+    def __init__(self, max_contexts: int | None = None, max_browser_uses: int | None = None, headless: bool | None = None) -> None:
+        self.max_contexts = max_contexts or Config.BROWSER_POOL_MAX_CONTEXTS
+        self.max_browser_uses = max_browser_uses or Config.BROWSER_POOL_MAX_USES
+        self.headless = Config.BROWSER_POOL_HEADLESS if headless is None else headless
+        self._playwright: Playwright | None = None
+        self._browser: _PooledBrowser | None = None
+        self._semaphore = asyncio.Semaphore(self.max_contexts)
+        self._lock = asyncio.Lock()
+        self._generation = 0
+        self._active_contexts = 0
+        self._waiting = 0
+        self._peak_active = 0
+        self._total_contexts = 0
+        self._total_wait_time = 0.0
+        self._recycled = 0
+        self._crashed = 0
+        self._blocked_requests = 0
+        self._allowed_requests = 0
+
+    async def start(self) -> None:
+        """Starts the Playwright driver, the browser itself is launched on the first context request."""
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+                logging.info(f">>> 🌐 [BrowserPool] Pool iniciado (max_contexts={self.max_contexts}, max_uses={self.max_browser_uses})")
+
+    async def stop(self) -> None:
+        """Closes the current browser and stops the Playwright driver."""
+        async with self._lock:
+            if self._browser is not None:
+                await self._close_browser(self._browser)
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+                logging.info(">>> 🌐 [BrowserPool] Pool detenido")
+
+    @asynccontextmanager
+    async def context(self, block_resources: bool | None = None, **options) -> AsyncIterator[BrowserContext]:
+        """
+        Hands out an isolated browser context, waiting for a free slot if the pool is at capacity.
+
+        Args:
+            block_resources: Abort the requests filtered by `ResourceBlocker`, defaults to BROWSER_BLOCK_RESOURCES
+            **options: Keyword arguments forwarded to `Browser.new_context`
+        """
+        if block_resources is None:
+            block_resources = Config.BROWSER_BLOCK_RESOURCES
+        wait_start = time.time()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._total_wait_time += time.time() - wait_start
+
+        pooled: _PooledBrowser | None = None
+        context: BrowserContext | None = None
+        blocker: ResourceBlocker | None = None
+        try:
+            pooled = await self._acquire_browser()
+            try:
+                context = await pooled.browser.new_context(**options)
+            except Exception:
+                if not pooled.browser.is_connected():
+                    self._mark_crashed(pooled)
+                raise
+            self._active_contexts += 1
+            self._total_contexts += 1
+            self._peak_active = max(self._peak_active, self._active_contexts)
+            if block_resources:
+                blocker = ResourceBlocker()
+                await context.route("**/*", blocker.handle)
+            yield context
+        finally:
+            if blocker is not None:
+                self._blocked_requests += blocker.blocked_requests
+                self._allowed_requests += blocker.allowed_requests
+            if context is not None:
+                self._active_contexts -= 1
+                try:
+                    await context.close()
+                except Exception as e:
+                    logging.warning(f">>> ⚠️ [BrowserPool] Error cerrando contexto: {e}")
+            if pooled is not None:
+                await self._release_browser(pooled)
+            self._semaphore.release()
+
+    def metrics(self) -> BrowserPoolMetricsResponse:
+        """Returns a snapshot of the pool utilisation."""
+        current = self._browser
+        return BrowserPoolMetricsResponse(
+            started=self._playwright is not None,
+            browser_connected=current is not None and current.browser.is_connected(),
+            max_contexts=self.max_contexts,
+            max_browser_uses=self.max_browser_uses,
+            active_contexts=self._active_contexts,
+            waiting_requests=self._waiting,
+            peak_active_contexts=self._peak_active,
+            utilisation=round(self._active_contexts / self.max_contexts, 4),
+            current_browser_uses=current.uses if current else 0,
+            total_contexts=self._total_contexts,
+            browsers_launched=self._generation,
+            browsers_recycled=self._recycled,
+            browsers_crashed=self._crashed,
+            average_wait_time=round(self._total_wait_time / self._total_contexts, 4) if self._total_contexts else 0.0,
+            blocked_requests=self._blocked_requests,
+            allowed_requests=self._allowed_requests,
+        )
+
+    async def _acquire_browser(self) -> _PooledBrowser:
+        """Returns the current browser, launching a new one if it was retired or crashed, and counts one use."""
+        if self._playwright is None:
+            await self.start()
+        async with self._lock:
+            current = self._browser
+            if current is None or not current.usable:
+                if current is not None:
+                    if not current.browser.is_connected() and not current.crashed:
+                        self._mark_crashed(current)
+                    current.retired = True
+                    if current.active == 0:
+                        await self._close_browser(current)
+                current = await self._launch_browser()
+                self._browser = current
+            current.uses += 1
+            current.active += 1
+            if current.uses >= self.max_browser_uses:
+                # Los contextos activos terminan con este navegador; los siguientes usan uno nuevo
+                current.retired = True
+                self._recycled += 1
+                logging.info(f">>> ♻️ [BrowserPool] Navegador #{current.generation} alcanzó {current.uses} usos, se reciclará")
+            return current
+
+    async def _release_browser(self, pooled: _PooledBrowser) -> None:
+        """Counts one context less on the browser and closes it once it is retired and idle."""
+        async with self._lock:
+            pooled.active -= 1
+            if (pooled.retired or pooled.crashed) and pooled.active == 0:
+                await self._close_browser(pooled)
+                if self._browser is pooled:
+                    self._browser = None
+
+    async def _launch_browser(self) -> _PooledBrowser:
+        self._generation += 1
+        browser = await self._playwright.chromium.launch(headless=self.headless, args=BROWSER_LAUNCH_ARGS)
+        pooled = _PooledBrowser(browser, self._generation)
+        browser.on("disconnected", lambda _: self._mark_crashed(pooled))
+        logging.info(f">>> 🌐 [BrowserPool] Navegador #{pooled.generation} iniciado")
+        return pooled
+
+    def _mark_crashed(self, pooled: _PooledBrowser) -> None:
+        # Un cierre ordenado del pool también dispara "disconnected", solo cuenta si el navegador seguía en uso
+        if pooled.crashed or (pooled.retired and pooled.active == 0):
+            return
+        pooled.crashed = True
+        self._crashed += 1
+        logging.warning(f">>> 💥 [BrowserPool] Navegador #{pooled.generation} desconectado, se lanzará uno nuevo")
+
+    async def _close_browser(self, pooled: _PooledBrowser) -> None:
+        pooled.retired = True
+        if not pooled.browser.is_connected():
+            return
+        try:
+            await pooled.browser.close()
+            logging.info(f">>> 🔌 [BrowserPool] Navegador #{pooled.generation} cerrado tras {pooled.uses} usos")
+        except Exception as e:
+            logging.warning(f">>> ⚠️ [BrowserPool] Error cerrando navegador #{pooled.generation}: {e}")
+
+
+_browser_pool: BrowserPool | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Returns the shared browser pool, created on first use and started by the app lifespan."""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool()
+    return _browser_pool
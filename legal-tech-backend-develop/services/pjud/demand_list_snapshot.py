@@ -0,0 +1,73 @@
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from config import Config
+from database.ext_db import get_session
+from models.api import DemandListGetRequest, DemandListGetResponse
+from models.pydantic import DemandInformation
+from models.sql import PJUDDemandListSnapshot
+from services.pjud.pjud_controller import PJUDController
+
+
+class PJUDDemandListSnapshots:
+    """
+    Demand list of each PJUD account stored with the time it was scraped. Reads within `max_age` seconds are served
+    from the snapshot; older ones refresh it from PJUD reading only the demands added since the last scrape.
+    """
+
+    def __init__(self, max_age: int | None = None) -> None:
+        self.max_age = timedelta(seconds=Config.PJUD_DEMAND_LIST_MAX_AGE if max_age is None else max_age)
+        self.controller = PJUDController()
+
+    def get_snapshot(self, session: Session, rut: str) -> PJUDDemandListSnapshot | None:
+        return session.exec(select(PJUDDemandListSnapshot).where(PJUDDemandListSnapshot.rut == rut)).first()
+
+    async def get_demand_list(self, session: Session, request: DemandListGetRequest) -> DemandListGetResponse:
+        """Returns the demand list of the account, from its snapshot if fresh and the password matches."""
+        snapshot = self.get_snapshot(session, request.rut)
+        # El snapshot solo se entrega a quien conoce la contraseña con la que se scrapeó
+        known: list[DemandInformation] | None = None
+        if snapshot is not None and snapshot.verify_password(request.password):
+            known = [DemandInformation(**demand) for demand in snapshot.demands]
+            if not request.refresh and datetime.utcnow() - snapshot.fetched_at < self.max_age:
+                logging.info(f">>> 📸 Bandeja de demandas de {request.rut} servida desde snapshot ({snapshot.fetched_at})")
+                return DemandListGetResponse(message="Valid", status=200, data=known, fetched_at=snapshot.fetched_at, cached=True)
+
+        response = await self.controller.get_demand_list_from_pjud(request, known=known)
+        if response.status != 200:
+            return response
+
+        if snapshot is None:
+            snapshot = PJUDDemandListSnapshot(rut=request.rut, hashed_password="")
+        if known is None:
+            snapshot.set_password(request.password)
+        fetched_at = datetime.utcnow()
+        snapshot.demands = [demand.model_dump() for demand in response.data]
+        snapshot.fetched_at = fetched_at
+        session.add(snapshot)
+        try:
+            session.commit()
+        except IntegrityError:
+            # Otra petición guardó el primer snapshot de la cuenta al mismo tiempo
+            session.rollback()
+        response.fetched_at = fetched_at
+        return response
+
+
+def expire_demand_list_snapshot(rut: str) -> None:
+    """
+    Marks the stored demand list of an account as stale after a change made through this service, so the next read
+    refreshes it. The refresh falls back to a full read by itself when demands were removed.
+    """
+    session = next(get_session())
+    try:
+        snapshot = session.exec(select(PJUDDemandListSnapshot).where(PJUDDemandListSnapshot.rut == rut)).first()
+        if snapshot is not None:
+            snapshot.fetched_at = datetime.min
+            session.add(snapshot)
+            session.commit()
+    finally:
+        session.close()
@@ -0,0 +1,395 @@
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import UploadFile
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from starlette.datastructures import Headers
+
+from config import Config
+from database.ext_db import get_session
+from models.api import DemandSubmissionQueueMetricsResponse, DemandSubmissionResponse
+from models.pydantic import AnnexFile, PJUDDDO, PJUDLegalRepresentative
+from models.sql import PJUDDemandSubmission, PJUDDemandSubmissionStatus
+from services.extractor import AddressExtractor
+from services.pjud.demand_list_snapshot import expire_demand_list_snapshot
+from services.pjud.pjud_controller import PJUDController
+from services.tracker import CaseTracker
+from services.v2.document.demand_text import DemandTextGeneratorInput, DemandTextQueueItem, DemandTextSendResponse
+
+
+SPOOL_CHUNK_SIZE = 64 * 1024
+UNFINISHED_STATUSES = (PJUDDemandSubmissionStatus.QUEUED.value, PJUDDemandSubmissionStatus.RUNNING.value)
+
+
+def build_pjud_defendants(information: DemandTextGeneratorInput, address_extractor: AddressExtractor) -> list[PJUDDDO]:
+    """Builds the PJUD defendants of a demand text, extracting their addresses from the raw text."""
+    return [
+        PJUDDDO(
+            raw_address=defendant.address or "",
+            raw_name=defendant.name or "",
+            identifier=defendant.identifier or "",
+            legal_representatives=[
+                PJUDLegalRepresentative(raw_name=representative.name or "", identifier=representative.identifier or "")
+                for representative in defendant.legal_representatives or []
+            ],
+            addresses=[address_extractor.extract_from_text(defendant.address)] if defendant.address else [],
+        )
+        for defendant in information.defendants or []
+    ]
+
+
+def demand_idempotency_key(item: DemandTextQueueItem, demand_text_digest: str) -> str:
+    """
+    Key of a queued demand: the one given by the client, or a hash of who files it, its parties, subject, amount and
+    demand text. The PJUD ROL only exists once the demand is filed, so it cannot be part of the key.
+    """
+    if item.idempotency_key:
+        return item.idempotency_key
+    information = item.information
+    parts = [
+        item.rut,
+        information.plaintiff.identifier if information.plaintiff else "",
+        ",".join(sorted(defendant.identifier or "" for defendant in information.defendants or [])),
+        information.legal_subject.value if information.legal_subject else "",
+        str(information.amount or ""),
+        demand_text_digest,
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+class _SpooledUpload:
+    """Uploaded PDF copied to disk, so it outlives the request that enqueued it."""
+
+    def __init__(self, path: str, filename: str, content_type: str, digest: str) -> None:
+        self.path = path
+        self.filename = filename
+        self.content_type = content_type
+        self.digest = digest
+
+    def open(self) -> UploadFile:
+        return UploadFile(open(self.path, "rb"), filename=self.filename, headers=Headers({"content-type": self.content_type}))
+
+
+class _QueuedDemand:
+    def __init__(self, submission_id: UUID, item: DemandTextQueueItem, spool_dir: str, files: dict[str, _SpooledUpload]) -> None:
+        self.submission_id = submission_id
+        self.item = item
+        self.spool_dir = spool_dir
+        self.files = files
+
+
+class PJUDDemandSubmissionQueue:
+    """
+    Files queued demand texts in PJUD through `workers` concurrent browser contexts.
+
+    Submissions are persisted with their status, and a demand whose idempotency key was already queued or filed is
+    not filed again; only failed submissions can be enqueued again. The uploaded PDFs are spooled to disk until their
+    submission finishes. The queue lives in this process: submissions still pending when it stops are marked failed.
+    """
+
+    def __init__(self, workers: int | None = None, max_attempts: int | None = None) -> None:
+        self.workers = workers or Config.PJUD_SUBMISSION_WORKERS
+        self.max_attempts = max_attempts or Config.PJUD_SUBMISSION_MAX_ATTEMPTS
+        self.controller = PJUDController()
+        self._queue: asyncio.Queue[_QueuedDemand] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._pending: set[UUID] = set()
+        self._in_flight = 0
+        self._enqueued = 0
+        self._duplicates = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._total_duration = 0.0
+        self._first_started: float | None = None
+
+    async def enqueue(self, session: Session, item: DemandTextQueueItem, uploads: dict[str, UploadFile]) -> DemandSubmissionResponse:
+        """
+        Queues a demand text, or returns the existing submission with the same idempotency key.
+
+        Args:
+            session: Database session
+            item: Demand text to file
+            uploads: Uploaded PDF files by filename, must include every file referenced by `item`
+        """
+        spool_dir = tempfile.mkdtemp(prefix="pjud_demand_")
+        try:
+            files = {filename: await self._spool(spool_dir, uploads[filename]) for filename in item.referenced_files()}
+            key = demand_idempotency_key(item, files[item.demand_text_file].digest)
+
+            submission, created = self._claim_submission(session, item, key)
+            if not created:
+                self._duplicates += 1
+                shutil.rmtree(spool_dir, ignore_errors=True)
+                logging.info(f">>> 🔁 [Demandas] Envío {submission.id} ya registrado ({submission.status}), no se encola de nuevo")
+                return self._to_response(submission, duplicate=True)
+        except Exception:
+            shutil.rmtree(spool_dir, ignore_errors=True)
+            raise
+
+        self._start_workers()
+        self._enqueued += 1
+        self._pending.add(submission.id)
+        await self._queue.put(_QueuedDemand(submission.id, item, spool_dir, files))
+        logging.info(f">>> 📨 [Demandas] Envío {submission.id} encolado (pendientes: {self._queue.qsize()})")
+        return self._to_response(submission)
+
+    def get_submission(self, session: Session, submission_id: UUID) -> DemandSubmissionResponse | None:
+        submission = session.get(PJUDDemandSubmission, submission_id)
+        return self._to_response(submission) if submission else None
+
+    def metrics(self) -> DemandSubmissionQueueMetricsResponse:
+        finished = self._succeeded + self._failed
+        elapsed = time.monotonic() - self._first_started if self._first_started is not None else 0.0
+        return DemandSubmissionQueueMetricsResponse(
+            workers=self.workers,
+            queued=self._queue.qsize(),
+            in_flight=self._in_flight,
+            enqueued=self._enqueued,
+            duplicates=self._duplicates,
+            succeeded=self._succeeded,
+            failed=self._failed,
+            average_duration=round(self._total_duration / finished, 2) if finished else 0.0,
+            submissions_per_minute=round(finished / elapsed * 60, 2) if elapsed > 0 else None,
+        )
+
+    async def stop(self) -> None:
+        """Stops the workers and marks the submissions of this queue that did not finish as failed."""
+        # Los workers cancelados descartan su envío en curso de _pending, se copia antes de cancelarlos
+        pending = set(self._pending)
+        self._pending.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while not self._queue.empty():
+            queued = self._queue.get_nowait()
+            shutil.rmtree(queued.spool_dir, ignore_errors=True)
+        if not pending:
+            return
+
+        session = next(get_session())
+        try:
+            unfinished = session.exec(
+                select(PJUDDemandSubmission)
+                .where(PJUDDemandSubmission.id.in_(pending))
+                .where(PJUDDemandSubmission.status.in_(UNFINISHED_STATUSES))
+            ).all()
+            for submission in unfinished:
+                submission.status = PJUDDemandSubmissionStatus.FAILED.value
+                submission.message = "Envío interrumpido por detención del servicio"
+                submission.finished_at = datetime.utcnow()
+                session.add(submission)
+            session.commit()
+        finally:
+            session.close()
+
+    def _claim_submission(self, session: Session, item: DemandTextQueueItem, key: str) -> tuple[PJUDDemandSubmission, bool]:
+        """Returns the submission of `key` and whether it must be queued: new, or a failed one filed again."""
+        submission = session.exec(select(PJUDDemandSubmission).where(PJUDDemandSubmission.idempotency_key == key)).first()
+        if submission is not None and submission.status != PJUDDemandSubmissionStatus.FAILED.value:
+            return submission, False
+
+        information = item.information
+        if submission is None:
+            defendants = ", ".join(defendant.name or "" for defendant in information.defendants or [])
+            submission = PJUDDemandSubmission(
+                idempotency_key=key,
+                rut=item.rut,
+                plaintiff_identifier=information.plaintiff.identifier if information.plaintiff else None,
+                title=f"{information.plaintiff.name if information.plaintiff else ''}/{defendants}"[:255],
+            )
+        submission.status = PJUDDemandSubmissionStatus.QUEUED.value
+        submission.message = None
+        submission.finished_at = None
+        session.add(submission)
+        try:
+            session.commit()
+        except IntegrityError:
+            # Otra petición encoló la misma demanda entre la consulta y el commit
+            session.rollback()
+            return session.exec(select(PJUDDemandSubmission).where(PJUDDemandSubmission.idempotency_key == key)).one(), False
+        session.refresh(submission)
+        return submission, True
+
+    async def _spool(self, spool_dir: str, upload: UploadFile) -> _SpooledUpload:
+        digest = hashlib.sha256()
+        file_descriptor, path = tempfile.mkstemp(dir=spool_dir, suffix=".pdf")
+        with os.fdopen(file_descriptor, "wb") as file:
+            await upload.seek(0)
+            while chunk := await upload.read(SPOOL_CHUNK_SIZE):
+                digest.update(chunk)
+                file.write(chunk)
+        return _SpooledUpload(path, upload.filename, upload.content_type, digest.hexdigest())
+
+    def _start_workers(self) -> None:
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker(len(self._tasks) + 1)))
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            queued = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._submit(number, queued)
+            except Exception as e:
+                logging.error(f">>> ❌ [Demandas] Worker {number}: error inesperado en envío {queued.submission_id}: {e}")
+            finally:
+                self._in_flight -= 1
+                self._pending.discard(queued.submission_id)
+                shutil.rmtree(queued.spool_dir, ignore_errors=True)
+                self._queue.task_done()
+
+    async def _submit(self, number: int, queued: _QueuedDemand) -> None:
+        """Files one demand text, retrying the PJUD automation on errors, and creates its case."""
+        if self._first_started is None:
+            self._first_started = time.monotonic()
+        item = queued.item
+        submission = self._update_submission(
+            queued.submission_id,
+            status=PJUDDemandSubmissionStatus.RUNNING.value,
+            started_at=datetime.utcnow(),
+        )
+        attempts = submission.attempts
+        logging.info(f">>> 🚀 [Demandas] Worker {number}: enviando {queued.submission_id}")
+
+        start_time = time.time()
+        response: DemandTextSendResponse | None = None
+        message: str | None = None
+        annexes: list[AnnexFile] = []
+        try:
+            defendants = await asyncio.to_thread(build_pjud_defendants, item.information, AddressExtractor())
+        except Exception as e:
+            message = f"Invalid or incomplete defendant address: {e}"
+        else:
+            try:
+                annexes = self._open_annexes(queued)
+            except OSError as e:
+                message = f"Could not open the spooled annex files: {e}"
+            else:
+                response, message, tried = await self._send(number, queued, defendants, annexes)
+                attempts += tried
+
+        case_id = None
+        succeeded = response is not None and response.status == 200
+        if succeeded:
+            case_id = self._create_case(item, annexes)
+            if not item.debug:
+                expire_demand_list_snapshot(item.rut)
+        for annex in annexes:
+            annex.upload_file.file.close()
+
+        duration = round(time.time() - start_time, 2)
+        self._update_submission(
+            queued.submission_id,
+            status=(PJUDDemandSubmissionStatus.SUCCEEDED if succeeded else PJUDDemandSubmissionStatus.FAILED).value,
+            attempts=attempts,
+            response_status=response.status if response else 500,
+            message=response.message if response else message,
+            case_id=case_id,
+            finished_at=datetime.utcnow(),
+            duration=duration,
+        )
+        self._total_duration += duration
+        if succeeded:
+            self._succeeded += 1
+            logging.info(f">>> ✅ [Demandas] Worker {number}: envío {queued.submission_id} completado en {duration:.2f}s")
+        else:
+            self._failed += 1
+            logging.error(f">>> ❌ [Demandas] Worker {number}: envío {queued.submission_id} fallido: {response.message if response else message}")
+
+    async def _send(self, number: int, queued: _QueuedDemand, defendants: list[PJUDDDO], annexes: list[AnnexFile]) -> tuple[DemandTextSendResponse | None, str | None, int]:
+        """
+        Runs the PJUD automation up to `max_attempts` times.
+
+        Returns:
+            tuple[DemandTextSendResponse | None, str | None, int]: The response (None if every attempt failed), the
+                error of the last failed attempt, and the number of attempts made
+        """
+        item = queued.item
+        message = None
+        for attempt in range(1, self.max_attempts + 1):
+            demand_text = queued.files[item.demand_text_file].open()
+            try:
+                # El envío lee cada anexo hasta el final, se rebobinan para que un reintento no suba archivos vacíos
+                for annex in annexes:
+                    await annex.upload_file.seek(0)
+                if item.debug:
+                    return DemandTextSendResponse(message="Valid", status=200), None, attempt
+                return await self.controller.send_demand_to_pjud(item, demand_text, defendants, annexes), None, attempt
+            except Exception as e:
+                message = f"Internal error: {e}"
+                logging.warning(f">>> ⚠️ [Demandas] Worker {number}: intento {attempt}/{self.max_attempts} fallido para {queued.submission_id}: {e}")
+            finally:
+                demand_text.file.close()
+        return None, message, self.max_attempts
+
+    def _open_annexes(self, queued: _QueuedDemand) -> list[AnnexFile]:
+        item = queued.item
+        labelled_files = [("Contrato", item.contract_file), ("Mandato", item.mandate_file)]
+        labelled_files.extend((annex.label, annex.file) for annex in item.annexes)
+        return [
+            AnnexFile(label=label, upload_file=queued.files[filename].open())
+            for label, filename in labelled_files
+            if filename
+        ]
+
+    def _create_case(self, item: DemandTextQueueItem, annexes: list[AnnexFile]) -> UUID | None:
+        session = next(get_session())
+        try:
+            created_case = CaseTracker().create_case_from_demand_text(session, item.information, item.structure, annexes, item.debug)
+            return created_case.id if created_case else None
+        except Exception as e:
+            logging.warning(f"Could not create case from demand text: {e}")
+            return None
+        finally:
+            session.close()
+
+    def _update_submission(self, submission_id: UUID, **fields) -> PJUDDemandSubmission:
+        session = next(get_session())
+        try:
+            submission = session.get(PJUDDemandSubmission, submission_id)
+            for field, value in fields.items():
+                setattr(submission, field, value)
+            session.add(submission)
+            session.commit()
+            session.refresh(submission)
+            return submission
+        finally:
+            session.close()
+
+    def _to_response(self, submission: PJUDDemandSubmission, duplicate: bool = False) -> DemandSubmissionResponse:
+        return DemandSubmissionResponse(
+            id=submission.id,
+            idempotency_key=submission.idempotency_key,
+            title=submission.title,
+            status=submission.status,
+            attempts=submission.attempts,
+            response_status=submission.response_status,
+            message=submission.message,
+            case_id=submission.case_id,
+            created_at=submission.created_at,
+            started_at=submission.started_at,
+            finished_at=submission.finished_at,
+            duration=submission.duration,
+            duplicate=duplicate,
+        )
+
+
+_submission_queue: PJUDDemandSubmissionQueue | None = None
+
+
+def get_demand_submission_queue() -> PJUDDemandSubmissionQueue:
+    """Returns the demand submission queue shared by every request."""
+    global _submission_queue
+    if _submission_queue is None:
+        _submission_queue = PJUDDemandSubmissionQueue()
+    return _submission_queue
@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+
+import aiohttp
+from yarl import URL
+
+from config import Config
+
+
+PJUD_BASE_URL = "https://oficinajudicialvirtual.pjud.cl"
+PDF_SIGNATURE = b"%PDF"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+DOWNLOAD_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0',
+}
+
+
+class PJUDDownloadManager:
+    """
+    Downloads PJUD documents for one scraping session.
+
+    A single aiohttp session (connection pool and cookie jar) is shared by every download, the number of
+    simultaneous downloads is bounded, and each file is streamed into its own file of a spool directory. The spool
+    directory is removed when the manager is closed.
+    """
+
+    def __init__(self, max_concurrency: int | None = None) -> None:
+        self.max_concurrency = max_concurrency or Config.PJUD_DOWNLOAD_CONCURRENCY
+        self.spool_dir: str | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def __aenter__(self) -> "PJUDDownloadManager":
+        self.spool_dir = tempfile.mkdtemp(prefix="pjud_spool_")
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            cookie_jar=aiohttp.CookieJar(),
+            headers=DOWNLOAD_HEADERS,
+            timeout=DOWNLOAD_TIMEOUT,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the HTTP session and removes the spool directory with any file still in it."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self.spool_dir is not None:
+            shutil.rmtree(self.spool_dir, ignore_errors=True)
+            logging.info(f">>> 🗑️ Directorio de descargas eliminado: {self.spool_dir}")
+            self.spool_dir = None
+
+    def load_cookies(self, cookies: list[dict]) -> None:
+        """Copies the browser context cookies into the shared cookie jar."""
+        for cookie in cookies:
+            domain = cookie.get("domain", "").lstrip(".")
+            if not domain:
+                continue
+            self._session.cookie_jar.update_cookies(
+                {cookie["name"]: cookie["value"]},
+                URL(f"https://{domain}{cookie.get('path') or '/'}"),
+            )
+        logging.info(f">>> 🍪 Cookies cargadas en el gestor de descargas: {len(cookies)}")
+
+    async def download_pdf(self, form_action: str, dta_doc_value: str) -> str | None:
+        """
+        Downloads the PDF served by a PJUD document form.
+
+        Returns:
+            str | None: Path of the spooled PDF, or None if the response is not a PDF
+        """
+        # Si el action no comienza con /, agregarlo
+        if not form_action.startswith('/'):
+            form_action = '/' + form_action
+        url = f"{PJUD_BASE_URL}{form_action}?dtaDoc={dta_doc_value}"
+        logging.info(f">>> 🔗 URL construida: {url}")
+
+        async with self._semaphore:
+            async with self._session.get(url, allow_redirects=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '').lower()
+                logging.info(f">>> 📋 Content-Type: {content_type}")
+                if 'application/pdf' not in content_type:
+                    logging.error(f">>> ❌ El contenido no es un PDF. Content-Type: {content_type}")
+                    return None
+                return await self._spool(response)
+
+    async def _spool(self, response: aiohttp.ClientResponse) -> str | None:
+        """
+        Streams the response body to its own file in the spool directory. Every download gets a distinct file, so
+        the caller may delete it once processed without affecting other downloads of the same document.
+        """
+        digest = hashlib.sha256()
+        file_descriptor, pdf_path = tempfile.mkstemp(dir=self.spool_dir, suffix=".pdf")
+        completed = False
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                first_chunk = True
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    if first_chunk:
+                        if not chunk.startswith(PDF_SIGNATURE):
+                            logging.error(">>> ❌ El archivo descargado no es un PDF válido (firma no encontrada)")
+                            return None
+                        first_chunk = False
+                    digest.update(chunk)
+                    file.write(chunk)
+                if first_chunk:
+                    logging.error(">>> ❌ El archivo descargado está vacío")
+                    return None
+
+            completed = True
+            logging.info(f">>> ✅ PDF descargado: {pdf_path} ({os.path.getsize(pdf_path)} bytes, sha256 {digest.hexdigest()})")
+            return pdf_path
+        finally:
+            if not completed and os.path.exists(pdf_path):
+                os.remove(pdf_path)
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from config import Config
+from models.pydantic import CaseNotebookRequest, CaseNotebookResponse
+
+
+SnapshotKey = tuple[str, str, int, str, bool, bool]
+
+
+class CaseNotebookSnapshot:
+    """Scraped case notebook kept in memory to paginate it without scraping PJUD again."""
+
+    def __init__(self, response: CaseNotebookResponse, ttl: float) -> None:
+        self.response = response
+        self.scraped_at = datetime.utcnow()
+        self.created = time.monotonic()
+        self.expires_at = self.created + ttl
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+def notebook_snapshot_key(case_id: str, request: CaseNotebookRequest) -> SnapshotKey:
+    """
+    Builds the snapshot key of a case notebook: (case, rol, year, tribunal, save_to_db, debug). The side effects of the
+    scrape are part of the key, so a request that persists the notebook is never served from a read-only scrape.
+    """
+    return str(case_id), request.case_number, request.year, str(request.tribunal_id), request.save_to_db, request.debug
+
+
+class CaseNotebookSnapshotCache:
+    """
+    TTL'd snapshots of successfully scraped case notebooks, with at most `max_entries` kept (least recently used
+    first out). Concurrent requests for the same notebook wait for a single scrape instead of starting one each.
+    """
+
+    def __init__(self, ttl: float | None = None, max_entries: int | None = None) -> None:
+        self.ttl = Config.PJUD_NOTEBOOK_SNAPSHOT_TTL if ttl is None else ttl
+        self.max_entries = max_entries or Config.PJUD_NOTEBOOK_SNAPSHOT_MAX_ENTRIES
+        self._snapshots: OrderedDict[SnapshotKey, CaseNotebookSnapshot] = OrderedDict()
+        self._locks: dict[SnapshotKey, asyncio.Lock] = {}
+
+    def get(self, key: SnapshotKey) -> CaseNotebookSnapshot | None:
+        """Returns the snapshot of `key` if it has not expired."""
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return None
+        if not snapshot.fresh:
+            del self._snapshots[key]
+            return None
+        self._snapshots.move_to_end(key)
+        return snapshot
+
+    def store(self, key: SnapshotKey, response: CaseNotebookResponse) -> CaseNotebookSnapshot | None:
+        """Keeps `response` as the snapshot of `key`. Failed scrapes are not stored."""
+        if response.status != 200:
+            return None
+        snapshot = CaseNotebookSnapshot(response, self.ttl)
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+        while len(self._snapshots) > self.max_entries:
+            evicted_key, _ = self._snapshots.popitem(last=False)
+            lock = self._locks.get(evicted_key)
+            if lock is not None and not lock.locked():
+                del self._locks[evicted_key]
+        return snapshot
+
+    def invalidate(self, key: SnapshotKey) -> None:
+        self._snapshots.pop(key, None)
+
+    async def get_or_scrape(
+            self,
+            key: SnapshotKey,
+            scrape: Callable[[], Awaitable[CaseNotebookResponse]],
+            refresh: bool = False,
+        ) -> tuple[CaseNotebookResponse, CaseNotebookSnapshot | None]:
+        """
+        Returns the fresh snapshot of `key`, or scrapes the notebook and stores it.
+
+        Args:
+            key: Snapshot key, see `notebook_snapshot_key`
+            scrape: Coroutine function performing the full scrape
+            refresh: Scrape again even if a fresh snapshot exists
+
+        Returns:
+            tuple[CaseNotebookResponse, CaseNotebookSnapshot | None]: The notebook, and the snapshot it was served from
+                or stored in (None if the scrape failed)
+        """
+        requested_at = time.monotonic()
+        if not refresh:
+            snapshot = self.get(key)
+            if snapshot:
+                logging.info(f">>> 📸 Snapshot de cuaderno {key} servido desde caché (scrapeado {snapshot.scraped_at})")
+                return snapshot.response, snapshot
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Otra petición pudo haber scrapeado el cuaderno mientras se esperaba el lock
+            snapshot = self.get(key)
+            if snapshot and (not refresh or snapshot.created >= requested_at):
+                return snapshot.response, snapshot
+            response = await scrape()
+            return response, self.store(key, response)
+
+
+_snapshot_cache: CaseNotebookSnapshotCache | None = None
+
+
+def get_notebook_snapshot_cache() -> CaseNotebookSnapshotCache:
+    """Returns the case notebook snapshot cache shared by every request."""
+    global _snapshot_cache
+    if _snapshot_cache is None:
+        _snapshot_cache = CaseNotebookSnapshotCache()
+    return _snapshot_cache
@@ -0,0 +1,152 @@
+import re
+from html.parser import HTMLParser
+
+from pydantic import BaseModel
+
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+IGNORED_TEXT_TAGS = {"script", "style"}
+# Etiquetas que inner_text() convierte en salto de línea dentro de una celda
+LINE_BREAK_TAGS = {"br", "div", "p", "li"}
+
+
+class NotebookDocForm(BaseModel):
+    """Download form of a notebook row, enough to build the document URL without touching the page."""
+    action: str
+    dta_doc: str
+
+
+class NotebookTable(BaseModel):
+    """Case notebook table parsed from a single HTML snapshot of the modal."""
+    headers: list[str]
+    rows: list[list[str]]
+    doc_forms: list[NotebookDocForm | None]
+    reached_known_folio: bool = False
+
+
+class _KnownFolioReached(Exception):
+    """Stops the parser once the newest-first notebook reaches an already stored folio."""
+
+
+class _NotebookTableParser(HTMLParser):
+    """Collects header and cell text of the outermost table, plus the forms found in the document column."""
+
+    def __init__(self, doc_column: int, folio_column: int = 0, stop_at_folio: int | None = None) -> None:
+        super().__init__(convert_charrefs=True)
+        self.doc_column = doc_column
+        self.folio_column = folio_column
+        self.stop_at_folio = stop_at_folio
+        self.headers: list[str] = []
+        self.rows: list[list[str]] = []
+        self.doc_forms: list[NotebookDocForm | None] = []
+        self._table_depth = 0
+        self._ignored_depth = 0
+        self._section: str | None = None
+        self._row: list[str] | None = None
+        self._row_form: NotebookDocForm | None = None
+        self._cell: list[str] | None = None
+        self._cell_tag: str | None = None
+        self._form_action: str | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in IGNORED_TEXT_TAGS:
+            self._ignored_depth += 1
+            return
+        if tag == "table":
+            self._table_depth += 1
+            return
+        if self._table_depth != 1:
+            # Tablas anidadas dentro de una celda se tratan como texto de la celda
+            if tag in LINE_BREAK_TAGS and self._cell is not None:
+                self._cell.append("\n")
+            return
+        if tag in ("thead", "tbody"):
+            self._section = tag
+        elif tag == "tr":
+            self._row = []
+            self._row_form = None
+        elif tag in ("td", "th"):
+            self._cell = []
+            self._cell_tag = tag
+        elif tag in LINE_BREAK_TAGS and self._cell is not None:
+            self._cell.append("\n")
+        elif tag == "form" and self._in_doc_cell():
+            self._form_action = dict(attrs).get("action") or None
+        elif tag == "input" and self._in_doc_cell() and self._row_form is None:
+            attributes = dict(attrs)
+            if attributes.get("name") == "dtaDoc" and attributes.get("value") and self._form_action:
+                self._row_form = NotebookDocForm(action=self._form_action, dta_doc=attributes["value"])
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in ("br", "input"):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in IGNORED_TEXT_TAGS:
+            self._ignored_depth = max(0, self._ignored_depth - 1)
+            return
+        if tag == "table":
+            self._table_depth -= 1
+            return
+        if self._table_depth != 1:
+            return
+        if tag in ("td", "th") and self._cell is not None:
+            lines = (line.strip() for line in "".join(self._cell).split("\n"))
+            text = "\n".join(line for line in lines if line)
+            # Igual que la tabla en pantalla: encabezados desde "thead th" y datos desde "tbody td"
+            if self._section == "thead" and self._cell_tag == "th":
+                self.headers.append(text)
+            elif self._section == "tbody" and self._cell_tag == "td" and self._row is not None:
+                self._row.append(text)
+            self._cell = None
+            self._cell_tag = None
+        elif tag == "form":
+            self._form_action = None
+        elif tag == "tr" and self._row is not None:
+            if self._section == "tbody":
+                if self._is_known_folio(self._row):
+                    raise _KnownFolioReached()
+                self.rows.append(self._row)
+                self.doc_forms.append(self._row_form)
+            self._row = None
+        elif tag in ("thead", "tbody"):
+            self._section = None
+
+    def handle_data(self, data: str) -> None:
+        if self._cell is not None and not self._ignored_depth:
+            # Los saltos de línea del HTML fuente se renderizan como espacios
+            self._cell.append(WHITESPACE_PATTERN.sub(" ", data))
+
+    def _is_known_folio(self, row: list[str]) -> bool:
+        if self.stop_at_folio is None or len(row) <= self.folio_column:
+            return False
+        folio = row[self.folio_column]
+        return folio.isdigit() and int(folio) <= self.stop_at_folio
+
+    def _in_doc_cell(self) -> bool:
+        return self._cell_tag == "td" and self._row is not None and self._section == "tbody" and len(self._row) == self.doc_column
+
+
+def parse_notebook_table(html: str, doc_column: int, folio_column: int = 0, stop_at_folio: int | None = None) -> NotebookTable:
+    """
+    Parses the case notebook table from its outer HTML.
+
+    Args:
+        html: `outerHTML` of the notebook table, fetched from the page in a single round trip
+        doc_column: Index of the column holding the document download form
+        folio_column: Index of the column holding the folio number
+        stop_at_folio: Highest folio already stored. The notebook lists the newest folios first, so parsing stops at
+            the first row with this folio or a lower one
+
+    Returns:
+        NotebookTable: Headers, cell text per body row and the `dtaDoc` download form of each row, if any
+    """
+    parser = _NotebookTableParser(doc_column, folio_column, stop_at_folio)
+    reached_known_folio = False
+    try:
+        parser.feed(html)
+        parser.close()
+    except _KnownFolioReached:
+        reached_known_folio = True
+    return NotebookTable(headers=parser.headers, rows=parser.rows, doc_forms=parser.doc_forms, reached_known_folio=reached_known_folio)
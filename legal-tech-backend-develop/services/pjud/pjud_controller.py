@@ -3,7 +3,7 @@ import re
 from datetime import datetime, timedelta
 
 from fastapi import UploadFile
-from playwright.async_api import async_playwright, Locator, Page, Request, Response, TimeoutError
+from playwright.async_api import BrowserContext, Locator, Page, Request, Response, TimeoutError
 
 from models.api import (
     DemandDeleteRequest,
@@ -31,10 +31,42 @@ from models.sql import (
     CaseEventSuggestion,
     CourtCase,
 )
+from services.pjud.browser_pool import PJUD_CONTEXT_OPTIONS, get_browser_pool
+from services.pjud.session_vault import get_session_vault, session_key
+from services.pjud.step_profile import StepProfile
 from services.v2.document.demand_text import DemandTextSenderInput, DemandTextSendResponse
 
 
 DEFAULT_WAIT_FOR_TIMEOUT = 3000
+NETWORK_IDLE_TIMEOUT = 10000
+ADDRESS_CARD_SELECTOR = "#listaTemporalDirecciones .pg_card_tr"
+TYPE_OF_PERSON_PLACEHOLDER = "Seleccione Tipo Persona"
+DEMAND_CARD_SELECTOR = "div.card.pg_card_tr"
+# Lee los campos de cada tarjeta de la bandeja y se detiene en la primera que coincide con `stop`
+READ_DEMAND_CARDS_SCRIPT = """
+(cards, stop) => {
+    const fields = {
+        title: "cuaderno().parte",
+        creation_date: "fechaCortaIngresoComp",
+        court: "tribunal().nombre",
+        legal_subject: "materias()",
+        author: "responsable().nombres",
+    };
+    const read = [];
+    for (const card of cards) {
+        const values = {};
+        for (const [name, binding] of Object.entries(fields)) {
+            const element = card.querySelector(`.card-text[data-bind*='${binding}']`);
+            values[name] = element ? element.textContent : "";
+        }
+        if (stop && Object.keys(fields).every(name => values[name].trim() === stop[name].trim())) {
+            break;
+        }
+        read.push(values);
+    }
+    return {cards: read, total: cards.length};
+}
+"""
 
 
 class PJUDController:
@@ -47,7 +79,7 @@ class PJUDController:
             logging.info(f"PJUD Response: {response.status} {response.url}")
 
     async def delete_existing_addresses(self, page: Page) -> None:
-        address_cards = page.locator("#listaTemporalDirecciones .pg_card_tr")
+        address_cards = page.locator(ADDRESS_CARD_SELECTOR)
         max_iterations = 10
         iteration = 0
         
@@ -64,7 +96,12 @@ class PJUDController:
                 delete_button = page.locator("button:has-text('Borrar Direccion')")
                 await delete_button.wait_for(state="visible", timeout=5000)
                 await delete_button.click()
-                await page.wait_for_timeout(1000)
+                # Esperar a que la tarjeta borrada desaparezca de la lista
+                await page.wait_for_function(
+                    "([selector, count]) => document.querySelectorAll(selector).length < count",
+                    arg=[ADDRESS_CARD_SELECTOR, card_count],
+                    timeout=5000,
+                )
             except TimeoutError:
                 logging.warning("Could not find address card to delete, assuming deletion complete.")
                 break
@@ -100,13 +137,28 @@ class PJUDController:
             logging.warning(f"{final_count} legal representatives remain; deletion may have encountered issues.")
 
     async def get_type_of_person(self, page: Page) -> str:
-        retries = 5
-        for _ in range(retries):
-            type_of_person = await page.locator("text='Tipo Persona:'").locator("..").locator("a.select2-choice span.select2-chosen").text_content()
-            if type_of_person != "Seleccione Tipo Persona":
-                return type_of_person
-            await page.wait_for_timeout(300)
-        return ""
+        chosen = page.locator("text='Tipo Persona:'").locator("..").locator("a.select2-choice span.select2-chosen")
+        # PJUD completa el tipo de persona al validar el RUT
+        try:
+            await page.wait_for_function(
+                "([el, placeholder]) => el.textContent.trim() !== placeholder",
+                arg=[await chosen.element_handle(timeout=DEFAULT_WAIT_FOR_TIMEOUT), TYPE_OF_PERSON_PLACEHOLDER],
+                timeout=1500,
+            )
+        except TimeoutError:
+            return ""
+        return (await chosen.text_content()).strip()
+
+    async def choose_select2_option(self, page: Page, choice: Locator, text: str, timeout: int = DEFAULT_WAIT_FOR_TIMEOUT) -> None:
+        """Searches `text` in a select2 widget and waits until it is shown as the chosen option."""
+        await choice.click()
+        search_box = page.locator("input.select2-input:visible")
+        await search_box.click(force=True)
+        await search_box.fill(text, force=True)
+        # Enter solo selecciona una vez que el filtro devolvió resultados y resaltó el primero
+        await page.locator("div.select2-drop-active li.select2-highlighted").first.wait_for(state="visible", timeout=timeout)
+        await search_box.press("Enter")
+        await page.locator("a.select2-choice", has_text=text).first.wait_for(state="visible", timeout=timeout)
 
     async def add_address(self, page: Page, address: PJUDAddress) -> DemandTextSendResponse | None:
         await page.locator("text='Tipo de Direccion'").locator("..").locator("a.select2-choice").click()
@@ -324,12 +376,44 @@ class PJUDController:
 
         return None
 
-    async def connect_to_pjud(self, page: Page, password: str, rut: str) -> str | None:
+    def attach_page_logging(self, page: Page) -> None:
         page.on("console", lambda msg: logging.info(f"PJUD console: {msg.text}"))
         #page.on("request", self.log_requests)
         #page.on("requestfailed", lambda request: logging.info(f"Request failed: {request.url} {request.failure}"))
         page.on("response", self.log_responses)
 
+    async def open_pjud_session(self, context: BrowserContext, page: Page, password: str, rut: str) -> str | None:
+        """
+        Leaves `page` logged in to PJUD, reusing the session stored in the vault for the credential while PJUD still
+        accepts it. `context` must be created with `get_session_vault().context_options(session_key(rut, password))`.
+
+        Returns:
+            str | None: Error message if the login failed
+        """
+        vault = get_session_vault()
+        key = session_key(rut, password)
+        self.attach_page_logging(page)
+        if await vault.restore(key, page):
+            return None
+
+        async with vault.lock(key):
+            # Otra operación del mismo usuario pudo iniciar sesión mientras se esperaba el lock
+            session = vault.get(key)
+            if session is not None:
+                await context.add_cookies(session.storage_state.get("cookies", []))
+                if await vault.restore(key, page):
+                    return None
+
+            await context.clear_cookies()
+            response = await self.connect_to_pjud(page, password, rut)
+            if response:
+                vault.invalidate(key)
+                return response
+            await vault.store(key, context, page)
+            logging.info(">>> 🔑 Sesión PJUD guardada para reutilizarla")
+            return None
+
+    async def connect_to_pjud(self, page: Page, password: str, rut: str) -> str | None:
         await page.goto(
             "https://ojv.pjud.cl/kpitec-ojv-web/views/login.html#segunda",
             wait_until="domcontentloaded"
@@ -386,66 +470,90 @@ class PJUDController:
         await date_input.fill(start_date)
 
         await page.locator("input.btn.btn-primary.btn-block[value='Consultar Demandas']").click()
-        await page.wait_for_timeout(3000)  # Espera fija de 3 segundos para estabilización
-
-    async def extract_demand_information(self, card_locator: Locator, index: int) -> DemandInformation | None:
+        # La bandeja se carga por AJAX: esperar a que terminen las peticiones en vez de una pausa fija
         try:
-            raw_date = await card_locator.locator(".card-text[data-bind*='fechaCortaIngresoComp']").text_content()
-            creation_date_iso = datetime.strptime(raw_date, "%d/%m/%y").isoformat()
+            await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT)
+        except TimeoutError:
+            logging.warning("Demand list did not reach network idle, reading the cards loaded so far.")
 
-            demand_information = DemandInformation(
-                title=await card_locator.locator(".card-text[data-bind*='cuaderno().parte']").text_content(),
+    def parse_demand_card(self, card: dict, index: int) -> DemandInformation | None:
+        try:
+            creation_date_iso = datetime.strptime(card["creation_date"], "%d/%m/%y").isoformat()
+            return DemandInformation(
+                title=card["title"].strip(),
                 creation_date=creation_date_iso,
-                court=await card_locator.locator(".card-text[data-bind*='tribunal().nombre']").text_content(),
-                legal_subject=await card_locator.locator(".card-text[data-bind*='materias()']").text_content(),
-                author=await card_locator.locator(".card-text[data-bind*='responsable().nombres']").text_content(),
+                court=card["court"],
+                legal_subject=card["legal_subject"],
+                author=card["author"],
                 index=index,
             )
-            demand_information.title = demand_information.title.strip()
-            return demand_information
         except Exception as e:
             logging.warning(f"Error extracting information from a demand card: {e}")
             return None
 
-    async def get_demand_list_from_pjud(self, request: DemandListGetRequest) -> DemandListGetResponse:
-        demand_list: list[DemandInformation] = []
-
+    async def read_demand_cards(self, page: Page, stop_at: DemandInformation | None = None) -> tuple[list[dict], int]:
+        """
+        Reads the demand cards of the list in a single round trip, from the top down to the first card matching
+        `stop_at`, if given.
+
+        Returns:
+            tuple[list[dict], int]: Card fields read, and total number of cards in the list
+        """
+        stop_card = None
+        if stop_at is not None:
+            stop_card = {
+                "title": stop_at.title,
+                "creation_date": datetime.fromisoformat(stop_at.creation_date).strftime("%d/%m/%y"),
+                "court": stop_at.court,
+                "legal_subject": stop_at.legal_subject,
+                "author": stop_at.author,
+            }
+        result = await page.locator(DEMAND_CARD_SELECTOR).evaluate_all(READ_DEMAND_CARDS_SCRIPT, stop_card)
+        return result["cards"], result["total"]
+
+    async def get_demand_list_from_pjud(self, request: DemandListGetRequest, known: list[DemandInformation] | None = None) -> DemandListGetResponse:
+        """
+        Scrapes the demand list of the account. With the `known` list of a previous scrape, only the cards added on
+        top of it are read, as long as the card count confirms nothing else changed; otherwise the whole list is read.
+        """
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                response = await self.connect_to_pjud(page, request.password, request.rut)
+            session_options = get_session_vault().context_options(session_key(request.rut, request.password))
+            async with get_browser_pool().context(**session_options) as context:
+                page = await context.new_page()
+                response = await self.open_pjud_session(context, page, request.password, request.rut)
                 if response:
                     return DemandListGetResponse(message=response, status=401)
                 
                 await self.connect_to_demand_list(page)
 
-                cards = page.locator("div.card.pg_card_tr")
-                num_cards = await cards.count()
-                for i in range(num_cards):
-                    card = cards.nth(i)
-                    card_info = await self.extract_demand_information(card, i)
-                    demand_list.append(card_info)
-                
-                await browser.close()
-            
-            return DemandListGetResponse(message="Valid", status=200, data=demand_list)
+                cards, total = await self.read_demand_cards(page, stop_at=known[0] if known else None)
+                known_demands: list[DemandInformation] = []
+                if known and len(cards) + len(known) == total:
+                    logging.info(f">>> 🔁 Bandeja de demandas: {len(cards)} demandas nuevas sobre {len(known)} conocidas")
+                    # Las demandas conocidas quedan debajo de las nuevas, sus índices se desplazan
+                    known_demands = [demand.model_copy(update={"index": len(cards) + position}) for position, demand in enumerate(known)]
+                elif known:
+                    # Demandas borradas o fuera de la ventana de fechas: los índices cambiaron, se lee la lista completa
+                    cards, total = await self.read_demand_cards(page)
+
+            demand_list = [demand for index, card in enumerate(cards) if (demand := self.parse_demand_card(card, index))]
+            return DemandListGetResponse(message="Valid", status=200, data=demand_list + known_demands)
         except Exception as e:
             logging.error("Failed to get demands from PJUD: %s", e)
             raise
     
     async def delete_demand(self, request: DemandDeleteRequest) -> DemandDeleteResponse:
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                response = await self.connect_to_pjud(page, request.password, request.rut)
+            session_options = get_session_vault().context_options(session_key(request.rut, request.password))
+            async with get_browser_pool().context(**session_options) as context:
+                page = await context.new_page()
+                response = await self.open_pjud_session(context, page, request.password, request.rut)
                 if response:
                     return DemandSendResponse(message=response, status=401)
                 
                 await self.connect_to_demand_list(page)
 
-                cards = page.locator("div.card.pg_card_tr")
+                cards = page.locator(DEMAND_CARD_SELECTOR)
                 num_cards = await cards.count()
                 for i in range(num_cards):
                     if i != request.index:
@@ -462,8 +570,6 @@ class PJUDController:
                     logging.warning("Failed to find demand")
                     return DemandSendResponse(message=f"Could not find demand with index {request.index}", status=400)
                 
-                await browser.close()
-                
             return DemandDeleteResponse(message="Valid", status=200)
         except Exception as e:
             logging.error("Failed to delete demand: %s", e)
@@ -471,16 +577,16 @@ class PJUDController:
 
     async def send_demand_to_court(self, request: DemandSendRequest) ->  DemandSendResponse:
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                response = await self.connect_to_pjud(page, request.password, request.rut)
+            session_options = get_session_vault().context_options(session_key(request.rut, request.password))
+            async with get_browser_pool().context(**session_options) as context:
+                page = await context.new_page()
+                response = await self.open_pjud_session(context, page, request.password, request.rut)
                 if response:
                     return DemandSendResponse(message=response, status=401)
                 
                 await self.connect_to_demand_list(page)
 
-                cards = page.locator("div.card.pg_card_tr")
+                cards = page.locator(DEMAND_CARD_SELECTOR)
                 num_cards = await cards.count()
                 for i in range(num_cards):
                     if i != request.index:
@@ -495,84 +601,69 @@ class PJUDController:
                     logging.warning("Failed to find demand")
                     return DemandSendResponse(message=f"Could not find demand with index {request.index}", status=400)
                 
-                await browser.close()
-                
             return DemandSendResponse(message="Valid", status=200)
         except Exception as e:
             logging.error("Failed to send demand to court: %s", e)
             raise
 
     async def send_demand_to_pjud(self, request: DemandTextSenderInput, demand_text: UploadFile, defendants: list[PJUDDDO], annexes: list[AnnexFile]) -> DemandTextSendResponse:
+        """Fills and uploads a demand in PJUD. The response carries the time spent on each step in `timings`."""
         information = request.information
-        start_time = datetime.now()
+        profile = StepProfile("PJUD demanda")
         try:
-            async with async_playwright() as p:
+            session_options = get_session_vault().context_options(session_key(request.rut, request.password))
+            async with get_browser_pool().context(**PJUD_CONTEXT_OPTIONS, **session_options) as context:
                 logging.info("[PJUD] Iniciando envío de demanda a PJUD")
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--disable-gpu',
-                        '--disable-dev-shm-usage',
-                        '--disable-web-security',
-                        '--disable-features=VizDisplayCompositor',
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox'
-                    ]
-                )
-                context = await browser.new_context(
-                    viewport={"width": 1366, "height": 900},
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    locale='es-CL',
-                    timezone_id='America/Santiago'
-                )
                 page = await context.new_page()
                 
                 logging.info("[PJUD] Conectando a PJUD...")
-                response = await self.connect_to_pjud(page, request.password, request.rut)
+                with profile.step("login"):
+                    response = await self.open_pjud_session(context, page, request.password, request.rut)
                 if response:
-                    return DemandTextSendResponse(message=response, status=401)
+                    return self._finish_demand_profile(DemandTextSendResponse(message=response, status=401), profile)
                 logging.info("[PJUD] Conexión exitosa a PJUD")
 
                 logging.info("[PJUD] Navegando a 'Ingresar Demanda/Recurso'...")
-                send_demand_selector = "div.list-group-item.list-group-item-action.p-2.pg_menu_lt:has-text('Ingresar Demanda/Recurso')"
-                await page.locator(send_demand_selector).wait_for()
-                await page.locator(send_demand_selector).click()
+                with profile.step("open_demand_form"):
+                    send_demand_selector = "div.list-group-item.list-group-item-action.p-2.pg_menu_lt:has-text('Ingresar Demanda/Recurso')"
+                    await page.locator(send_demand_selector).wait_for()
+                    await page.locator(send_demand_selector).click()
                 logging.info("[PJUD] Navegación completada")
 
                 logging.info("[PJUD] Configurando competencia...")
-                competencia_select = page.locator("div.form-group:has(label:text-is('Competencia')) select.form-control")
-                await competencia_select.wait_for()
-                await competencia_select.select_option(label="Familia")
-                await competencia_select.wait_for()
-                await competencia_select.select_option(label="Laboral")
-                await competencia_select.wait_for()
-                await competencia_select.select_option(label="Civil")
-                await competencia_select.wait_for()
-                await competencia_select.select_option(label="Civil")
+                with profile.step("competencia"):
+                    competencia_select = page.locator("div.form-group:has(label:text-is('Competencia')) select.form-control")
+                    await competencia_select.wait_for()
+                    await competencia_select.select_option(label="Familia")
+                    await competencia_select.wait_for()
+                    await competencia_select.select_option(label="Laboral")
+                    await competencia_select.wait_for()
+                    await competencia_select.select_option(label="Civil")
+                    await competencia_select.wait_for()
+                    await competencia_select.select_option(label="Civil")
                 logging.info("[PJUD] Competencia configurada: Civil")
 
                 logging.info("[PJUD] Seleccionando asiento de corte...")
-                #TODO: Use PJUDRegion get_court_label
-                await page.locator("div#s2id_select-asientoCorte a.select2-choice").click()
-                await page.locator("li.select2-result-selectable div.select2-result-label:has-text('C.A. de Santiago')").click(timeout=DEFAULT_WAIT_FOR_TIMEOUT)
-                await page.locator("div#s2id_select-asientoCorte a.select2-choice").click()
-                await page.locator("li.select2-result-selectable div.select2-result-label:has-text('C.A. de San Miguel')").click(timeout=DEFAULT_WAIT_FOR_TIMEOUT)
-                await page.locator("div#s2id_select-asientoCorte a.select2-choice").click()
-                await page.locator("li.select2-result-selectable div.select2-result-label:has-text('C.A. de Santiago')").click(timeout=DEFAULT_WAIT_FOR_TIMEOUT)
+                with profile.step("asiento_corte"):
+                    #TODO: Use PJUDRegion get_court_label
+                    await page.locator("div#s2id_select-asientoCorte a.select2-choice").click()
+                    await page.locator("li.select2-result-selectable div.select2-result-label:has-text('C.A. de Santiago')").click(timeout=DEFAULT_WAIT_FOR_TIMEOUT)
+                    await page.locator("div#s2id_select-asientoCorte a.select2-choice").click()
+                    await page.locator("li.select2-result-selectable div.select2-result-label:has-text('C.A. de San Miguel')").click(timeout=DEFAULT_WAIT_FOR_TIMEOUT)
+                    await page.locator("div#s2id_select-asientoCorte a.select2-choice").click()
+                    await page.locator("li.select2-result-selectable div.select2-result-label:has-text('C.A. de Santiago')").click(timeout=DEFAULT_WAIT_FOR_TIMEOUT)
                 logging.info("[PJUD] Asiento de corte seleccionado: C.A. de Santiago")
 
                 logging.info("[PJUD] Seleccionando tribunal...")
-                #TODO: Use PJUDRegion get_tribunal_label
-                await page.locator("div#s2id_select-tribunales a.select2-choice").click()
-                await page.locator("li.select2-result-selectable div.select2-result-label:has-text('Dist. Corte Santiago')").click(timeout=DEFAULT_WAIT_FOR_TIMEOUT)
+                with profile.step("tribunal"):
+                    #TODO: Use PJUDRegion get_tribunal_label
+                    await page.locator("div#s2id_select-tribunales a.select2-choice").click()
+                    await page.locator("li.select2-result-selectable div.select2-result-label:has-text('Dist. Corte Santiago')").click(timeout=DEFAULT_WAIT_FOR_TIMEOUT)
                 logging.info("[PJUD] Tribunal seleccionado: Dist. Corte Santiago")
 
                 logging.info("[PJUD] Seleccionando procedimiento...")
-                await page.locator("a.select2-choice.select2-default:has-text('Seleccione Procedimiento')").click()
-                search_box = page.locator("input.select2-input:visible")
-                await search_box.click()
-                await search_box.fill("Ejecutivo")
-                await search_box.press("Enter")
+                with profile.step("procedimiento"):
+                    await self.choose_select2_option(page, page.locator("a.select2-choice.select2-default:has-text('Seleccione Procedimiento')"), "Ejecutivo")
                 logging.info("[PJUD] Procedimiento seleccionado: Ejecutivo")
 
                 logging.info("[PJUD] Seleccionando materia...")
@@ -583,73 +674,35 @@ class PJUDController:
                 else:
                     pjud_legal_subject = "Obligación De Dar, Cumplimiento"
                 
-                max_retries = 3
-                materia_selected = False
-                for attempt in range(1, max_retries + 1):
-                    try:
-                        logging.info(f"[PJUD] Intento {attempt}/{max_retries} de seleccionar materia...")
-                        
-                        # Si no es el primer intento, hacer click afuera para cerrar cualquier dropdown abierto
-                        if attempt > 1:
-                            logging.info("[PJUD] Cerrando dropdown abierto haciendo click afuera...")
-                            await page.locator("body").click(position={"x": 10, "y": 10})
-                            await page.wait_for_timeout(500)
-                        
-                        await page.locator("a.select2-choice.select2-default:has-text('Seleccione Materia')").click()
-                        search_box = page.locator("input.select2-input:visible")
-                        await search_box.click(force=True)
-                        await search_box.fill(pjud_legal_subject, force=True)
-                        
-                        # Presionar Enter y esperar a que se complete la selección (con timeout de 3 segundos)
-                        await search_box.press("Enter")
-                        
-                        # Esperar a que el dropdown se cierre o que aparezca el valor seleccionado
-                        try:
-                            await page.locator(f"a.select2-choice:has-text('{pjud_legal_subject}')").wait_for(state="visible", timeout=2000)
-                            materia_selected = True
-                            logging.info(f"[PJUD] Materia seleccionada: {pjud_legal_subject}")
-                            break
-                        except TimeoutError:
-                            logging.warning(f"[PJUD] Timeout en intento {attempt} al seleccionar materia (más de 3 segundos)")
-                            if attempt < max_retries:
-                                logging.info(f"[PJUD] Reintentando selección de materia...")
-                                continue
-                            else:
-                                raise Exception(f"Timeout al seleccionar materia después de {max_retries} intentos")
-                    except Exception as e:
-                        if attempt < max_retries:
-                            logging.warning(f"[PJUD] Error en intento {attempt} de seleccionar materia: {e}. Reintentando...")
-                            continue
-                        else:
-                            logging.error(f"[PJUD] Error al seleccionar materia después de {max_retries} intentos: {e}")
-                            raise
-                
-                if not materia_selected:
-                    raise Exception(f"No se pudo seleccionar la materia después de {max_retries} intentos")
+                with profile.step("materia"):
+                    await self.choose_select2_option(page, page.locator("a.select2-choice.select2-default:has-text('Seleccione Materia')"), pjud_legal_subject)
+                    logging.info(f"[PJUD] Materia seleccionada: {pjud_legal_subject}")
 
-                logging.info("[PJUD] Agregando materia...")
-                await page.locator("button.btn.btn-primary.btn-block:has-text('Agregar')").nth(0).click()
-                await page.mouse.wheel(0, 500)
+                    logging.info("[PJUD] Agregando materia...")
+                    await page.locator("button.btn.btn-primary.btn-block:has-text('Agregar')").nth(0).click()
+                    await page.mouse.wheel(0, 500)
                 logging.info("[PJUD] Materia agregada exitosamente")
 
                 # Add sponsoring attorneys
                 if information.sponsoring_attorneys:
                     logging.info(f"[PJUD] Agregando {len(information.sponsoring_attorneys)} abogado(s) patrocinante(s)...")
-                    for attorney in information.sponsoring_attorneys:
-                        logging.info(f"[PJUD] Agregando abogado patrocinante: {attorney.name}")
-                        response = await self.add_sponsoring_attorney(page, attorney)
-                        if response:
-                            return response
+                    with profile.step("sponsoring_attorneys"):
+                        for attorney in information.sponsoring_attorneys:
+                            logging.info(f"[PJUD] Agregando abogado patrocinante: {attorney.name}")
+                            response = await self.add_sponsoring_attorney(page, attorney)
+                            if response:
+                                return self._finish_demand_profile(response, profile)
                     logging.info("[PJUD] Abogados patrocinantes agregados")
 
                 # Add defendants
                 if defendants:
                     logging.info(f"[PJUD] Agregando {len(defendants)} demandado(s)...")
-                    for defendant in list(reversed(defendants)):
-                        logging.info(f"[PJUD] Agregando demandado: {defendant.raw_name}")
-                        response = await self.add_defendant(page, defendant)
-                        if response:
-                            return response
+                    with profile.step("defendants"):
+                        for defendant in list(reversed(defendants)):
+                            logging.info(f"[PJUD] Agregando demandado: {defendant.raw_name}")
+                            response = await self.add_defendant(page, defendant)
+                            if response:
+                                return self._finish_demand_profile(response, profile)
                     logging.info("[PJUD] Demandados agregados")
 
                 # Add plaintiff
@@ -659,9 +712,10 @@ class PJUDController:
                     identifier=information.plaintiff.identifier,
                     legal_representatives=information.legal_representatives,
                 )
-                response = await self.add_plaintiff(page, plaintiff)
+                with profile.step("plaintiff"):
+                    response = await self.add_plaintiff(page, plaintiff)
                 if response:
-                    return response
+                    return self._finish_demand_profile(response, profile)
                 logging.info("[PJUD] Demandante agregado")
                 
                 logging.info("[PJUD] Haciendo click en botón 'Ingresar'...")
@@ -675,64 +729,67 @@ class PJUDController:
                     "buffer": await demand_text.read(),
                 }
 
-                try:
-                    async with page.expect_file_chooser() as fc_info:
-                        await page.locator("div#dDPrincipal button.btn.btn-primary.btn-block:visible:has-text('Adjuntar')").nth(0).click()
-                        file_chooser = await fc_info.value
-                        await file_chooser.set_files(demand_text_data)
-                    logging.info(f"[PJUD] Archivo de demanda principal subido: {demand_text.filename}")
-                except Exception as e:
-                    logging.error(f"Could not upload demand text file: {e}")
+                with profile.step("upload_demand_text"):
+                    try:
+                        async with page.expect_file_chooser() as fc_info:
+                            await page.locator("div#dDPrincipal button.btn.btn-primary.btn-block:visible:has-text('Adjuntar')").nth(0).click()
+                            file_chooser = await fc_info.value
+                            await file_chooser.set_files(demand_text_data)
+                        logging.info(f"[PJUD] Archivo de demanda principal subido: {demand_text.filename}")
+                    except Exception as e:
+                        logging.error(f"Could not upload demand text file: {e}")
                 
                 if annexes:
                     logging.info(f"[PJUD] Subiendo {len(annexes)} anexo(s)...")
-                    for annex in annexes:
-                        logging.info(f"[PJUD] Subiendo anexo: {annex.label}")
-                        label_box = page.locator("div#dDAnexo input[placeholder='Documento']:visible")
-                        await label_box.click()
-                        await label_box.fill(annex.label)
-
-                        annex_data = {
-                            "name": annex.upload_file.filename,
-                            "mimeType": annex.upload_file.content_type,
-                            "buffer": await annex.upload_file.read(),
-                        }
-
-                        try:
-                            async with page.expect_file_chooser() as fc_info:
-                                await page.locator("div#dDAnexo button.btn.btn-primary.btn-block:visible:has-text('Adjuntar')").nth(0).click()
-                                file_chooser = await fc_info.value
-                                await file_chooser.set_files(annex_data)
-                            logging.info(f"[PJUD] Anexo subido exitosamente: {annex.label}")
-                        except Exception as e:
-                            logging.error(f"Could not upload {annex.label} file: {e}")
+                    with profile.step("upload_annexes"):
+                        for annex in annexes:
+                            logging.info(f"[PJUD] Subiendo anexo: {annex.label}")
+                            label_box = page.locator("div#dDAnexo input[placeholder='Documento']:visible")
+                            await label_box.click()
+                            await label_box.fill(annex.label)
+
+                            annex_data = {
+                                "name": annex.upload_file.filename,
+                                "mimeType": annex.upload_file.content_type,
+                                "buffer": await annex.upload_file.read(),
+                            }
+
+                            try:
+                                async with page.expect_file_chooser() as fc_info:
+                                    await page.locator("div#dDAnexo button.btn.btn-primary.btn-block:visible:has-text('Adjuntar')").nth(0).click()
+                                    file_chooser = await fc_info.value
+                                    await file_chooser.set_files(annex_data)
+                                logging.info(f"[PJUD] Anexo subido exitosamente: {annex.label}")
+                            except Exception as e:
+                                logging.error(f"Could not upload {annex.label} file: {e}")
                     logging.info("[PJUD] Todos los anexos subidos")
 
                 logging.info("[PJUD] Finalizando subida de demanda...")
-                await page.locator("div#modalMultiArchivos button.btn.btn-primary.btn-block:visible:has-text('Cerrar y Continuar')").nth(0).click()
+                with profile.step("finish_upload"):
+                    await page.locator("div#modalMultiArchivos button.btn.btn-primary.btn-block:visible:has-text('Cerrar y Continuar')").nth(0).click()
                 logging.info("[PJUD] Subida de demanda completada")
 
-                await browser.close()
-                logging.info("[PJUD] Navegador cerrado")
+                logging.info("[PJUD] Liberando contexto de navegador")
 
-            end_time = datetime.now()
-            processing_time = (end_time - start_time).total_seconds()
-            logging.info(f"[PJUD] ⏱️  Tiempo total de procesamiento: {processing_time:.2f} segundos")
-            
-            return DemandTextSendResponse(message="Valid", status=200)
+            logging.info(f"[PJUD] ⏱️  Tiempo total de procesamiento: {profile.total:.2f} segundos")
+            return self._finish_demand_profile(DemandTextSendResponse(message="Valid", status=200), profile)
         except Exception as e:
-            end_time = datetime.now()
-            processing_time = (end_time - start_time).total_seconds()
-            logging.error(f"[PJUD] ❌ Error después de {processing_time:.2f} segundos: {e}")
+            logging.error(f"[PJUD] ❌ Error después de {profile.total:.2f} segundos: {e}")
+            profile.log_summary()
             logging.error("Failed to send demand to PJUD: %s", e)
             raise
 
+    def _finish_demand_profile(self, response: DemandTextSendResponse, profile: StepProfile) -> DemandTextSendResponse:
+        profile.log_summary()
+        response.timings = profile.timings()
+        return response
+
     async def send_suggestion_to_pjud(self, request: SuggestionRequest, court_case: CourtCase, suggestion: CaseEventSuggestion, suggestion_file: UploadFile) -> SuggestionResponse:
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                response = await self.connect_to_pjud(page, request.password, request.rut)
+            session_options = get_session_vault().context_options(session_key(request.rut, request.password))
+            async with get_browser_pool().context(**session_options) as context:
+                page = await context.new_page()
+                response = await self.open_pjud_session(context, page, request.password, request.rut)
                 if response:
                     return SuggestionResponse(message=response, status=401)
                 
@@ -840,8 +897,6 @@ class PJUDController:
 
                 await page.locator("div#modalMultiArchivos button.btn.btn-primary.btn-block:visible:has-text('Cerrar y Continuar')").nth(0).click()
                 
-                await browser.close()
-                
             return SuggestionResponse(message="Valid", status=200)
         except Exception as e:
             logging.error("Failed to send suggestion to court: %s", e)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import re
 import unicodedata
@@ -8,8 +9,11 @@ from datetime import datetime, date
 from typing import Optional
 from urllib.parse import urlparse
 
-from playwright.async_api import async_playwright, Page, Locator, TimeoutError
-from sqlmodel import Session, select
+from playwright.async_api import Page, Locator, TimeoutError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, func, select
+
+from config import Config
 
 from models.pydantic import CaseNotebookRequest, CaseNotebookResponse, CaseNotebookItem
 from models.sql.pjud_folio import PJUDFolio
@@ -18,6 +22,10 @@ from models.sql.suggestion import CaseEventSuggestion
 from models.sql.case import Case, CaseEvent, CaseEventType, CaseParty
 from uuid import uuid4
 from database.ext_db import get_session
+from services.pjud.browser_pool import PJUD_CONTEXT_OPTIONS, get_browser_pool
+from services.pjud.download_manager import PJUDDownloadManager
+from services.pjud.notebook_table import NotebookDocForm, parse_notebook_table
+from services.pjud.step_profile import StepProfile
 from services.v2.document.demand_exception.event_manager import DemandExceptionEventManager
 from services.v2.document.dispatch_resolution.event_manager import DispatchResolutionEventManager
 
@@ -31,6 +39,12 @@ hitos_4 = [
 # Hitos que no necesitan descargar PDF (solo crear evento)
 HITOS_SIN_PDF = ["hito4", "hito6", "hito7a", "hito7b"]
 
+# Orden legal en que se crean los eventos del caso a partir de los hitos
+MILESTONE_PROCESSING_ORDER = ["hito3", "hito5", "hito4", "hito6", "hito7a", "hito7b"]
+
+# Columnas de un folio que se actualizan si cambian entre scrapings
+FOLIO_UPSERT_FIELDS = ("document", "stage", "procedure", "procedure_date", "page", "milestone")
+
 
 def parse_procedure_date(date_str: str) -> Optional[date]:
     if not date_str or not isinstance(date_str, str):
@@ -52,6 +66,17 @@ def parse_procedure_date(date_str: str) -> Optional[date]:
 
 
 PJUD_URL = "https://oficinajudicialvirtual.pjud.cl/home/index.php"
+NOTEBOOK_TABLE_SELECTOR = "table:has(th:has-text('Folio')):has(th:has-text('Doc.')):has(th:has-text('Etapa'))"
+RESULTS_ROW_SELECTOR = "#dtaTableDetalle tr"
+# Primera fila de resultados de la búsqueda actual; las filas de búsquedas anteriores quedan marcadas como data-stale
+DETAIL_BUTTON_SELECTOR = "#dtaTableDetalle tr:not([data-stale]) td[align='center'] a.toggle-modal"
+# Cualquier celda de la búsqueda actual: la fila con el detalle o la fila de "sin resultados"
+RESULTS_CELL_SELECTOR = "#dtaTableDetalle tr:not([data-stale]) td"
+OPEN_MODAL_SELECTOR = ".modal.in, .modal.show, .modal-backdrop"
+SEARCH_ENTRY_PATTERN = re.compile(r"Consulta\s+causas|Ingreso\s+como\s+invitado", re.I)
+RIT_SEARCH_PATTERN = re.compile(r"B(ú|u)squeda\s+por\s+RIT", re.I)
+SEARCH_FORM_TIMEOUT = 20000
+RESULTS_TIMEOUT = 15000
 DEFAULT_WAIT_FOR_TIMEOUT = 3000
 
 FOLIO_COLUMN_INDEX = 0
@@ -74,6 +99,7 @@ class PJUDScrapper:
     """Scrapper for extracting case notebook information from PJUD"""
     
     def __init__(self, headless: bool = True):
+        # El modo headless lo define el pool compartido (BROWSER_POOL_HEADLESS); se mantiene por compatibilidad
         self.headless = headless
 
     async def click_by_text(self, page: Page, text_regex: str, role: str = "link|button") -> bool:
@@ -104,20 +130,17 @@ class PJUDScrapper:
         except Exception:
             return False
 
-    async def find_select_by_label(self, page: Page, label_regex: str) -> Optional[Locator]:
-        """Find select element by label text with improved robustness"""
+    async def find_select_by_label(self, page: Page, label_regex: str, timeout_ms: int = 3000) -> Optional[Locator]:
+        """Find select element by label text, waiting up to `timeout_ms` for the label to show up"""
         try:
-            # Esperar a que la página se estabilice
-            await page.wait_for_timeout(500)
-            
             # Buscar label con múltiples estrategias
             lbl = page.locator("label", has_text=re.compile(label_regex, re.I)).first
             
             # Esperar a que el label esté visible
             try:
-                await lbl.wait_for(state="visible", timeout=3000)
+                await lbl.wait_for(state="visible", timeout=timeout_ms)
             except:
-                logging.warning(f">>> ⚠️ Label '{label_regex}' no se hizo visible en 3 segundos")
+                logging.warning(f">>> ⚠️ Label '{label_regex}' no se hizo visible en {timeout_ms / 1000:g} segundos")
             
             if await lbl.count() == 0:
                 logging.warning(f">>> ⚠️ No se encontró label con patrón: {label_regex}")
@@ -145,19 +168,17 @@ class PJUDScrapper:
             return None
 
     async def wait_select_ready(self, page: Page, sel: Locator, min_options: int = 2, timeout_ms: int = 5000) -> bool:
-        """Wait for select to be ready with minimum options"""
+        """Wait for select to be enabled and loaded with minimum options"""
         try:
             await sel.wait_for(state="visible", timeout=timeout_ms)
-            
-            max_attempts = 3 if timeout_ms <= 2000 else (5 if timeout_ms <= 3000 else 10)
-            step_time = 30 if timeout_ms <= 2000 else (50 if timeout_ms <= 3000 else 100)
-            
-            for _ in range(max_attempts):
-                if await sel.count() and not await sel.is_disabled():
-                    if await sel.locator("option").count() >= min_options:
-                        return True
-                await page.wait_for_timeout(step_time)
-            return False
+            # Las opciones llegan por AJAX al cambiar el select anterior; se espera la condición en el navegador
+            handle = await sel.element_handle(timeout=timeout_ms)
+            await page.wait_for_function(
+                "([el, minOptions]) => !el.disabled && el.options.length >= minOptions",
+                arg=[handle, min_options],
+                timeout=timeout_ms,
+            )
+            return True
         except Exception:
             return False
 
@@ -191,10 +212,9 @@ class PJUDScrapper:
             logging.info(f">>> Opciones disponibles: {texts}")
             raise RuntimeError("No encontré una opción válida en el select.")
 
+        # El select dependiente se espera con wait_select_ready, no hace falta una pausa fija
         await sel.select_option(value=target_val)
         await sel.evaluate("el => el.dispatchEvent(new Event('change', {bubbles:true}))")
-        wait_time = 100 if fast_mode else 200
-        await page.wait_for_timeout(wait_time)
         logging.info(f">>> Seleccionado: {target_val}")
 
     async def fill_input_fast(self, page: Page, label_regex: str, text: str) -> bool:
@@ -232,7 +252,7 @@ class PJUDScrapper:
                     if await close_button.count() > 0 and await close_button.is_visible():
                         await close_button.click(timeout=2000)
                         logging.info(f">>> Modal cerrado usando selector: {selector}")
-                        await page.wait_for_timeout(500)
+                        await self.wait_modal_closed(page)
                         return True
                 except Exception:
                     continue
@@ -241,7 +261,7 @@ class PJUDScrapper:
             if await modal.count() > 0 and await modal.is_visible():
                 await page.keyboard.press('Escape')
                 logging.info(">>> Modal cerrado usando tecla ESC")
-                await page.wait_for_timeout(500)
+                await self.wait_modal_closed(page)
                 return True
                 
             logging.info(">>> No se encontró modal para cerrar")
@@ -251,6 +271,13 @@ class PJUDScrapper:
             logging.warning(f">>> Error al intentar cerrar modal: {e}")
             return False
 
+    async def wait_modal_closed(self, page: Page, timeout_ms: int = 2000) -> None:
+        """Wait for the modal and its backdrop to finish their closing transition"""
+        try:
+            await page.wait_for_selector(OPEN_MODAL_SELECTOR, state="hidden", timeout=timeout_ms)
+        except TimeoutError:
+            logging.warning(f">>> ⚠️ El modal sigue visible tras {timeout_ms} ms")
+
     def normalize_text(self, text: str) -> str:
         """Normalize text to handle special characters and accents"""
         if not text:
@@ -301,8 +328,8 @@ class PJUDScrapper:
         
         return patterns
 
-    def identify_hitos(self, rows_data: list[list[str]], headers: list[str]) -> list[list[str]]:
-        """Identify and classify rows according to specific milestones"""
+    def identify_hitos(self, rows_data: list[list[str]], headers: list[str], hito_4_offset: int = 0) -> list[list[str]]:
+        """Identify and classify rows according to specific milestones. `hito_4_offset` continues the Hito 4.N numbering of stored folios."""
         logging.info(">>> Identificando hitos...")
         
         if DESC_TRAMITE_INDEX >= len(headers):
@@ -314,7 +341,7 @@ class PJUDScrapper:
         logging.info(">>> Filas invertidas: procesando desde el más reciente al más antiguo")
         
         hitos_data = []
-        hito_4_count = 0
+        hito_4_count = hito_4_offset
 
         for row in rows_data_reversed:
             if len(row) <= DESC_TRAMITE_INDEX:
@@ -365,44 +392,35 @@ class PJUDScrapper:
         
         return hitos_data
 
-    async def extract_table_data(self, page: Page) -> tuple[list[CaseNotebookItem], list[dict]]:
-        """Extract table data from the modal"""
+    async def extract_table_data(self, page: Page, downloads: PJUDDownloadManager, case_id: str | None = None, case_number: str | None = None, year: int | None = None, incremental: bool = False, profile: StepProfile | None = None) -> tuple[list[CaseNotebookItem], list[dict]]:
+        """Extract table data from the modal. In incremental mode only the folios newer than the stored ones are read."""
+        profile = profile or StepProfile(f"PJUD cuaderno {case_number}-{year}")
+        last_folio, hito_4_offset = None, 0
+        if incremental:
+            # La consulta es bloqueante, corre en un hilo para no detener el event loop ni a los otros workers
+            with profile.step("load_sync_state"):
+                last_folio, hito_4_offset = await asyncio.to_thread(self._get_sync_state, case_number, year)
+            logging.info(f">>> 🔁 Sincronización incremental: último folio conocido {last_folio}")
         logging.info(">>> Esperando a que el modal se abra...")
         
-        table_selector = "table:has(th:has-text('Folio')):has(th:has-text('Doc.')):has(th:has-text('Etapa'))"
-        modal_table = page.locator(table_selector).first
-        await modal_table.wait_for(state="visible", timeout=5000)
-        
-        headers = []
-        header_cells = modal_table.locator("thead th")
-        header_count = await header_cells.count()
-        for i in range(header_count):
-            header_text = await header_cells.nth(i).inner_text()
-            header_text = self.normalize_text(header_text)
-            headers.append(header_text)
+        with profile.step("read_notebook_table"):
+            modal_table = page.locator(f"{NOTEBOOK_TABLE_SELECTOR}:not([data-stale])").first
+            await modal_table.wait_for(state="visible", timeout=5000)
+            
+            # Una sola lectura del DOM: encabezados, celdas y formularios de descarga se parsean localmente
+            table_html = await modal_table.evaluate("table => table.outerHTML")
+            table = parse_notebook_table(table_html, DOC_COLUMN_INDEX, FOLIO_COLUMN_INDEX, stop_at_folio=last_folio)
+        if table.reached_known_folio:
+            logging.info(f">>> ⏹️ Lectura detenida en el folio conocido {last_folio}: {len(table.rows)} folios nuevos")
+
+        headers = [self.normalize_text(header) for header in table.headers]
         logging.info(f">>> Encabezados encontrados: {headers}")
         
-        rows_data = []
-        rows = modal_table.locator("tbody tr")
-        rows_count = await rows.count()
-        for i in range(rows_count):
-            row = rows.nth(i)
-            cells = row.locator("td")
-            row_data = []
-            cells_count = await cells.count()
-            for j in range(cells_count):
-                cell_text = await cells.nth(j).inner_text()
-                cell_text = self.normalize_text(cell_text)
-                row_data.append(cell_text)
-            rows_data.append(row_data)
+        rows_data = [[self.normalize_text(cell) for cell in row] for row in table.rows]
         
         logging.info(f">>> Total de filas extraídas: {len(rows_data)}")
         
-        hitos_data = self.identify_hitos(rows_data, headers)
-        
-        case_id = getattr(self, '_current_case_id', None)
-        case_number = getattr(self, '_current_case_number', None)
-        year = getattr(self, '_current_year', None)
+        hitos_data = self.identify_hitos(rows_data, headers, hito_4_offset)
         
         logging.info(">>> 📥 INICIANDO PROCESO DE DESCARGA DE PDFs...")
         logging.info(f">>> 🆔 Case ID: {case_id}")
@@ -410,7 +428,9 @@ class PJUDScrapper:
         logging.info(f">>> 📅 Year: {year}")
         logging.info(f">>> 📊 Total hitos detectados: {len([row for row in hitos_data if len(row) > DESC_TRAMITE_INDEX and row[-1]])}")
         
-        milestone_events = await self.process_milestone_events(page, modal_table, hitos_data, case_id=case_id, case_number=case_number, year=year)
+        # Las filas se invierten en identify_hitos, los formularios se indexan por la posición original en la tabla
+        with profile.step("download_milestone_pdfs"):
+            milestone_events = await self.process_milestone_events(page, modal_table, hitos_data, downloads, case_id=case_id, case_number=case_number, year=year, doc_forms=table.doc_forms)
         
         logging.info(f">>> 📥 RESULTADO DE PROCESAMIENTO:")
         logging.info(f">>>    Eventos procesados: {len(milestone_events)}")
@@ -478,306 +498,374 @@ class PJUDScrapper:
         else:
             logging.info(">>> No se encontraron hitos en los datos")
 
-    def save_folios_to_db(self, items: list[CaseNotebookItem], case_number: str, year: int, save_to_db: bool = False) -> dict:
-        """Save folios to database if save_to_db is True. Skip existing folios."""
+    def save_folios_to_db(self, items: list[CaseNotebookItem], case_number: str, year: int, save_to_db: bool = False, scraping_type: str = "full") -> dict:
+        """
+        Save folios to database if save_to_db is True, with a single bulk upsert.
+
+        Existing folios are fetched in one query; new folios are inserted, folios whose data changed are
+        updated and identical ones are skipped.
+
+        Returns:
+            dict: Inserted, updated and skipped counts, and the scraping session ID
+        """
+        result = {"inserted": 0, "updated": 0, "skipped": 0, "scraping_session_id": None}
         if not save_to_db:
             logging.info(">>> Guardado en BD deshabilitado (save_to_db=False)")
-            return {"saved": 0, "skipped": 0}
+            return result
         
         if not items:
             logging.warning(">>> No hay folios para guardar en la base de datos")
-            return {"saved": 0, "skipped": 0}
+            return result
         
         logging.info(f">>> Iniciando guardado en BD: {len(items)} folios para ROL {case_number}, AÑO {year}")
         
-        saved_count = 0
-        skipped_count = 0
         session = next(get_session())
         
         try:
             scraping_session_id = datetime.now().strftime("%Y-%m-%d-%H")
+            result["scraping_session_id"] = scraping_session_id
             logging.info(f">>> Sesión de scraping: {scraping_session_id}")
             
-            for i, item in enumerate(items, 1):
-                
-                existing_folio = session.query(PJUDFolio).filter(
-                    PJUDFolio.folio_number == item.folio_number,
-                    PJUDFolio.case_number == case_number,
-                    PJUDFolio.year == year,
-                    PJUDFolio.procedure_description == item.procedure_description
-                ).first()
-                
-                if existing_folio:
-                    skipped_count += 1
-                else:
-                    new_folio = PJUDFolio(
-                        folio_number=item.folio_number,
-                        case_number=case_number,
-                        year=year,
-                        document=item.document,
-                        stage=item.stage,
-                        procedure=item.procedure,
-                        procedure_description=item.procedure_description,
-                        procedure_date=parse_procedure_date(item.procedure_date),
-                        page=item.page,
-                        milestone=item.milestone,
-                        scraping_session_id=scraping_session_id,
-                        scraping_type="full"
-                    )
-                    session.add(new_folio)
-                    saved_count += 1
+            existing_folios = self._get_existing_folios(session, case_number, year)
+            logging.info(f">>> Folios existentes en BD para el caso: {len(existing_folios)}")
+
+            now = datetime.utcnow()
+            pending: dict[tuple[int, str], dict] = {}
+            for item in items:
+                key = (item.folio_number, item.procedure_description)
+                values = {
+                    "document": item.document,
+                    "stage": item.stage,
+                    "procedure": item.procedure,
+                    "procedure_date": parse_procedure_date(item.procedure_date),
+                    "page": item.page,
+                    "milestone": item.milestone,
+                }
+                stored = existing_folios.get(key)
+                # Duplicados dentro del mismo cuaderno: se conserva el primero, como antes
+                if key in pending or stored == tuple(values[field] for field in FOLIO_UPSERT_FIELDS):
+                    result["skipped"] += 1
+                    continue
+                result["updated" if stored is not None else "inserted"] += 1
+                pending[key] = {
+                    "folio_number": item.folio_number,
+                    "case_number": case_number,
+                    "year": year,
+                    "procedure_description": item.procedure_description,
+                    **values,
+                    "created_at": now,
+                    "updated_at": now,
+                    "is_active": True,
+                    "scraping_session_id": scraping_session_id,
+                    "scraping_type": scraping_type,
+                }
+
+            if pending:
+                statement = pg_insert(PJUDFolio).values(list(pending.values()))
+                statement = statement.on_conflict_do_update(
+                    constraint="uq_folio_case_year_description",
+                    set_={
+                        **{field: statement.excluded[field] for field in FOLIO_UPSERT_FIELDS},
+                        "updated_at": statement.excluded.updated_at,
+                        "scraping_session_id": statement.excluded.scraping_session_id,
+                    },
+                )
+                session.execute(statement)
             session.commit()
             logging.info(">>> 💾 Transacción de BD confirmada exitosamente")
             
-            total_processed = saved_count + skipped_count
             logging.info(f">>> 📊 RESUMEN FINAL BD:")
-            logging.info(f">>>    Total procesados: {total_processed}")
-            logging.info(f">>>    ✅ Nuevos guardados: {saved_count}")
-            logging.info(f">>>    ❌ Existentes omitidos: {skipped_count}")
-            logging.info(f">>>    ROL: {case_number}, AÑO: {year}")
+            logging.info(f">>>    Total procesados: {len(items)}")
+            logging.info(f">>>    ✅ Nuevos insertados: {result['inserted']}")
+            logging.info(f">>>    🔄 Existentes actualizados: {result['updated']}")
+            logging.info(f">>>    ❌ Sin cambios omitidos: {result['skipped']}")
+            logging.info(f">>>    ROL: {case_number}, AÑO: {year}, Sesión: {scraping_session_id}")
             
         except Exception as e:
             session.rollback()
             logging.error(f">>> 💥 ERROR CRÍTICO al guardar en BD:")
             logging.error(f">>>    Error: {e}")
             logging.error(f">>>    ROL: {case_number}, AÑO: {year}")
-            logging.error(f">>>    Folios procesados antes del error: {saved_count + skipped_count}/{len(items)}")
             logging.error(">>> 🔄 Transacción revertida - no se guardaron cambios")
             raise
         finally:
             session.close()
             logging.info(">>> 🔌 Conexión a BD cerrada")
         
-        return {"saved": saved_count, "skipped": skipped_count}
+        return result
+
+    def _get_existing_folios(self, session: Session, case_number: str, year: int) -> dict[tuple[int, str], tuple]:
+        """Fetch the stored folios of a case in one query, keyed by (folio_number, procedure_description)."""
+        statement = select(
+            PJUDFolio.folio_number,
+            PJUDFolio.procedure_description,
+            *(getattr(PJUDFolio, field) for field in FOLIO_UPSERT_FIELDS),
+        ).where(
+            PJUDFolio.case_number == case_number,
+            PJUDFolio.year == year,
+        )
+        return {(row[0], row[1]): tuple(row[2:]) for row in session.exec(statement).all()}
+
+    async def extract_case_notebook(self, request: CaseNotebookRequest, case_id: str | None = None) -> CaseNotebookResponse:
+        """
+        Main method to extract case notebook information, creating the milestone events on `case_id` if given.
 
-    async def extract_case_notebook(self, request: CaseNotebookRequest) -> CaseNotebookResponse:
-        """Main method to extract case notebook information"""
+        The response carries the time spent on each step of the run in `timings`.
+        """
+        profile = StepProfile(f"PJUD cuaderno {request.case_number}-{request.year}")
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=self.headless,
-                    args=[
-                        '--disable-gpu',
-                        '--disable-dev-shm-usage',
-                        '--disable-web-security',
-                        '--disable-features=VizDisplayCompositor',
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox'
-                    ]
-                )
+            # Los PDFs descargados quedan en el directorio del gestor hasta terminar de procesarlos
+            async with PJUDDownloadManager() as downloads:
+                # El contexto vuelve al pool antes de guardar folios y procesar PDFs, que no usan el navegador
+                async with get_browser_pool().context(**PJUD_CONTEXT_OPTIONS) as context:
+                    page = await context.new_page()
+                    scraped = await self.scrape_case_notebook(page, request, downloads, case_id, profile=profile)
+
+                if isinstance(scraped, CaseNotebookResponse):
+                    response = scraped
+                else:
+                    logging.info(">>> 🔌 Contexto de navegador liberado, iniciando procesamiento de PDFs...")
+                    response = await self.store_case_notebook(scraped, request, case_id, profile=profile)
+        except Exception as e:
+            logging.error(f"Failed to extract case notebook: {e}")
+            response = CaseNotebookResponse(message=f"Internal error: {e}", status=500, data=[], total_items=0)
+
+        profile.log_summary()
+        response.timings = profile.timings()
+        return response
+
+    async def store_case_notebook(self, scraped: tuple[list[CaseNotebookItem], list[dict]], request: CaseNotebookRequest, case_id: str | None = None, profile: StepProfile | None = None) -> CaseNotebookResponse:
+        """
+        Saves the scraped folios and creates the milestone events of a case notebook.
+
+        Must run while the `PJUDDownloadManager` used to scrape it is still open, since the downloaded PDFs live in its
+        spool directory.
+        """
+        profile = profile or StepProfile(f"PJUD cuaderno {request.case_number}-{request.year}")
+        items, milestone_events = scraped
+        if request.save_to_db:
+            if items:
+                logging.info(f">>> 🗄️ Iniciando proceso de guardado en BD...")
+                try:
+                    with profile.step("save_folios"):
+                        db_result = self.save_folios_to_db(
+                            items, 
+                            request.case_number, 
+                            request.year, 
+                            save_to_db=True,
+                            scraping_type="incremental" if request.incremental else "full",
+                        )
+                    logging.info(f">>> 🎯 PROCESO BD COMPLETADO (sesión {db_result['scraping_session_id']}):")
+                    logging.info(f">>>    ✅ {db_result['inserted']} folios nuevos insertados")
+                    logging.info(f">>>    🔄 {db_result['updated']} folios existentes actualizados")
+                    logging.info(f">>>    ❌ {db_result['skipped']} folios sin cambios omitidos")
+                    logging.info(f">>>    📋 Total folios procesados: {len(items)}")
+                except Exception as e:
+                    logging.error(f">>> 💥 FALLO CRÍTICO en guardado BD:")
+                    logging.error(f">>>    Error: {e}")
+                    logging.error(f">>>    ROL: {request.case_number}, AÑO: {request.year}")
+                    logging.error(">>> ⚠️ Continuando sin guardar en BD...")
 
-                context = await browser.new_context(
-                    viewport={"width": 1366, "height": 900},
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    locale='es-CL',
-                    timezone_id='America/Santiago'
-                )
-                page = await context.new_page()
+            elif request.incremental:
+                logging.info(">>> ℹ️ Sin folios nuevos desde la última sincronización")
+            else:
+                logging.warning(">>> ⚠️ No hay folios para guardar en BD (lista vacía)")
+        else:
+            logging.info(">>> ℹ️ Guardado en BD deshabilitado por configuración")
+
+        if milestone_events:
+            logging.info(">>> 🔄 INICIANDO PROCESAMIENTO DE EVENTOS...")
+            logging.info(f">>> 📥 Total eventos a procesar: {len(milestone_events)}")
+            with profile.step("create_milestone_events"):
+                await self.process_milestone_documents(milestone_events, case_id)
+            logging.info(">>> ✅ PROCESAMIENTO DE TODOS LOS EVENTOS COMPLETADO")
+        else:
+            logging.info(">>> ℹ️ No hay eventos para procesar")
 
-                try:
-                    await page.goto(PJUD_URL, wait_until="domcontentloaded", timeout=30000)
-                except TimeoutError:
-                    logging.error("Timeout cargando home.")
-                    return CaseNotebookResponse(message="Timeout cargando página principal", status=500, data=[], total_items=0)
-
-                await self.close_modal_if_present(page)
-                await page.wait_for_timeout(500)
-
-                if not await self.click_fast(page, r"^\s*Consulta\s+causas\s*$"):
-                    await self.click_fast(page, r"Ingreso\s+como\s+invitado")
-                await page.wait_for_timeout(300)
-
-                await self.click_fast(page, r"B(ú|u)squeda\s+por\s+RIT")
-                await page.wait_for_timeout(1000)  # Aumentar tiempo de espera
-
-                # Buscar select de Competencia con reintentos
-                competencia = None
-                max_attempts = 5
-                for attempt in range(max_attempts):
-                    logging.info(f">>> 🔍 Buscando select de Competencia (intento {attempt + 1}/{max_attempts})...")
-                    competencia = await self.find_select_by_label(page, r"Competencia")
-                    if competencia:
-                        logging.info(f">>> ✅ Select de Competencia encontrado en intento {attempt + 1}")
-                        break
-                    else:
-                        logging.warning(f">>> ⚠️ Select de Competencia no encontrado en intento {attempt + 1}")
-                        if attempt < max_attempts - 1:
-                            await page.wait_for_timeout(2000)  # Esperar 2 segundos antes del siguiente intento
-                
-                if not competencia:
-                    raise RuntimeError("No encontré el select de Competencia después de múltiples intentos.")
-
-                await self.wait_select_ready(page, competencia, min_options=2, timeout_ms=5000)  # Aumentar timeout
-                await self.select_by_label_text(page, competencia, [r"^\s*Civil\s*$"], fast_mode=True)
-
-                tipo = await self.find_select_by_label(page, r"Tipo\s*B(ú|u)squeda")
-                if tipo:
-                    if await self.wait_select_ready(page, tipo, min_options=2, timeout_ms=2000):
-                        await self.select_by_label_text(page, tipo, [
-                            r"Recurso\s+.*Corte\s+de\s+Apelaciones",
-                            r"Causa\s+.*Juzgado",
-                            r"RIT",
-                            r"Civil"
-                        ], fast_mode=True)
-
-                corte = await self.find_select_by_label(page, r"^Corte")
-                if not corte:
-                    raise RuntimeError("No encontré el select de Corte.")
-                if not await self.wait_select_ready(page, corte, min_options=2, timeout_ms=3000):
-                    raise RuntimeError("Corte no se habilitó/cargó (revisa Tipo Búsqueda).")
-                await self.select_by_label_text(page, corte, [
-                    r"C\.?A\.?\s*Santiago",
-                    r"Corte\s+de\s+Apelaciones\s+de\s+Santiago",
-                    r"\bSantiago\b"
-                ], fast_mode=True)
+        return CaseNotebookResponse(
+            message="Success", 
+            status=200, 
+            data=items, 
+            total_items=len(items)
+        )
 
-                tribunal = await self.find_select_by_label(page, r"Tribunal")
-                if not tribunal:
-                    raise RuntimeError("No encontré el select de Tribunal.")
-                if not await self.wait_select_ready(page, tribunal, min_options=2, timeout_ms=3000):
-                    raise RuntimeError("Tribunal no se habilitó/cargó tras Corte.")
-                
-                try:
-                    tribunal_name = self.get_tribunal_name_by_id(request.tribunal_id)
-                    logging.info(f">>> 🏛️ TRIBUNAL SELECCIONADO:")
-                    logging.info(f">>>    ID: {request.tribunal_id}")
-                    logging.info(f">>>    Nombre: {tribunal_name}")
-                    
-                    if request.debug:
-                        logging.info(f">>> Seleccionando tribunal: {tribunal_name} (ID: {request.tribunal_id})")
-                    
-                    tribunal_patterns = self.generate_tribunal_patterns(tribunal_name)
-                    logging.info(f">>> 🔍 PATRONES DE BÚSQUEDA GENERADOS:")
-                    for i, pattern in enumerate(tribunal_patterns, 1):
-                        logging.info(f">>>    Patrón {i}: {pattern}")
-                    
-                    if request.debug:
-                        logging.info(f">>> Patrones de búsqueda: {tribunal_patterns}")
-                except ValueError as e:
-                    logging.error(f">>> ❌ ERROR: Tribunal ID inválido: {e}")
-                    raise RuntimeError(f"Tribunal ID inválido: {e}")
-                
-                logging.info(f">>> 🎯 SELECCIONANDO TRIBUNAL EN LA PÁGINA:")
-                logging.info(f">>>    Buscando: {tribunal_name}")
-                await self.select_by_label_text(page, tribunal, tribunal_patterns, fast_mode=True)
-                logging.info(f">>> ✅ Tribunal seleccionado exitosamente")
-
-                libro = await self.find_select_by_label(page, r"(Libro|Tipo|Letra)")
-                if libro and await self.wait_select_ready(page, libro, min_options=2, timeout_ms=2000):
-                    await self.select_by_label_text(page, libro, [r"^\s*C\s*$", r"\bC\b"], fast_mode=True)
-                else:
-                    try:
-                        await page.get_by_label(re.compile(r"(Libro|Tipo|Letra)", re.I)).fill("C")
-                    except Exception:
-                        pass
+    async def open_rit_search(self, page: Page) -> CaseNotebookResponse | None:
+        """Navigates from the PJUD home page to the search by RIT form, or returns an error response."""
+        try:
+            await page.goto(PJUD_URL, wait_until="domcontentloaded", timeout=30000)
+        except TimeoutError:
+            logging.error("Timeout cargando home.")
+            return CaseNotebookResponse(message="Timeout cargando página principal", status=500, data=[], total_items=0)
 
-                await self.fill_input_fast(page, r"^Rol$", request.case_number)
-                await self.fill_input_fast(page, r"A(ñ|n)o", request.year)
+        await self.close_modal_if_present(page)
 
-                if not await self.click_by_text(page, r"^\s*Buscar\s*$", role="button"):
-                    await self.click_by_text(page, r"^\s*Consultar\s*$", role="button")
+        # Esperar a que aparezcan los enlaces en vez de pausas fijas entre clics
+        try:
+            await page.get_by_text(SEARCH_ENTRY_PATTERN).first.wait_for(state="visible", timeout=DEFAULT_WAIT_FOR_TIMEOUT)
+        except TimeoutError:
+            logging.warning(">>> ⚠️ No apareció el acceso a la consulta de causas")
+        if not await self.click_fast(page, r"^\s*Consulta\s+causas\s*$"):
+            await self.click_fast(page, r"Ingreso\s+como\s+invitado")
 
-                await page.wait_for_load_state("domcontentloaded")
+        try:
+            await page.get_by_text(RIT_SEARCH_PATTERN).first.wait_for(state="visible", timeout=DEFAULT_WAIT_FOR_TIMEOUT)
+        except TimeoutError:
+            logging.warning(">>> ⚠️ No apareció la pestaña de búsqueda por RIT")
+        await self.click_fast(page, r"B(ú|u)squeda\s+por\s+RIT")
+        return None
+
+    async def _reset_rit_search(self, page: Page) -> None:
+        """Closes the notebook modal of the previous lookup and marks its results so they are not read again."""
+        await self.close_modal_if_present(page)
+        await page.locator(RESULTS_ROW_SELECTOR).evaluate_all("rows => rows.forEach(row => row.setAttribute('data-stale', ''))")
+        await page.locator(NOTEBOOK_TABLE_SELECTOR).evaluate_all("tables => tables.forEach(table => table.setAttribute('data-stale', ''))")
+
+    async def scrape_case_notebook(self, page: Page, request: CaseNotebookRequest, downloads: PJUDDownloadManager, case_id: str | None, search_ready: bool = False, profile: StepProfile | None = None) -> tuple[list[CaseNotebookItem], list[dict]] | CaseNotebookResponse:
+        """
+        Looks up a case by RIT and extracts its notebook table, or returns an error response.
+
+        Args:
+            page: Browser page used for the lookup
+            request: Case to look up
+            downloads: Download manager for the milestone PDFs
+            case_id: Case that receives the milestone events
+            search_ready: Whether `page` still shows the search by RIT form of a previous lookup, so the navigation
+                from the home page can be skipped
+            profile: Step timing profile of the run
+        """
+        profile = profile or StepProfile(f"PJUD cuaderno {request.case_number}-{request.year}")
+        with profile.step("open_search"):
+            if search_ready:
+                await self._reset_rit_search(page)
+            else:
+                error_response = await self.open_rit_search(page)
+                if error_response:
+                    return error_response
+
+        with profile.step("fill_search_form"):
+            await self._fill_rit_search(page, request)
+
+        with profile.step("wait_search_results"):
+            detalle_button = await self._wait_search_results(page)
+
+        try:
+            if detalle_button is not None:
+                href = await detalle_button.get_attribute("href")
+                clase = await detalle_button.get_attribute("class")
                 
-                try:
-                    logging.info(">>> Esperando a que la tabla se cargue...")
-                    await page.wait_for_selector("#dtaTableDetalle:visible", timeout=15000)
-                    logging.info(">>> Tabla encontrada, esperando estabilización...")
-                    await page.wait_for_timeout(2000)
-                    
-                    detalle_button = page.locator("#dtaTableDetalle tr:first-child td[align='center'] a.toggle-modal")
-                    
-                    if await detalle_button.count() > 0:
-                        href = await detalle_button.get_attribute("href")
-                        clase = await detalle_button.get_attribute("class")
-                        
-                        if href == "#modalDetalleCivil" and "toggle-modal" in clase:
-                            await detalle_button.click(timeout=2000)
-                            logging.info(">>> Clic en botón de detalle exitoso")
-                            
-                            logging.info(">>> Esperando a que el modal se abra...")
-                            await page.wait_for_selector(".modal.in", timeout=5000)
-                            await page.wait_for_timeout(500)
-                            
-                            items, milestone_events = await self.extract_table_data(page)
-                            
-                            if request.save_to_db:
-                                if items:
-                                    logging.info(f">>> 🗄️ Iniciando proceso de guardado en BD...")
-                                    try:
-                                        db_result = self.save_folios_to_db(
-                                            items, 
-                                            request.case_number, 
-                                            request.year, 
-                                            save_to_db=True
-                                        )
-                                        logging.info(f">>> 🎯 PROCESO BD COMPLETADO:")
-                                        logging.info(f">>>    ✅ {db_result['saved']} folios nuevos guardados")
-                                        logging.info(f">>>    ❌ {db_result['skipped']} folios existentes omitidos")
-                                        logging.info(f">>>    📋 Total folios procesados: {len(items)}")
-                                    except Exception as e:
-                                        logging.error(f">>> 💥 FALLO CRÍTICO en guardado BD:")
-                                        logging.error(f">>>    Error: {e}")
-                                        logging.error(f">>>    ROL: {request.case_number}, AÑO: {request.year}")
-                                        logging.error(">>> ⚠️ Continuando sin guardar en BD...")
-
-                                else:
-                                    logging.warning(">>> ⚠️ No hay folios para guardar en BD (lista vacía)")
-                            else:
-                                logging.info(">>> ℹ️ Guardado en BD deshabilitado por configuración")
-
-                            await browser.close()
-                            logging.info(">>> 🔌 Browser cerrado, iniciando procesamiento de PDFs...")
-
-                            if milestone_events:
-                                case_id = getattr(self, '_current_case_id', None)
-                                logging.info(">>> 🔄 INICIANDO PROCESAMIENTO DE EVENTOS...")
-                                logging.info(f">>> 📥 Total eventos a procesar: {len(milestone_events)}")
-                                
-                                # Separar eventos con PDF de eventos sin PDF
-                                events_with_pdf = [event for event in milestone_events if event.get('pdf_path') is not None]
-                                events_without_pdf = [event for event in milestone_events if event.get('pdf_path') is None]
-                                
-                                logging.info(f">>> 📋 Eventos con PDF: {len(events_with_pdf)}")
-                                logging.info(f">>> 📋 Eventos sin PDF: {len(events_without_pdf)}")
-                                
-                                # Procesar eventos con PDF
-                                if events_with_pdf:
-                                    logging.info(">>> 🔄 PROCESANDO EVENTOS CON PDF...")
-                                    await self.process_downloaded_pdfs(events_with_pdf, case_id)
-                                    logging.info(">>> ✅ PROCESAMIENTO DE EVENTOS CON PDF COMPLETADO")
-                                
-                                # Procesar eventos sin PDF
-                                if events_without_pdf:
-                                    logging.info(">>> 🔄 PROCESANDO EVENTOS SIN PDF...")
-                                    await self.process_events_without_pdf(events_without_pdf, case_id)
-                                    logging.info(">>> ✅ PROCESAMIENTO DE EVENTOS SIN PDF COMPLETADO")
-                                
-                                logging.info(">>> ✅ PROCESAMIENTO DE TODOS LOS EVENTOS COMPLETADO")
-                            else:
-                                logging.info(">>> ℹ️ No hay eventos para procesar")
-                            
-                            return CaseNotebookResponse(
-                                message="Success", 
-                                status=200, 
-                                data=items, 
-                                total_items=len(items)
-                            )
-                        else:
-                            logging.warning(">>> El elemento encontrado no es el botón de detalle correcto")
-                    else:
-                        logging.warning(">>> No se encontró el botón de detalle")
+                if href == "#modalDetalleCivil" and "toggle-modal" in clase:
+                    with profile.step("open_notebook"):
+                        await detalle_button.click(timeout=2000)
+                        logging.info(">>> Clic en botón de detalle exitoso")
                         
-                except Exception as e:
-                    logging.error(f">>> Error al hacer clic en detalle: {e}")
-                
-                await browser.close()
-                return CaseNotebookResponse(message="No se encontraron datos", status=404, data=[], total_items=0)
+                        logging.info(">>> Esperando a que el modal se abra...")
+                        await page.wait_for_selector(".modal.in", timeout=5000)
+                    
+                    return await self.extract_table_data(page, downloads, case_id=case_id, case_number=request.case_number, year=request.year, incremental=request.incremental, profile=profile)
+                else:
+                    logging.warning(">>> El elemento encontrado no es el botón de detalle correcto")
+            else:
+                logging.warning(">>> No se encontró el botón de detalle")
                 
         except Exception as e:
-            logging.error(f"Failed to extract case notebook: {e}")
-            return CaseNotebookResponse(message=f"Internal error: {e}", status=500, data=[], total_items=0)
+            logging.error(f">>> Error al hacer clic en detalle: {e}")
+        
+        return CaseNotebookResponse(message="No se encontraron datos", status=404, data=[], total_items=0)
+
+    async def _fill_rit_search(self, page: Page, request: CaseNotebookRequest) -> None:
+        """Fills the search by RIT form with the case and submits it."""
+        # El formulario se carga tras la navegación; se espera su primer label en vez de reintentar con pausas
+        logging.info(">>> 🔍 Buscando select de Competencia...")
+        competencia = await self.find_select_by_label(page, r"Competencia", timeout_ms=SEARCH_FORM_TIMEOUT)
+        if not competencia:
+            raise RuntimeError("No encontré el select de Competencia.")
+
+        await self.wait_select_ready(page, competencia, min_options=2, timeout_ms=5000)  # Aumentar timeout
+        await self.select_by_label_text(page, competencia, [r"^\s*Civil\s*$"], fast_mode=True)
+
+        tipo = await self.find_select_by_label(page, r"Tipo\s*B(ú|u)squeda")
+        if tipo:
+            if await self.wait_select_ready(page, tipo, min_options=2, timeout_ms=2000):
+                await self.select_by_label_text(page, tipo, [
+                    r"Recurso\s+.*Corte\s+de\s+Apelaciones",
+                    r"Causa\s+.*Juzgado",
+                    r"RIT",
+                    r"Civil"
+                ], fast_mode=True)
+
+        corte = await self.find_select_by_label(page, r"^Corte")
+        if not corte:
+            raise RuntimeError("No encontré el select de Corte.")
+        if not await self.wait_select_ready(page, corte, min_options=2, timeout_ms=3000):
+            raise RuntimeError("Corte no se habilitó/cargó (revisa Tipo Búsqueda).")
+        await self.select_by_label_text(page, corte, [
+            r"C\.?A\.?\s*Santiago",
+            r"Corte\s+de\s+Apelaciones\s+de\s+Santiago",
+            r"\bSantiago\b"
+        ], fast_mode=True)
+
+        tribunal = await self.find_select_by_label(page, r"Tribunal")
+        if not tribunal:
+            raise RuntimeError("No encontré el select de Tribunal.")
+        if not await self.wait_select_ready(page, tribunal, min_options=2, timeout_ms=3000):
+            raise RuntimeError("Tribunal no se habilitó/cargó tras Corte.")
+        
+        try:
+            tribunal_name = self.get_tribunal_name_by_id(request.tribunal_id)
+            logging.info(f">>> 🏛️ TRIBUNAL SELECCIONADO:")
+            logging.info(f">>>    ID: {request.tribunal_id}")
+            logging.info(f">>>    Nombre: {tribunal_name}")
+            
+            if request.debug:
+                logging.info(f">>> Seleccionando tribunal: {tribunal_name} (ID: {request.tribunal_id})")
+            
+            tribunal_patterns = self.generate_tribunal_patterns(tribunal_name)
+            logging.info(f">>> 🔍 PATRONES DE BÚSQUEDA GENERADOS:")
+            for i, pattern in enumerate(tribunal_patterns, 1):
+                logging.info(f">>>    Patrón {i}: {pattern}")
+            
+            if request.debug:
+                logging.info(f">>> Patrones de búsqueda: {tribunal_patterns}")
+        except ValueError as e:
+            logging.error(f">>> ❌ ERROR: Tribunal ID inválido: {e}")
+            raise RuntimeError(f"Tribunal ID inválido: {e}")
+        
+        logging.info(f">>> 🎯 SELECCIONANDO TRIBUNAL EN LA PÁGINA:")
+        logging.info(f">>>    Buscando: {tribunal_name}")
+        await self.select_by_label_text(page, tribunal, tribunal_patterns, fast_mode=True)
+        logging.info(f">>> ✅ Tribunal seleccionado exitosamente")
+
+        libro = await self.find_select_by_label(page, r"(Libro|Tipo|Letra)")
+        if libro and await self.wait_select_ready(page, libro, min_options=2, timeout_ms=2000):
+            await self.select_by_label_text(page, libro, [r"^\s*C\s*$", r"\bC\b"], fast_mode=True)
+        else:
+            try:
+                await page.get_by_label(re.compile(r"(Libro|Tipo|Letra)", re.I)).fill("C")
+            except Exception:
+                pass
+
+        await self.fill_input_fast(page, r"^Rol$", request.case_number)
+        await self.fill_input_fast(page, r"A(ñ|n)o", request.year)
+
+        if not await self.click_by_text(page, r"^\s*Buscar\s*$", role="button"):
+            await self.click_by_text(page, r"^\s*Consultar\s*$", role="button")
+
+    async def _wait_search_results(self, page: Page) -> Optional[Locator]:
+        """Waits for the results of the current search and returns its detail button, if the case was found."""
+        await page.wait_for_load_state("domcontentloaded")
+        try:
+            logging.info(">>> Esperando a que la tabla se cargue...")
+            await page.wait_for_selector("#dtaTableDetalle:visible", timeout=RESULTS_TIMEOUT)
+            # La tabla se llena por AJAX: basta con la primera celda de esta búsqueda, con o sin resultados
+            await page.wait_for_selector(RESULTS_CELL_SELECTOR, state="attached", timeout=RESULTS_TIMEOUT)
+        except Exception as e:
+            logging.error(f">>> Error esperando resultados de la búsqueda: {e}")
+            return None
 
+        detalle_button = page.locator(DETAIL_BUTTON_SELECTOR).first
+        if await detalle_button.count() == 0:
+            return None
+        return detalle_button
     def _find_milestone_rows(self, hitos_data: list[list[str]]) -> list[tuple[int, int, str]]:
         """Find all milestone rows (Hito 3, 4, 5, 6, 7). Returns (scraping_index, data_index, milestone_type)."""
         milestones = []
@@ -822,7 +910,7 @@ class PJUDScrapper:
         return None
 
 
-    async def _download_pdf_from_new_tab(self, page, download_button, milestone_type: str, debug: bool = False) -> Optional[str]:
+    async def _download_pdf_from_new_tab(self, downloads: PJUDDownloadManager, download_button, milestone_type: str, debug: bool = False) -> Optional[str]:
         """Download PDF by constructing URL from form input."""
         try:
             logging.info(">>> 🔍 Obteniendo form que contiene el botón de descarga...")
@@ -855,75 +943,22 @@ class PJUDScrapper:
                 return None
             
             logging.info(f">>> ✅ Valor dtaDoc obtenido (longitud: {len(dta_doc_value)} caracteres)")
-            
-            # Construir la URL manualmente
-            base_url = "https://oficinajudicialvirtual.pjud.cl"
-            # Si el action no comienza con /, agregarlo
-            if not form_action.startswith('/'):
-                form_action = '/' + form_action
-            
-            current_url = f"{base_url}{form_action}?dtaDoc={dta_doc_value}"
-            logging.info(f">>> 🔗 URL construida: {current_url}")
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{milestone_type}_{timestamp}.pdf"
-            download_path = f"/tmp/{filename}"
-            
-            cookies = await page.context.cookies()
-            cookie_header = "; ".join([f"{cookie['name']}={cookie['value']}" for cookie in cookies])
-            
-            logging.info(f">>> 🍪 Usando cookies para descarga: {len(cookies)} cookies")
-            
-            headers = {
-                'Cookie': cookie_header,
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-                'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Cache-Control': 'max-age=0',
-            }
-
-            async with aiohttp.ClientSession() as session:
-                logging.info(f">>> 📡 Haciendo HEAD request para detectar tipo de contenido...")
-                async with session.head(current_url, headers=headers, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=30)) as head_response:
-                    head_response.raise_for_status()
-                    content_type = head_response.headers.get('Content-Type', '').lower()
-                    logging.info(f">>> 📋 Content-Type: {content_type}")
-
-                    if 'application/pdf' in content_type:
-                        logging.info(">>> 📄 PDF detectado, descargando...")
-                        async with session.get(current_url, headers=headers, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=30)) as pdf_response:
-                            pdf_response.raise_for_status()
-                            
-                            pdf_content = await pdf_response.read()
-                            
-                            if pdf_content[:4] == b'%PDF':
-                                logging.info(">>> ✅ Firma PDF verificada")
-                                
-                                with open(download_path, 'wb') as f:
-                                    f.write(pdf_content)
-                                
-                                milestone_name = "Hito 3 (Ordena despachar mandamiento)" if milestone_type == "hito3" else "Hito 5 (Opone excepciones)"
-                                logging.info(f">>> ✅ PDF de {milestone_name} descargado: {download_path}")
-                                
-                                if os.path.exists(download_path):
-                                    file_size = os.path.getsize(download_path)
-                                    logging.info(f">>> 📊 Tamaño del archivo: {file_size} bytes")
-                                    return download_path
-                                else:
-                                    logging.error(">>> ❌ El archivo no se guardó correctamente")
-                                    return None
-                            else:
-                                logging.error(">>> ❌ El archivo descargado no es un PDF válido (firma no encontrada)")
-                                return None
-                    else:
-                        logging.error(f">>> ❌ El contenido no es un PDF. Content-Type: {content_type}")
-                        return None
+        except Exception as e:
+            logging.error(f">>> ❌ ERROR AL LEER EL FORM DE DESCARGA: {e}")
+            if debug:
+                logging.error(f">>> 🔍 Traceback completo: {traceback.format_exc()}")
+            return None
+
+        return await self._download_pdf_from_form(downloads, form_action, dta_doc_value, milestone_type, debug)
+
+    async def _download_pdf_from_form(self, downloads: PJUDDownloadManager, form_action: str, dta_doc_value: str, milestone_type: str, debug: bool = False) -> Optional[str]:
+        """Download PDF from the action and dtaDoc value of its download form, through the session download manager."""
+        try:
+            download_path = await downloads.download_pdf(form_action, dta_doc_value)
+            if download_path:
+                milestone_name = "Hito 3 (Ordena despachar mandamiento)" if milestone_type == "hito3" else "Hito 5 (Opone excepciones)"
+                logging.info(f">>> ✅ PDF de {milestone_name} descargado: {download_path}")
+            return download_path
                         
         except aiohttp.ClientError as e:
             logging.error(f">>> ❌ Error HTTP al descargar PDF: {e}")
@@ -934,12 +969,11 @@ class PJUDScrapper:
             logging.error(f">>> ❌ ERROR CRÍTICO AL DESCARGAR PDF:")
             logging.error(f">>>    🚨 Error: {e}")
             logging.error(f">>>    📄 Milestone: {milestone_type}")
-            logging.error(f">>>    📄 PDF esperado: {milestone_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
             if debug:
                 logging.error(f">>> 🔍 Traceback completo: {traceback.format_exc()}")
             return None
 
-    async def process_milestone_events(self, page, modal_table, rows_data, case_id: str = None, case_number: str = None, year: int = None, debug: bool = False) -> list[dict]:
+    async def process_milestone_events(self, page, modal_table, rows_data, downloads: PJUDDownloadManager, case_id: str = None, case_number: str = None, year: int = None, debug: bool = False, doc_forms: list[NotebookDocForm | None] | None = None) -> list[dict]:
         """Process milestone events: download PDFs for Hito 3 and 5, create entries for Hito 4, 6, and 7"""
         try:
             logging.info(">>> 🔍 INICIANDO PROCESAMIENTO DE HITOS...")
@@ -973,7 +1007,11 @@ class PJUDScrapper:
             for i, (scraping_index, data_index, milestone_type) in enumerate(milestones_sorted):
                 logging.info(f">>>    {i+1}. {milestone_type.upper()} (scraping: fila {scraping_index + 1}, datos: fila {data_index + 1})")
             
-            milestone_events = []
+            milestone_events: list[dict | None] = []
+            # Descargas pendientes: (posición en milestone_events, número de hito, corrutina)
+            pending_downloads = []
+            # Una sola consulta para todos los hitos, en lugar de una sesión por fila
+            existing_folio_keys = self._get_existing_folio_keys(case_number, year)
             logging.info(f">>> 🔄 INICIANDO PROCESAMIENTO DE {len(milestones_sorted)} EVENTOS...")
             
             for i, (scraping_index, data_index, milestone_type) in enumerate(milestones_sorted):
@@ -983,7 +1021,7 @@ class PJUDScrapper:
                 
                 # Verificar si el folio ya existe en la BD (para TODOS los hitos)
                 logging.info(f">>> 🔍 Verificando si folio ya existe en BD...")
-                if self._folio_already_exists(rows_data[data_index], case_number, year):
+                if self._get_row_folio_key(rows_data[data_index]) in existing_folio_keys:
                     logging.info(f">>> ⏭️ HITO {milestone_type.upper()} ya existe en BD - OMITIENDO procesamiento")
                     continue
                 
@@ -1005,15 +1043,27 @@ class PJUDScrapper:
                     logging.info(f">>> ✅ {milestone_type.upper()} agregado para procesamiento posterior")
                     continue
                 
-                logging.info(f">>> ✅ Folio no existe - PROCEDIENDO CON PROCESAMIENTO")
-                logging.info(f">>> 🔄 PROCESANDO HITO {i+1}/{len(milestones_sorted)}: {milestone_type.upper()}")
+                logging.info(f">>> ✅ Folio no existe - ENCOLANDO DESCARGA DE {milestone_type.upper()}")
                 
-                pdf_info = await self._download_single_milestone_pdf(page, modal_table, rows_data, scraping_index, data_index, milestone_type, case_id, debug)
-                if pdf_info:
-                    milestone_events.append(pdf_info)
-                    logging.info(f">>> ✅ PDF {i+1} descargado exitosamente: {pdf_info.get('pdf_path', 'unknown')}")
-                else:
-                    logging.error(f">>> ❌ FALLO en descarga de PDF {i+1}")
+                # Se reserva la posición para conservar el orden de los hitos aunque las descargas terminen en otro orden
+                milestone_events.append(None)
+                pending_downloads.append((
+                    len(milestone_events) - 1,
+                    i + 1,
+                    self._download_single_milestone_pdf(downloads, modal_table, rows_data, scraping_index, data_index, milestone_type, case_id, debug, doc_forms),
+                ))
+
+            if pending_downloads:
+                downloads.load_cookies(await page.context.cookies())
+                logging.info(f">>> 📥 Descargando {len(pending_downloads)} PDFs (máximo {downloads.max_concurrency} simultáneos)...")
+                results = await asyncio.gather(*(download for _, _, download in pending_downloads))
+                for (position, number, _), pdf_info in zip(pending_downloads, results):
+                    if pdf_info:
+                        milestone_events[position] = pdf_info
+                        logging.info(f">>> ✅ PDF {number} descargado exitosamente: {pdf_info.get('pdf_path', 'unknown')}")
+                    else:
+                        logging.error(f">>> ❌ FALLO en descarga de PDF {number}")
+            milestone_events = [event for event in milestone_events if event]
             
             logging.info(f">>> 📥 RESUMEN DE PROCESAMIENTO COMPLETADO:")
             logging.info(f">>>    Total eventos procesados: {len(milestone_events)}")
@@ -1032,13 +1082,29 @@ class PJUDScrapper:
                 logging.error(f">>> 🔍 Traceback completo: {traceback.format_exc()}")
             return []
     
-    async def _download_single_milestone_pdf(self, page, modal_table, rows_data, scraping_index, data_index, milestone_type, case_id, debug) -> dict:
+    async def _download_single_milestone_pdf(self, downloads: PJUDDownloadManager, modal_table, rows_data, scraping_index, data_index, milestone_type, case_id, debug, doc_forms: list[NotebookDocForm | None] | None = None) -> dict:
         """Download PDF for a single milestone (without processing)."""
         try:
             logging.info(f">>> 🔍 DESCARGANDO {milestone_type.upper()}:")
             logging.info(f">>>    📍 Fila scraping: {scraping_index + 1}, Fila datos: {data_index + 1}")
             logging.info(f">>>    📝 Descripción: {rows_data[data_index][DESC_TRAMITE_INDEX] if len(rows_data[data_index]) > DESC_TRAMITE_INDEX else 'N/A'}")
             
+            doc_form = doc_forms[scraping_index] if doc_forms and scraping_index < len(doc_forms) else None
+            if doc_form:
+                # El formulario ya se leyó junto con la tabla, no hace falta volver a consultar el DOM
+                logging.info(">>> ✅ FORM DE DESCARGA DISPONIBLE DESDE LA TABLA")
+                download_path = await self._download_pdf_from_form(downloads, doc_form.action, doc_form.dta_doc, milestone_type, debug)
+                if download_path:
+                    logging.info(f">>> ✅ PDF DESCARGADO EXITOSAMENTE: {download_path}")
+                    return {
+                        "pdf_path": download_path,
+                        "milestone_type": milestone_type,
+                        "case_id": case_id,
+                        "description": rows_data[data_index][DESC_TRAMITE_INDEX] if len(rows_data[data_index]) > DESC_TRAMITE_INDEX else 'N/A',
+                        "procedure_date": rows_data[data_index][DATE_COLUMN_INDEX] if len(rows_data[data_index]) > DATE_COLUMN_INDEX else None
+                    }
+                logging.warning(">>> ⚠️ Descarga desde el form de la tabla fallida, buscando botón en la página...")
+
             logging.info(f">>> 🔍 LOCALIZANDO FILA EN TABLA...")
             rows = modal_table.locator("tbody tr")
             target_row = rows.nth(scraping_index)  # Usar scraping_index para acceder a la fila correcta en la tabla
@@ -1054,7 +1120,7 @@ class PJUDScrapper:
                 logging.info(">>> 🔄 INICIANDO DESCARGA DESDE NUEVA PESTAÑA...")
                 
                 try:
-                    download_path = await self._download_pdf_from_new_tab(page, download_button, milestone_type, debug)
+                    download_path = await self._download_pdf_from_new_tab(downloads, download_button, milestone_type, debug)
                     
                     if download_path:
                         logging.info(f">>> ✅ PDF DESCARGADO EXITOSAMENTE: {download_path}")
@@ -1104,336 +1170,170 @@ class PJUDScrapper:
                 logging.error(f">>> 🔍 Traceback completo: {traceback.format_exc()}")
             return None
     
-    def _folio_already_exists(self, row_data: list[str], case_number: str, year: int) -> bool:
-        """Check if a folio already exists in the database."""
+    def _get_existing_folio_keys(self, case_number: str, year: int) -> set[tuple[int, str]]:
+        """Fetch the (folio_number, procedure_description) keys already stored for a case, in one query."""
         try:
             if not case_number or not year:
-                return False
-            
-            folio_number = int(row_data[FOLIO_COLUMN_INDEX]) if row_data[FOLIO_COLUMN_INDEX] and row_data[FOLIO_COLUMN_INDEX].isdigit() else 0
-            procedure_description = row_data[DESC_TRAMITE_INDEX] if len(row_data) > DESC_TRAMITE_INDEX else ""
-            
-            session = next(get_session())
-            try:
-                existing_folio = session.exec(
-                    select(PJUDFolio).where(
-                        PJUDFolio.folio_number == folio_number,
-                        PJUDFolio.case_number == case_number,
-                        PJUDFolio.year == year,
-                        PJUDFolio.procedure_description == procedure_description
-                    )
-                ).first()
-                
-                return existing_folio is not None
-                
-            finally:
-                session.close()
-                
-        except Exception as e:
-            logging.error(f">>> ❌ Error verificando folio existente: {e}")
-            return False
-    
-    async def process_downloaded_pdfs(self, downloaded_pdfs: list[dict], case_id: str) -> None:
-        """Process all downloaded PDFs in correct legal order: DISPATCH_RESOLUTION first, then DEMAND_EXCEPTION."""
-        if not downloaded_pdfs:
-            logging.info(">>> ℹ️ No hay PDFs para procesar")
-            return
-        
-        # Separar PDFs por tipo de hito para procesar en orden correcto
-        dispatch_resolution_pdfs = [pdf for pdf in downloaded_pdfs if pdf['milestone_type'] == 'hito3']
-        demand_exception_pdfs = [pdf for pdf in downloaded_pdfs if pdf['milestone_type'] == 'hito5']
-        
-        logging.info(f">>> 📋 PDFs DISPATCH_RESOLUTION (Hito 3): {len(dispatch_resolution_pdfs)}")
-        logging.info(f">>> 📋 PDFs DEMAND_EXCEPTION (Hito 5): {len(demand_exception_pdfs)}")
-        
-        # PASO 1: Procesar DISPATCH_RESOLUTION primero (Hito 3)
-        if dispatch_resolution_pdfs:
-            logging.info(f">>> 🎯 PASO 1: PROCESANDO DISPATCH_RESOLUTION (Hito 3) - {len(dispatch_resolution_pdfs)} PDFs")
-            for i, pdf_info in enumerate(dispatch_resolution_pdfs, 1):
-                await self._process_single_pdf(pdf_info, case_id, i, len(dispatch_resolution_pdfs), "DISPATCH_RESOLUTION")
-        
-        # PASO 2: Procesar DEMAND_EXCEPTION después (Hito 5)
-        if demand_exception_pdfs:
-            logging.info(f">>> 🎯 PASO 2: PROCESANDO DEMAND_EXCEPTION (Hito 5) - {len(demand_exception_pdfs)} PDFs")
-            for i, pdf_info in enumerate(demand_exception_pdfs, 1):
-                await self._process_single_pdf(pdf_info, case_id, i, len(demand_exception_pdfs), "DEMAND_EXCEPTION")
-        
-        logging.info(f">>> 🎯 PROCESAMIENTO DE PDFs COMPLETADO")
-    
-    async def process_events_without_pdf(self, events_without_pdf: list[dict], case_id: str) -> None:
-        """Process events that don't require PDF processing (Hitos 4, 6, 7)."""
-        if not events_without_pdf:
-            logging.info(">>> ℹ️ No hay eventos sin PDF para procesar")
-            return
-        
-        # Separar eventos por tipo
-        hito4_events = [event for event in events_without_pdf if event['milestone_type'] == 'hito4']
-        hito6_events = [event for event in events_without_pdf if event['milestone_type'] == 'hito6']
-        hito7a_events = [event for event in events_without_pdf if event['milestone_type'] == 'hito7a']
-        hito7b_events = [event for event in events_without_pdf if event['milestone_type'] == 'hito7b']
-        
-        logging.info(f">>> 📋 Eventos Hito 4: {len(hito4_events)}")
-        logging.info(f">>> 📋 Eventos Hito 6: {len(hito6_events)}")
-        logging.info(f">>> 📋 Eventos Hito 7a: {len(hito7a_events)}")
-        logging.info(f">>> 📋 Eventos Hito 7b: {len(hito7b_events)}")
-        
-        # Procesar Hito 4 (NOTIFICATION - Evacua traslado)
-        if hito4_events:
-            logging.info(f">>> 🎯 PROCESANDO HITO 4 (NOTIFICATION) - {len(hito4_events)} eventos")
-            for i, event_info in enumerate(hito4_events, 1):
-                await self._process_notification_event(event_info, case_id, i, len(hito4_events))
-        
-        # Procesar Hito 6 (TRANSLATION_EVACUATION - Evacua traslado)
-        if hito6_events:
-            logging.info(f">>> 🎯 PROCESANDO HITO 6 (TRANSLATION_EVACUATION) - {len(hito6_events)} eventos")
-            for i, event_info in enumerate(hito6_events, 1):
-                await self._process_translation_evacuation_event(event_info, case_id, i, len(hito6_events))
-        
-        # Procesar Hito 7a (TRIAL_START - Recibe la causa a prueba)
-        if hito7a_events:
-            logging.info(f">>> 🎯 PROCESANDO HITO 7a (TRIAL_START) - {len(hito7a_events)} eventos")
-            for i, event_info in enumerate(hito7a_events, 1):
-                await self._process_trial_start_event(event_info, case_id, i, len(hito7a_events))
-        
-        # Procesar Hito 7b (SENTENCE - Sentencia)
-        if hito7b_events:
-            logging.info(f">>> 🎯 PROCESANDO HITO 7b (SENTENCE) - {len(hito7b_events)} eventos")
-            for i, event_info in enumerate(hito7b_events, 1):
-                await self._process_sentence_event(event_info, case_id, i, len(hito7b_events))
-        
-        logging.info(f">>> 🎯 PROCESAMIENTO DE EVENTOS SIN PDF COMPLETADO")
-    
-    async def _process_sentence_event(self, event_info: dict, case_id: str, index: int, total: int) -> None:
-        """Process sentence event without PDF processing."""
-        try:
-            logging.info(f">>> 🔄 PROCESANDO SENTENCE {index}/{total}: {event_info['milestone_type'].upper()}")
-            logging.info(f">>> 📄 Descripción: {event_info.get('description', 'N/A')}")
-            logging.info(f">>> 🆔 Case ID: {case_id}")
-            logging.info(f">>> 🎯 Tipo de hito: {event_info['milestone_type']}")
+                return set()
             
             session = next(get_session())
-            logging.info(f">>> 🗄️ Conexión a BD establecida")
-            
             try:
-                logging.info(f">>> 🔍 PASO 1: Obteniendo caso de la BD...")
-                case = self._get_case_by_id(session, case_id)
-                if not case:
-                    logging.error(f">>> ❌ PASO 1 FALLIDO: No se encontró el caso {case_id}")
-                    return
-                logging.info(f">>> ✅ PASO 1 EXITOSO: Caso encontrado - {case.title}")
-                
-                logging.info(f">>> 🔍 PASO 2: Creando evento SENTENCE...")
-                procedure_date_str = event_info.get('procedure_date')
-                procedure_date = parse_procedure_date(procedure_date_str) if procedure_date_str else None
-                event = self._create_sentence_event(session, case, procedure_date)
-                
-                if not event:
-                    logging.error(f">>> ❌ PASO 2 FALLIDO: No se pudo crear el evento SENTENCE")
-                    return
-                logging.info(f">>> ✅ PASO 2 EXITOSO: Evento SENTENCE creado - ID: {event.id}")
-                
-                logging.info(f">>> ✅ SENTENCE {index} procesado exitosamente")
-                
-            except Exception as e:
-                logging.error(f">>> ❌ ERROR PROCESANDO SENTENCE {index}/{total}:")
-                logging.error(f">>>    🚨 Error: {e}")
-                logging.error(f">>>    📄 Descripción: {event_info.get('description', 'unknown')}")
-                logging.error(f">>>    🎯 Milestone: {event_info.get('milestone_type', 'unknown')}")
-                logging.error(f">>>    🆔 Case ID: {event_info.get('case_id', 'unknown')}")
-                logging.error(f">>> ⚠️ Continuando con siguiente evento...")
+                return set(self._get_existing_folios(session, case_number, year))
             finally:
                 session.close()
                 
         except Exception as e:
-            logging.error(f">>> ❌ ERROR CRÍTICO PROCESANDO SENTENCE {index}/{total}:")
-            logging.error(f">>>    🚨 Error: {e}")
-            logging.error(f">>>    📄 Descripción: {event_info.get('description', 'unknown')}")
-            logging.error(f">>>    🎯 Milestone: {event_info.get('milestone_type', 'unknown')}")
-            logging.error(f">>>    🆔 Case ID: {event_info.get('case_id', 'unknown')}")
-            logging.error(f">>> ⚠️ Continuando con siguiente evento...")
-    
-    async def _process_trial_start_event(self, event_info: dict, case_id: str, index: int, total: int) -> None:
-        """Process trial start event (Hito 7a - Recibe la causa a prueba) without PDF processing."""
+            logging.error(f">>> ❌ Error obteniendo folios existentes: {e}")
+            return set()
+
+    def _get_sync_state(self, case_number: str, year: int) -> tuple[int | None, int]:
+        """Fetch the highest stored folio of a case and how many Hito 4 folios it has, in one query."""
+        if not case_number or not year:
+            return None, 0
+        session = next(get_session())
         try:
-            logging.info(f">>> 🔄 PROCESANDO TRIAL_START {index}/{total}: {event_info['milestone_type'].upper()}")
-            logging.info(f">>> 📄 Descripción: {event_info.get('description', 'N/A')}")
-            logging.info(f">>> 🆔 Case ID: {case_id}")
-            logging.info(f">>> 🎯 Tipo de hito: {event_info['milestone_type']}")
-            
-            session = next(get_session())
-            logging.info(f">>> 🗄️ Conexión a BD establecida")
-            
-            try:
-                logging.info(f">>> 🔍 PASO 1: Obteniendo caso de la BD...")
-                case = self._get_case_by_id(session, case_id)
-                if not case:
-                    logging.error(f">>> ❌ PASO 1 FALLIDO: No se encontró el caso {case_id}")
-                    return
-                logging.info(f">>> ✅ PASO 1 EXITOSO: Caso encontrado - {case.title}")
-                
-                logging.info(f">>> 🔍 PASO 2: Creando evento TRIAL_START...")
-                procedure_date_str = event_info.get('procedure_date')
-                procedure_date = parse_procedure_date(procedure_date_str) if procedure_date_str else None
-                event = self._create_trial_start_event(session, case, procedure_date)
-                
-                if not event:
-                    logging.error(f">>> ❌ PASO 2 FALLIDO: No se pudo crear el evento TRIAL_START")
-                    return
-                logging.info(f">>> ✅ PASO 2 EXITOSO: Evento TRIAL_START creado - ID: {event.id}")
-                
-                logging.info(f">>> ✅ TRIAL_START {index} procesado exitosamente")
-                
-            except Exception as e:
-                logging.error(f">>> ❌ ERROR PROCESANDO TRIAL_START {index}/{total}:")
-                logging.error(f">>>    🚨 Error: {e}")
-                logging.error(f">>>    📄 Descripción: {event_info.get('description', 'unknown')}")
-                logging.error(f">>>    🎯 Milestone: {event_info.get('milestone_type', 'unknown')}")
-                logging.error(f">>>    🆔 Case ID: {event_info.get('case_id', 'unknown')}")
-                logging.error(f">>> ⚠️ Continuando con siguiente evento...")
-            finally:
-                session.close()
-                
-        except Exception as e:
-            logging.error(f">>> ❌ ERROR CRÍTICO PROCESANDO TRIAL_START {index}/{total}:")
-            logging.error(f">>>    🚨 Error: {e}")
-            logging.error(f">>>    📄 Descripción: {event_info.get('description', 'unknown')}")
-            logging.error(f">>>    🎯 Milestone: {event_info.get('milestone_type', 'unknown')}")
-            logging.error(f">>>    🆔 Case ID: {event_info.get('case_id', 'unknown')}")
-            logging.error(f">>> ⚠️ Continuando con siguiente evento...")
+            last_folio, hito_4_count = session.exec(
+                select(
+                    func.max(PJUDFolio.folio_number),
+                    func.count().filter(PJUDFolio.milestone.like("Hito 4%")),
+                ).where(
+                    PJUDFolio.case_number == case_number,
+                    PJUDFolio.year == year,
+                )
+            ).one()
+            return last_folio, hito_4_count
+        finally:
+            session.close()
+
+    def _get_row_folio_key(self, row_data: list[str]) -> tuple[int, str]:
+        """Build the (folio_number, procedure_description) key of a scraped row."""
+        folio_number = int(row_data[FOLIO_COLUMN_INDEX]) if row_data[FOLIO_COLUMN_INDEX] and row_data[FOLIO_COLUMN_INDEX].isdigit() else 0
+        procedure_description = row_data[DESC_TRAMITE_INDEX] if len(row_data) > DESC_TRAMITE_INDEX else ""
+        return folio_number, procedure_description
     
-    async def _process_notification_event(self, event_info: dict, case_id: str, index: int, total: int) -> None:
-        """Process NOTIFICATION event (Hito 4 - Notificación) without PDF processing."""
+    async def process_milestone_documents(self, milestone_events: list[dict], case_id: str, debug: bool = False) -> None:
+        """
+        Creates the case events of the scraped milestones.
+
+        The document extraction (OCR and LLM) of every milestone PDF runs concurrently, bounded by
+        `PJUD_PROCESSING_CONCURRENCY`, while events are created and committed one by one in legal milestone
+        order on a single session. All state is local to the call, so several cases can be processed at once.
+        """
+        if not case_id:
+            logging.warning(">>> ⚠️ Sin Case ID, no se crean eventos para los hitos")
+            for event_info in milestone_events:
+                if event_info.get('pdf_path'):
+                    self._cleanup_pdf_file(event_info['pdf_path'], "procesamiento sin caso")
+            return
+
+        ordered_events = sorted(
+            milestone_events,
+            key=lambda event_info: MILESTONE_PROCESSING_ORDER.index(event_info['milestone_type'])
+            if event_info['milestone_type'] in MILESTONE_PROCESSING_ORDER else len(MILESTONE_PROCESSING_ORDER),
+        )
+        logging.info(f">>> 📋 Eventos con PDF: {len([event for event in ordered_events if event.get('pdf_path')])}")
+        logging.info(f">>> 📋 Eventos sin PDF: {len([event for event in ordered_events if not event.get('pdf_path')])}")
+
+        session = next(get_session())
+        extractions: dict[int, asyncio.Task] = {}
         try:
-            logging.info(f">>> 🔄 PROCESANDO NOTIFICATION {index}/{total}: {event_info['milestone_type'].upper()}")
-            logging.info(f">>> 📄 Descripción: {event_info.get('description', 'N/A')}")
-            logging.info(f">>> 🆔 Case ID: {case_id}")
-            logging.info(f">>> 🎯 Tipo de hito: {event_info['milestone_type']}")
-            
-            session = next(get_session())
-            logging.info(f">>> 🗄️ Conexión a BD establecida")
-            
-            try:
-                logging.info(f">>> 🔍 PASO 1: Obteniendo caso de la BD...")
-                case = self._get_case_by_id(session, case_id)
-                if not case:
-                    logging.error(f">>> ❌ PASO 1 FALLIDO: No se encontró el caso {case_id}")
-                    return
-                logging.info(f">>> ✅ PASO 1 EXITOSO: Caso encontrado - {case.title}")
-                
-                logging.info(f">>> 🔍 PASO 2: Creando evento NOTIFICATION...")
+            case = self._get_case_by_id(session, case_id)
+            if not case:
+                for event_info in ordered_events:
+                    if event_info.get('pdf_path'):
+                        self._cleanup_pdf_file(event_info['pdf_path'], "caso no encontrado")
+                return
+
+            # La extracción no usa la BD, se lanza para todos los PDFs antes de crear el primer evento. Cada hilo
+            # recibe una copia del caso fuera de la sesión, que este bucle sigue usando para commits y rollbacks
+            semaphore = asyncio.Semaphore(Config.PJUD_PROCESSING_CONCURRENCY)
+            for index, event_info in enumerate(ordered_events):
+                if event_info.get('pdf_path'):
+                    extractions[index] = asyncio.create_task(
+                        self._extract_milestone_document(semaphore, Case(**case.model_dump()), event_info, debug)
+                    )
+
+            for index, event_info in enumerate(ordered_events, 1):
+                milestone_type = event_info['milestone_type']
+                pdf_path = event_info.get('pdf_path')
                 procedure_date_str = event_info.get('procedure_date')
                 procedure_date = parse_procedure_date(procedure_date_str) if procedure_date_str else None
-                description = event_info.get('description')
-                event = self._create_notification_event(session, case, procedure_date, description)
-                
-                if not event:
-                    logging.error(f">>> ❌ PASO 2 FALLIDO: No se pudo crear el evento NOTIFICATION")
-                    return
-                logging.info(f">>> ✅ PASO 2 EXITOSO: Evento NOTIFICATION creado - ID: {event.id}")
-                
-                logging.info(f">>> ✅ NOTIFICATION {index} procesado exitosamente")
-                
-            except Exception as e:
-                logging.error(f">>> ❌ ERROR PROCESANDO NOTIFICATION {index}/{total}:")
-                logging.error(f">>>    🚨 Error: {e}")
-                logging.error(f">>>    📄 Descripción: {event_info.get('description', 'unknown')}")
-                logging.error(f">>>    🎯 Milestone: {event_info.get('milestone_type', 'unknown')}")
-                logging.error(f">>>    🆔 Case ID: {event_info.get('case_id', 'unknown')}")
-                logging.error(f">>> ⚠️ Continuando con siguiente evento...")
-            finally:
-                session.close()
-                
-        except Exception as e:
-            logging.error(f">>> ❌ ERROR CRÍTICO PROCESANDO NOTIFICATION {index}/{total}:")
-            logging.error(f">>>    🚨 Error: {e}")
-            logging.error(f">>>    📄 Descripción: {event_info.get('description', 'unknown')}")
-            logging.error(f">>>    🎯 Milestone: {event_info.get('milestone_type', 'unknown')}")
-            logging.error(f">>>    🆔 Case ID: {event_info.get('case_id', 'unknown')}")
-            logging.error(f">>> ⚠️ Continuando con siguiente evento...")
-    
-    async def _process_translation_evacuation_event(self, event_info: dict, case_id: str, index: int, total: int) -> None:
-        """Process TRANSLATION_EVACUATION event (Hito 6 - Evacua traslado) without PDF processing."""
-        try:
-            logging.info(f">>> 🔄 PROCESANDO TRANSLATION_EVACUATION {index}/{total}: {event_info['milestone_type'].upper()}")
-            logging.info(f">>> 📄 Descripción: {event_info.get('description', 'N/A')}")
-            logging.info(f">>> 🆔 Case ID: {case_id}")
-            logging.info(f">>> 🎯 Tipo de hito: {event_info['milestone_type']}")
-            
-            session = next(get_session())
-            logging.info(f">>> 🗄️ Conexión a BD establecida")
-            
+                logging.info(f">>> 🔄 PROCESANDO EVENTO {index}/{len(ordered_events)}: {milestone_type.upper()}")
+                logging.info(f">>> 📄 Descripción: {event_info.get('description', 'N/A')}")
+                try:
+                    event = None
+                    if pdf_path:
+                        information = await extractions[index - 1]
+                        if information is None:
+                            continue
+                        if milestone_type == 'hito3':
+                            event = self._create_dispatch_resolution_event(session, case, information, pdf_path, procedure_date)
+                        elif milestone_type == 'hito5':
+                            event = self._create_demand_exception_event(session, case, information, pdf_path, procedure_date)
+                        if event:
+                            self._log_suggestions(session, event)
+                    elif milestone_type == 'hito4':
+                        event = self._create_notification_event(session, case, procedure_date, event_info.get('description'))
+                    elif milestone_type == 'hito6':
+                        event = self._create_translation_evacuation_event(session, case, procedure_date)
+                    elif milestone_type == 'hito7a':
+                        event = self._create_trial_start_event(session, case, procedure_date)
+                    elif milestone_type == 'hito7b':
+                        event = self._create_sentence_event(session, case, procedure_date)
+                    else:
+                        logging.warning(f">>> ⚠️ Tipo de hito no soportado: {milestone_type}")
+                        continue
+
+                    if event:
+                        logging.info(f">>> ✅ Evento {milestone_type.upper()} creado - ID: {event.id}")
+                    else:
+                        logging.error(f">>> ❌ No se pudo crear el evento {milestone_type.upper()}")
+                except Exception as e:
+                    logging.error(f">>> ❌ ERROR PROCESANDO EVENTO {index}/{len(ordered_events)}:")
+                    logging.error(f">>>    🚨 Error: {e}")
+                    logging.error(f">>>    🎯 Milestone: {milestone_type}")
+                    logging.error(f">>>    🆔 Case ID: {case_id}")
+                    logging.error(f">>> ⚠️ Continuando con siguiente evento...")
+                    session.rollback()
+                finally:
+                    if pdf_path:
+                        self._cleanup_pdf_file(pdf_path)
+        finally:
+            # Si el procesamiento se interrumpe, las extracciones pendientes no deben seguir en segundo plano
+            for task in extractions.values():
+                if not task.done():
+                    task.cancel()
+            session.close()
+
+    async def _extract_milestone_document(self, semaphore: asyncio.Semaphore, case: Case, event_info: dict, debug: bool = False):
+        """
+        Extracts the structured information of a milestone PDF in a worker thread, or returns None on failure.
+        `case` must be a detached copy, since it is read from the worker thread.
+        """
+        milestone_type = event_info['milestone_type']
+        pdf_path = event_info['pdf_path']
+        if milestone_type == 'hito3':
+            event_manager = DispatchResolutionEventManager(case)
+        elif milestone_type == 'hito5':
+            event_manager = DemandExceptionEventManager(case)
+        else:
+            logging.warning(f">>> ⚠️ Tipo de hito con PDF no soportado: {milestone_type}")
+            return None
+
+        async with semaphore:
             try:
-                logging.info(f">>> 🔍 PASO 1: Obteniendo caso de la BD...")
-                case = self._get_case_by_id(session, case_id)
-                if not case:
-                    logging.error(f">>> ❌ PASO 1 FALLIDO: No se encontró el caso {case_id}")
-                    return
-                logging.info(f">>> ✅ PASO 1 EXITOSO: Caso encontrado - {case.title}")
-                
-                logging.info(f">>> 🔍 PASO 2: Creando evento TRANSLATION_EVACUATION...")
-                procedure_date_str = event_info.get('procedure_date')
-                procedure_date = parse_procedure_date(procedure_date_str) if procedure_date_str else None
-                event = self._create_translation_evacuation_event(session, case, procedure_date)
-                
-                if not event:
-                    logging.error(f">>> ❌ PASO 2 FALLIDO: No se pudo crear el evento TRANSLATION_EVACUATION")
-                    return
-                logging.info(f">>> ✅ PASO 2 EXITOSO: Evento TRANSLATION_EVACUATION creado - ID: {event.id}")
-                
-                logging.info(f">>> ✅ TRANSLATION_EVACUATION {index} procesado exitosamente")
-                
+                logging.info(f">>> 🔍 Extrayendo información del PDF ({milestone_type}): {pdf_path}")
+                if debug:
+                    logging.info(f">>> 🐛 Tamaño del PDF: {os.path.getsize(pdf_path)} bytes")
+                information = await asyncio.to_thread(event_manager.extract_from_file_path, pdf_path)
+                logging.info(f">>> ✅ Información extraída del PDF ({milestone_type}): {pdf_path}")
+                return information
             except Exception as e:
-                logging.error(f">>> ❌ ERROR PROCESANDO TRANSLATION_EVACUATION {index}/{total}:")
+                logging.error(f">>> ❌ ERROR EXTRAYENDO PDF ({milestone_type}):")
                 logging.error(f">>>    🚨 Error: {e}")
-                logging.error(f">>>    📄 Descripción: {event_info.get('description', 'unknown')}")
-                logging.error(f">>>    🎯 Milestone: {event_info.get('milestone_type', 'unknown')}")
-                logging.error(f">>>    🆔 Case ID: {event_info.get('case_id', 'unknown')}")
-                logging.error(f">>> ⚠️ Continuando con siguiente evento...")
-            finally:
-                session.close()
-                
-        except Exception as e:
-            logging.error(f">>> ❌ ERROR CRÍTICO PROCESANDO TRANSLATION_EVACUATION {index}/{total}:")
-            logging.error(f">>>    🚨 Error: {e}")
-            logging.error(f">>>    📄 Descripción: {event_info.get('description', 'unknown')}")
-            logging.error(f">>>    🎯 Milestone: {event_info.get('milestone_type', 'unknown')}")
-            logging.error(f">>>    🆔 Case ID: {event_info.get('case_id', 'unknown')}")
-            logging.error(f">>> ⚠️ Continuando con siguiente evento...")
-    
-    async def _process_single_pdf(self, pdf_info: dict, case_id: str, index: int, total: int, event_type: str) -> None:
-        """Process a single PDF for the specified event type."""
-        try:
-            logging.info(f">>> 🔄 PROCESANDO PDF {index}/{total}: {pdf_info['milestone_type'].upper()}")
-            logging.info(f">>> 📄 Archivo: {pdf_info['pdf_path']}")
-            logging.info(f">>> 📝 Descripción: {pdf_info['description']}")
-            logging.info(f">>> 🔄 PROCESANDO PDF PARA {event_type}-EVENT")
-            logging.info(f">>> 📋 Flujo: {pdf_info['milestone_type']} → {event_type} → Sugerencias")
-            logging.info(f">>> 📄 Archivo PDF: {pdf_info['pdf_path']}")
-            logging.info(f">>> 🆔 Case ID: {case_id}")
-            logging.info(f">>> 🎯 Tipo de hito: {pdf_info['milestone_type']}")
-            logging.info(f">>> 🐛 Debug mode: False")
-            
-            # Guardar pdf_info en el objeto para acceso posterior
-            self._current_pdf_info = pdf_info
-            
-            await self.process_downloaded_pdf(
-                pdf_info['pdf_path'], 
-                pdf_info['case_id'], 
-                pdf_info['milestone_type'], 
-                debug=False
-            )
-            logging.info(f">>> ✅ PDF {index} procesado exitosamente")
-            
-        except Exception as e:
-            logging.error(f">>> ❌ ERROR PROCESANDO PDF {index}/{total}:")
-            logging.error(f">>>    🚨 Error: {e}")
-            logging.error(f">>>    📄 Archivo: {pdf_info.get('pdf_path', 'unknown')}")
-            logging.error(f">>>    📝 Descripción: {pdf_info.get('description', 'unknown')}")
-            logging.error(f">>>    🎯 Milestone: {pdf_info.get('milestone_type', 'unknown')}")
-            logging.error(f">>>    🆔 Case ID: {pdf_info.get('case_id', 'unknown')}")
-            logging.error(f">>>    🎯 Event Type: {event_type}")
-            logging.error(f">>> ⚠️ Continuando con siguiente PDF...")
-    
+                logging.error(f">>>    📄 Archivo: {pdf_path}")
+                return None
+
     def _get_case_by_id(self, session: Session, case_id: str) -> Optional[Case]:
         """Get case by ID from database."""
         case = session.exec(select(Case).where(Case.id == case_id)).first()
@@ -1443,8 +1343,8 @@ class PJUDScrapper:
         logging.info(f">>> ✅ Case encontrado: {case.title}")
         return case
     
-    def _create_demand_exception_event(self, session: Session, case: Case, pdf_path: str, procedure_date: date = None) -> Optional[CaseEvent]:
-        """Create demand exception event from PDF."""
+    def _create_demand_exception_event(self, session: Session, case: Case, information, pdf_path: str, procedure_date: date = None) -> Optional[CaseEvent]:
+        """Create demand exception event from the information already extracted from its PDF."""
         try:
             logging.info(f">>> 🔧 DEMAND-EXCEPTION-EVENT: Iniciando creación...")
             logging.info(f">>> 📄 PDF: {pdf_path}")
@@ -1456,9 +1356,9 @@ class PJUDScrapper:
             event_manager = DemandExceptionEventManager(case)
             logging.info(f">>> ✅ DEMAND-EXCEPTION: EventManager creado")
             
-            logging.info(f">>> 🔍 DEMAND-EXCEPTION: Extrayendo información del PDF...")
-            information, event = event_manager.create_from_file_path(session, pdf_path, procedure_date)
-            logging.info(f">>> ✅ DEMAND-EXCEPTION: Información extraída y evento creado")
+            logging.info(f">>> 🔍 DEMAND-EXCEPTION: Creando evento...")
+            event = event_manager.create_from_information(session, information, pdf_path, procedure_date)
+            logging.info(f">>> ✅ DEMAND-EXCEPTION: Evento creado")
             logging.info(f">>> 📝 DEMAND-EXCEPTION: Evento ID: {event.id}")
             logging.info(f">>> 📝 DEMAND-EXCEPTION: Título: {event.title}")
             logging.info(f">>> 📝 DEMAND-EXCEPTION: Tipo: {event.type}")
@@ -1483,8 +1383,8 @@ class PJUDScrapper:
             session.rollback()
             return None
     
-    def _create_dispatch_resolution_event(self, session: Session, case: Case, pdf_path: str, procedure_date: date = None) -> Optional[CaseEvent]:
-        """Create dispatch resolution event from PDF."""
+    def _create_dispatch_resolution_event(self, session: Session, case: Case, information, pdf_path: str, procedure_date: date = None) -> Optional[CaseEvent]:
+        """Create dispatch resolution event from the information already extracted from its PDF."""
         try:
             logging.info(f">>> 🔧 DISPATCH-RESOLUTION-EVENT: Iniciando creación...")
             logging.info(f">>> 📄 PDF: {pdf_path}")
@@ -1496,9 +1396,9 @@ class PJUDScrapper:
             event_manager = DispatchResolutionEventManager(case)
             logging.info(f">>> ✅ DISPATCH-RESOLUTION: EventManager creado")
             
-            logging.info(f">>> 🔍 DISPATCH-RESOLUTION: Extrayendo información del PDF...")
-            information, event = event_manager.create_from_file_path(session, pdf_path, procedure_date)
-            logging.info(f">>> ✅ DISPATCH-RESOLUTION: Información extraída y evento creado")
+            logging.info(f">>> 🔍 DISPATCH-RESOLUTION: Creando evento...")
+            event = event_manager.create_from_information(session, information, pdf_path, procedure_date)
+            logging.info(f">>> ✅ DISPATCH-RESOLUTION: Evento creado")
             logging.info(f">>> 📝 DISPATCH-RESOLUTION: Evento ID: {event.id}")
             logging.info(f">>> 📝 DISPATCH-RESOLUTION: Título: {event.title}")
             logging.info(f">>> 📝 DISPATCH-RESOLUTION: Tipo: {event.type}")
@@ -1716,78 +1616,3 @@ class PJUDScrapper:
                 logging.warning(f">>> ⚠️ PDF no encontrado para eliminar: {pdf_path}")
         except Exception as cleanup_error:
             logging.error(f">>> ❌ Error al eliminar PDF después de {context}: {cleanup_error}")
-    
-    async def process_downloaded_pdf(self, pdf_path: str, case_id: str, milestone_type: str, debug: bool = False):
-        """Process the downloaded PDF to create event and suggestions based on milestone type."""
-        if milestone_type == "hito3":
-            logging.info(f">>> 🔄 PROCESANDO PDF PARA DISPATCH-RESOLUTION-EVENT")
-            logging.info(f">>> 📋 Flujo: Hito 3 → Dispatch Resolution → Sugerencias")
-        else:
-            logging.info(f">>> 🔄 PROCESANDO PDF PARA DEMAND-EXCEPTION-EVENT")
-            logging.info(f">>> 📋 Flujo: Hito 5 → Demand Exception → Sugerencias")
-        
-        logging.info(f">>> 📄 Archivo PDF: {pdf_path}")
-        logging.info(f">>> 🆔 Case ID: {case_id}")
-        logging.info(f">>> 🎯 Tipo de hito: {milestone_type}")
-        logging.info(f">>> 🐛 Debug mode: {debug}")
-        
-        try:
-            session = next(get_session())
-            logging.info(f">>> 🗄️ Conexión a BD establecida")
-            
-            try:
-                logging.info(f">>> 🔍 PASO 1: Obteniendo caso de la BD...")
-                case = self._get_case_by_id(session, case_id)
-                if not case:
-                    logging.error(f">>> ❌ PASO 1 FALLIDO: No se encontró el caso {case_id}")
-                    return
-                logging.info(f">>> ✅ PASO 1 EXITOSO: Caso encontrado - {case.title}")
-                
-                logging.info(f">>> 🔍 PASO 2: Creando evento...")
-                # Extraer procedure_date del pdf_info si está disponible
-                procedure_date_str = getattr(self, '_current_pdf_info', {}).get('procedure_date')
-                procedure_date = parse_procedure_date(procedure_date_str) if procedure_date_str else None
-                
-                if procedure_date:
-                    logging.info(f">>> 📅 Procedure Date extraído: {procedure_date}")
-                else:
-                    logging.info(f">>> 📅 Procedure Date: No disponible o no válido")
-                
-                if milestone_type == "hito3":
-                    logging.info(f">>> 📝 Creando evento DISPATCH_RESOLUTION...")
-                    event = self._create_dispatch_resolution_event(session, case, pdf_path, procedure_date)
-                else:
-                    logging.info(f">>> 📝 Creando evento DEMAND_EXCEPTION...")
-                    event = self._create_demand_exception_event(session, case, pdf_path, procedure_date)
-                
-                if not event:
-                    logging.error(f">>> ❌ PASO 2 FALLIDO: No se pudo crear el evento")
-                    return
-                logging.info(f">>> ✅ PASO 2 EXITOSO: Evento creado - ID: {event.id}, Tipo: {event.type}")
-                
-                logging.info(f">>> 🔍 PASO 3: Verificando sugerencias generadas...")
-                self._log_suggestions(session, event)
-
-                logging.info(f">>> 🔍 PASO 4: Limpiando archivo PDF...")
-                self._cleanup_pdf_file(pdf_path, "procesamiento")
-                
-                logging.info(f">>> 🎯 PROCESAMIENTO COMPLETADO EXITOSAMENTE")
-                logging.info(f">>> 📊 RESUMEN FINAL:")
-                logging.info(f">>>    ✅ Evento creado: {event.type} (ID: {event.id})")
-                logging.info(f">>>    ✅ PDF procesado: {pdf_path}")
-                logging.info(f">>>    ✅ Caso asociado: {case.title} (ID: {case.id})")
-                
-            finally:
-                session.close()
-                logging.info(f">>> 🔌 Conexión a BD cerrada")
-                
-        except Exception as e:
-            logging.error(f">>> ❌ ERROR CRÍTICO en procesamiento de PDF:")
-            logging.error(f">>>    Error: {e}")
-            logging.error(f">>>    PDF: {pdf_path}")
-            logging.error(f">>>    Case ID: {case_id}")
-            logging.error(f">>>    Milestone: {milestone_type}")
-            if debug:
-                logging.error(f">>> Traceback completo: {traceback.format_exc()}")
-            
-            self._cleanup_pdf_file(pdf_path, "error")
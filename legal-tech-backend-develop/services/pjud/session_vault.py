@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+
+from playwright.async_api import BrowserContext, Page, TimeoutError
+
+from config import Config
+
+
+# Menú lateral de la Oficina Judicial Virtual, solo visible con sesión iniciada
+LOGGED_IN_SELECTOR = "div.list-group-item.pg_menu_lt"
+SESSION_CHECK_TIMEOUT = 5000
+
+
+class PJUDSession:
+    """Authenticated PJUD browser state of one credential."""
+
+    def __init__(self, storage_state: dict, home_url: str, ttl: float) -> None:
+        self.storage_state = storage_state
+        self.home_url = home_url
+        self.expires_at = time.monotonic() + ttl
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+def session_key(rut: str, password: str) -> str:
+    """Key of a credential in the vault. The password is part of it, so a changed password never reuses a session."""
+    return hashlib.sha256(f"{rut}:{password}".encode()).hexdigest()
+
+
+class PJUDSessionVault:
+    """
+    Playwright `storage_state` (cookies and local storage) of the PJUD sessions opened by each credential, kept in
+    memory for `ttl` seconds, so later operations of the same user skip the login flow. A stored session is checked
+    before use and dropped as soon as PJUD no longer accepts it.
+    """
+
+    def __init__(self, ttl: float | None = None, max_entries: int | None = None) -> None:
+        self.ttl = Config.PJUD_SESSION_TTL if ttl is None else ttl
+        self.max_entries = max_entries or Config.PJUD_SESSION_MAX_ENTRIES
+        self._sessions: OrderedDict[str, PJUDSession] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> PJUDSession | None:
+        session = self._sessions.get(key)
+        if session is None:
+            return None
+        if not session.fresh:
+            del self._sessions[key]
+            return None
+        self._sessions.move_to_end(key)
+        return session
+
+    def context_options(self, key: str) -> dict:
+        """Keyword arguments for `Browser.new_context` that restore the stored session of `key`, if any."""
+        session = self.get(key)
+        return {"storage_state": session.storage_state} if session else {}
+
+    def lock(self, key: str) -> asyncio.Lock:
+        """Lock held while logging in, so concurrent operations of one credential do not log in twice."""
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    async def store(self, key: str, context: BrowserContext, page: Page) -> None:
+        self._sessions[key] = PJUDSession(await context.storage_state(), page.url, self.ttl)
+        self._sessions.move_to_end(key)
+        while len(self._sessions) > self.max_entries:
+            evicted_key, _ = self._sessions.popitem(last=False)
+            lock = self._locks.get(evicted_key)
+            if lock is not None and not lock.locked():
+                del self._locks[evicted_key]
+
+    def invalidate(self, key: str) -> None:
+        self._sessions.pop(key, None)
+
+    async def restore(self, key: str, page: Page) -> bool:
+        """
+        Opens the home page of the stored session of `key` on `page`, a page of a context created with
+        `context_options(key)`.
+
+        Returns:
+            bool: Whether PJUD accepted the session. Rejected sessions are removed from the vault
+        """
+        session = self.get(key)
+        if session is None:
+            self.misses += 1
+            return False
+        try:
+            await page.goto(session.home_url, wait_until="domcontentloaded")
+            await page.locator(LOGGED_IN_SELECTOR).first.wait_for(state="visible", timeout=SESSION_CHECK_TIMEOUT)
+            if "login" not in page.url:
+                self.hits += 1
+                logging.info(">>> 🔑 Sesión PJUD reutilizada, se omite el login")
+                return True
+        except TimeoutError:
+            pass
+        except Exception as e:
+            logging.warning(f">>> ⚠️ Error verificando sesión PJUD guardada: {e}")
+        logging.info(">>> 🔑 Sesión PJUD guardada expirada, se iniciará sesión nuevamente")
+        self.invalidate(key)
+        self.misses += 1
+        return False
+
+
+_session_vault: PJUDSessionVault | None = None
+
+
+def get_session_vault() -> PJUDSessionVault:
+    """Returns the PJUD session vault shared by every request."""
+    global _session_vault
+    if _session_vault is None:
+        _session_vault = PJUDSessionVault()
+    return _session_vault
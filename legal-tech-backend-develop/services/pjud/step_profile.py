@@ -0,0 +1,43 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from models.pydantic import PJUDStepTiming
+
+
+class StepProfile:
+    """
+    Wall-clock time spent on each step of a PJUD automation run.
+
+    Steps are timed with `with profile.step("name"):`. A step entered more than once (e.g. one per defendant) adds
+    up its durations under the same name, keeping the order in which steps first ran.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = time.perf_counter()
+        self._durations: dict[str, float] = {}
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._durations[name] = self._durations.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def timings(self) -> list[PJUDStepTiming]:
+        return [PJUDStepTiming(step=name, duration=round(duration, 3)) for name, duration in self._durations.items()]
+
+    def log_summary(self) -> None:
+        """Logs every step with its share of the run, slowest first."""
+        total = self.total
+        logging.info(f">>> ⏱️ [{self.name}] Perfil de tiempos ({total:.2f}s en total):")
+        for name, duration in sorted(self._durations.items(), key=lambda item: item[1], reverse=True):
+            share = duration / total * 100 if total else 0.0
+            logging.info(f">>>    {name}: {duration:.2f}s ({share:.0f}%)")
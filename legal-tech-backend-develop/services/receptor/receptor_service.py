@@ -1,12 +1,13 @@
 import logging
 from uuid import UUID
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 from sqlalchemy.orm import selectinload
 
 from models.api import ReceptorResponse, ReceptorDetailResponse
 from models.api.receptor import TribunalWithCourtInfo
 from models.sql.receptor import Receptor, ReceptorDetail
 from models.sql.tribunal import Tribunal
+from util.pagination import keyset_page
 
 
 def _map_receptors_to_response(receptors: list[Receptor]) -> list[ReceptorResponse]:
@@ -95,6 +96,38 @@ def get_receptors(session: Session, skip: int = 0, limit: int = 10) -> list[Rece
         raise
 
 
+def get_receptors_page(session: Session, cursor: str, limit: int = 10) -> tuple[list[ReceptorResponse], str | None]:
+    """
+    Get a page of receptors after a keyset pagination cursor, ordered by name and id.
+    
+    Args:
+        session: Database session
+        cursor: Cursor of the previous page, empty for the first page
+        limit: Maximum number of records to return
+        
+    Returns:
+        The receptors of the page with tribunal details, and the cursor of the next page (None on the last page)
+        
+    Raises:
+        InvalidCursor: If the cursor cannot be decoded
+    """
+    query = select(Receptor).options(
+        selectinload(Receptor.details)
+        .selectinload(ReceptorDetail.tribunal)
+        .selectinload(Tribunal.court)
+    )
+    # Receptores sin nombre quedan primero, el nombre nulo no es comparable en el cursor
+    receptors, next_cursor = keyset_page(
+        session,
+        query,
+        [func.coalesce(Receptor.name, ""), Receptor.id],
+        lambda receptor: (receptor.name or "", receptor.id),
+        cursor,
+        limit,
+    )
+    return _map_receptors_to_response(receptors), next_cursor
+
+
 def get_receptors_by_tribunal(session: Session, tribunal_id: UUID) -> list[ReceptorResponse]:
     """
     Get all receptors associated with a specific tribunal.
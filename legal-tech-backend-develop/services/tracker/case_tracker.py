@@ -135,10 +135,10 @@ class CaseTracker:
 
             s3 = S3Storage()
             for i, annex in enumerate(annexes):
-                file_content = annex.upload_file.file.read()
                 storage_key = f"case/{new_case.id}/event/{new_case_event.id}/annex_{i}.pdf"
                 try:
-                    s3.save(storage_key, file_content)
+                    annex.upload_file.file.seek(0)
+                    s3.save_stream(storage_key, annex.upload_file.file)
                 except Exception as e:
                     logging.warning(f"Could not store annex in S3: {e}")
                     continue
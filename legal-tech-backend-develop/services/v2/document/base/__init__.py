@@ -8,6 +8,7 @@ from .models import (
     InputBaseModel,
     Metrics,
     OutputBaseModel,
+    PagePruningMetrics,
     Response,
     ResponseList,
 )
@@ -3,6 +3,16 @@ from pydantic import BaseModel, Field, model_validator, field_validator
 from typing import TypeVar, Generic
 
 
+class PagePruningMetrics(BaseModel):
+    """Pre-OCR relevance pruning decision for a file."""
+    total_pages: int = Field(0, description="Pages in the original file")
+    kept_pages: list[int] = Field(default_factory=list, description="0-based pages sent to full OCR and extraction")
+    scores: dict[int, int] = Field(default_factory=dict, description="Keyword hits per scored 0-based page")
+    sampled_pages: list[int] = Field(default_factory=list, description="0-based pages without a native text layer, scored from a low resolution OCR sample")
+    unscored_pages: list[int] = Field(default_factory=list, description="0-based pages that could not be sampled, kept without scoring")
+    time: float = Field(0.0, description="Time spent scoring pages, in seconds")
+
+
 class Metrics(BaseModel):
     """
     Performance metrics for document processing.
@@ -10,6 +20,9 @@ class Metrics(BaseModel):
     Time breakdown:
     - time: Total time for the entire task (includes Textract, OpenAI, and processing overhead)
     - textract_time: Time spent specifically in AWS Textract processing (upload, job execution, result retrieval)
+    - textract_mode: Textract API used to OCR the file ("sync" for single page documents, "async" for S3 jobs)
+    - ocr_backend / ocr_time: OCR engine used to read the file ("textract" or "local") and time spent in it
+    - page_pruning: Pages kept or dropped before OCR by the extractor relevance profile
     - openai_times: Individual call times to OpenAI API (each element is one LLM invocation)
     - text_processing_time: Time spent processing text input (JSON parsing, validation)
     - merge_processing_time: Time spent merging information from multiple sources
@@ -21,6 +34,10 @@ class Metrics(BaseModel):
     text_processing_time: float = Field(0.0, description="Time spent processing text input")
     merge_processing_time: float = Field(0.0, description="Time spent merging information")
     textract_time: float = Field(0.0, description="Time spent in Textract processing (upload, job execution, result retrieval), in seconds")
+    textract_mode: str | None = Field(None, description="Textract API used, either 'sync' (detect_document_text) or 'async' (S3 job)")
+    ocr_backend: str | None = Field(None, description="OCR backend used to read files, either 'textract' or 'local'")
+    ocr_time: float = Field(0.0, description="Time spent in the OCR backend, in seconds")
+    page_pruning: PagePruningMetrics | None = Field(None, description="Pre-OCR page pruning decision")
     openai_times: list[float] = Field(default_factory=list, description="Individual OpenAI call times, in seconds")
     
     @field_validator('openai_times')
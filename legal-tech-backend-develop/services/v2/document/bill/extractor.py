@@ -1,12 +1,14 @@
+from services.loader.file_source import FileSource
 from services.v2.document.generic import GenericExtractor
 from .models import BillExtractorInput, BillExtractorOutput, BillInformation
 
 
 class BillExtractor(GenericExtractor[BillExtractorInput, BillInformation, BillExtractorOutput]):
     """Bill information extractor."""
+    relevance_keywords = ["factura", "rut", "monto", "total", "suma", "valor", "vencimiento", "iva", "emision"]
 
-    def __init__(self, input: BillExtractorInput) -> None:
-        super().__init__(input, BillInformation, BillExtractorOutput, label="BillExtractor")
+    def __init__(self, input: BillExtractorInput, source: FileSource | None = None) -> None:
+        super().__init__(input, BillInformation, BillExtractorOutput, label="BillExtractor", source=source)
 
     def _create_prompt(self, source: str, partial_information: BillInformation | None) -> str:
         prompt = f"""
@@ -1,4 +1,5 @@
 from langchain_core.documents import Document
+from services.loader.file_source import FileSource
 from services.v2.document.generic import GenericExtractor
 from .models import CoopeuchReportExtractorInput, CoopeuchReportExtractorOutput, CoopeuchReportInformation
 
@@ -6,8 +7,8 @@ from .models import CoopeuchReportExtractorInput, CoopeuchReportExtractorOutput,
 class CoopeuchReportExtractor(GenericExtractor[CoopeuchReportExtractorInput, CoopeuchReportInformation, CoopeuchReportExtractorOutput]):
     """COOPEUCH report information extractor."""
 
-    def __init__(self, input: CoopeuchReportExtractorInput) -> None:
-        super().__init__(input, CoopeuchReportInformation, CoopeuchReportExtractorOutput, label="CoopeuchReport")
+    def __init__(self, input: CoopeuchReportExtractorInput, source: FileSource | None = None) -> None:
+        super().__init__(input, CoopeuchReportInformation, CoopeuchReportExtractorOutput, label="CoopeuchReport", source=source)
 
     def _create_prompt(self, source: str, partial_information: CoopeuchReportInformation | None) -> str:
         prompt = f"""
@@ -1,12 +1,14 @@
+from services.loader.file_source import FileSource
 from services.v2.document.generic import GenericExtractor
 from .models import DemandExceptionExtractorInput, DemandExceptionExtractorOutput, DemandExceptionInformation
 
 
 class DemandExceptionExtractor(GenericExtractor[DemandExceptionExtractorInput, DemandExceptionInformation, DemandExceptionExtractorOutput]):
     """Demand exception information extractor."""
+    relevance_keywords = ["excepcion", "opone", "tribunal", "rol", "caratula", "ejecutado", "ejecutante", "demanda", "por tanto"]
 
-    def __init__(self, input: DemandExceptionExtractorInput) -> None:
-        super().__init__(input, DemandExceptionInformation, DemandExceptionExtractorOutput, label="DemandException")
+    def __init__(self, input: DemandExceptionExtractorInput, source: FileSource | None = None) -> None:
+        super().__init__(input, DemandExceptionInformation, DemandExceptionExtractorOutput, label="DemandException", source=source)
 
     def _create_prompt(self, source: str, partial_information: DemandExceptionInformation | None) -> str:
         prompt = f"""
@@ -6,6 +6,8 @@ from .models import (
     DemandTextAnalyzerOutput,
     DemandTextGeneratorInput,
     DemandTextGeneratorOutput,
+    DemandTextQueueAnnex,
+    DemandTextQueueItem,
     DemandTextSenderInput,
     DemandTextSendResponse,
     DemandTextStructure,
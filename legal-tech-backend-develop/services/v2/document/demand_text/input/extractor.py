@@ -1,8 +1,5 @@
 import logging
 import json
-import os
-import shutil
-import tempfile
 import time
 import traceback
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
@@ -268,23 +265,18 @@ class DemandTextInputExtractor(BaseExtractor):
         if file.upload_file is None:
             return index, None, None
 
-        temp_file_path = None
         document: BillExtractorOutput | PromissoryNoteExtractorOutput | None = None
 
         try:
             file_start = time.time()
             filename = file.upload_file.filename if file.upload_file else f"file_{index+1}.pdf"
-            
-            file.upload_file.file.seek(0)
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                shutil.copyfileobj(file.upload_file.file, temp_file)
-                temp_file_path = temp_file.name
 
+            # Each worker reads its own spooled upload, no temporary copy is needed
             if file.document_type == MissingPaymentDocumentType.PROMISSORY_NOTE:
-                extractor = PromissoryNoteExtractor(PromissoryNoteExtractorInput(file_path=temp_file_path))
+                extractor = PromissoryNoteExtractor(PromissoryNoteExtractorInput(), file.upload_file.file)
                 document = extractor.extract()
             elif file.document_type == MissingPaymentDocumentType.BILL:
-                extractor = BillExtractor(BillExtractorInput(file_path=temp_file_path))
+                extractor = BillExtractor(BillExtractorInput(), file.upload_file.file)
                 document = extractor.extract()
             
             file_time = time.time() - file_start
@@ -295,12 +287,6 @@ class DemandTextInputExtractor(BaseExtractor):
             logging.error(f"❌ [ARCHIVO {index+1}] Error procesando documento {filename}: {type(e).__name__}: {e}")
             logging.error(f"  📋 Stack trace: {traceback.format_exc()}")
             return index, None, None
-        finally:
-            if temp_file_path is not None and os.path.exists(temp_file_path):
-                try:
-                    os.remove(temp_file_path)
-                except Exception:
-                    pass
     
         return index, document, file.document_type
 
@@ -1,5 +1,5 @@
 from uuid import UUID
-from pydantic import Field
+from pydantic import BaseModel, Field
 
 from models.pydantic import (
     Analysis,
@@ -8,6 +8,7 @@ from models.pydantic import (
     CurrencyType,
     Defendant,
     MissingPaymentDocumentType,
+    PJUDStepTiming,
     JudicialCollectionSecondaryRequest,
     LegalRepresentative,
     LegalSubject,
@@ -111,6 +112,7 @@ class DemandTextSendResponse(InformationBaseModel):
     message: str = Field(..., description="PJUD Response")
     status: int = Field(..., description="HTTP status code")
     case_id: UUID | None = Field(None, description="Case ID of the created case")
+    timings: list[PJUDStepTiming] | None = Field(None, description="Time spent on each step of the PJUD submission")
 
 
 class DemandTextSenderInput(InputBaseModel):
@@ -120,3 +122,22 @@ class DemandTextSenderInput(InputBaseModel):
     information: DemandTextGeneratorInput = Field(..., description="Demand text information")
     structure: DemandTextStructure = Field(..., description="Demand text structure")
     debug: bool = Field(False, description="Debug mode flag")
+
+
+class DemandTextQueueAnnex(BaseModel):
+    """Annex of a queued demand text."""
+    label: str = Field(..., description="Annex label")
+    file: str = Field(..., description="Filename of the uploaded annex PDF")
+
+
+class DemandTextQueueItem(DemandTextSenderInput):
+    """Demand text queued for submission, referencing its uploaded PDF files by filename."""
+    demand_text_file: str = Field(..., description="Filename of the uploaded demand text PDF")
+    mandate_file: str = Field(..., description="Filename of the uploaded lawyer mandate PDF")
+    contract_file: str | None = Field(None, description="Filename of the uploaded contract PDF")
+    annexes: list[DemandTextQueueAnnex] = Field([], description="Additional annexes", max_length=20)
+    idempotency_key: str | None = Field(None, max_length=64, description="Key identifying the demand, derived from its parties and demand text if not given")
+
+    def referenced_files(self) -> list[str]:
+        files = [self.demand_text_file, self.mandate_file, self.contract_file]
+        return [file for file in files if file] + [annex.file for annex in self.annexes]
@@ -266,11 +266,10 @@ class DispatchResolutionEventManager(
              
             if file_path and not key:   
                 s3 = S3Storage()
-                with open(file_path, "rb") as f:
-                    file_content = f.read()
                 key = f"case/{self.case.id}/event/{new_case_event.id}/annex_0.pdf"
                 try:
-                    s3.save(key, file_content)
+                    with open(file_path, "rb") as f:
+                        s3.save_stream(key, f)
                 except Exception as e:
                     raise ValueError(f"Could not store dispatch resolution in S3: {e}")
             new_document = self._create_document("Resolución despáchese", new_case_event, key, structure)
@@ -1,12 +1,14 @@
+from services.loader.file_source import FileSource
 from services.v2.document.generic import GenericExtractor
 from .models import DispatchResolutionExtractorInput, DispatchResolutionExtractorOutput, DispatchResolutionInformation
 
 
 class DispatchResolutionExtractor(GenericExtractor[DispatchResolutionExtractorInput, DispatchResolutionInformation, DispatchResolutionExtractorOutput]):
     """Dispatch resolution information extractor."""
+    relevance_keywords = ["resolucion", "tribunal", "juzgado", "rol", "proveyendo", "tengase", "despachese", "mandamiento", "caratulado"]
 
-    def __init__(self, input: DispatchResolutionExtractorInput) -> None:
-        super().__init__(input, DispatchResolutionInformation, DispatchResolutionExtractorOutput, label="DispatchResolution")
+    def __init__(self, input: DispatchResolutionExtractorInput, source: FileSource | None = None) -> None:
+        super().__init__(input, DispatchResolutionInformation, DispatchResolutionExtractorOutput, label="DispatchResolution", source=source)
 
     def _create_prompt(self, source: str, partial_information: DispatchResolutionInformation | None) -> str:
         prompt = f"""
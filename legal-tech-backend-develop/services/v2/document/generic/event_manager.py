@@ -82,13 +82,28 @@ class GenericEventManager(BaseEventManager, Generic[StructureType, InputType, In
             file_path: str,
             procedure_date: date | None = None
         ) -> tuple[InformationType, CaseEvent]:
+        information = self.extract_from_file_path(file_path)
+        new_event = self.create_from_information(session, information, file_path, procedure_date)
+        return information, new_event
+
+    def extract_from_file_path(self, file_path: str) -> InformationType:
+        """Extracts the structured information of a file. Does not use the database, so it can run concurrently."""
         extractor_input = self.input_model(file_path=file_path)
         extractor = self.extractor(extractor_input)
         information = extractor.extract()
         if not information.structured_output:
             raise ValueError("Invalid file.")
-        new_event = self._process_information(session, information.structured_output, file_path=file_path, procedure_date=procedure_date)
-        return information.structured_output, new_event
+        return information.structured_output
+
+    def create_from_information(
+            self,
+            session: Session,
+            information: InformationType,
+            file_path: str,
+            procedure_date: date | None = None
+        ) -> CaseEvent:
+        """Creates the case event from information previously extracted from a file."""
+        return self._process_information(session, information, file_path=file_path, procedure_date=procedure_date)
     
     def create_suggestions(
             self,
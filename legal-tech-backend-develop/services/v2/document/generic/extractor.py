@@ -6,8 +6,10 @@ from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from typing import Type, TypeVar, Generic
 
-from services.loader import PdfLoader
-from services.v2.document.base import BaseExtractor, ExtractorInputBaseModel, InformationBaseModel, Metrics, OutputBaseModel
+from config import Config
+from services.loader import PagePruner, PdfLoader
+from services.loader.file_source import FileSource, as_file_path, count_source_pages
+from services.v2.document.base import BaseExtractor, ExtractorInputBaseModel, InformationBaseModel, Metrics, OutputBaseModel, PagePruningMetrics
 
 
 MAX_SOURCE_CHARACTERS = 4096 * 4
@@ -21,9 +23,16 @@ OutputType = TypeVar("OutputType", bound=OutputBaseModel[InformationType])
 class GenericExtractor(BaseExtractor, Generic[InputType, InformationType, OutputType]):
     """Generic document extractor to handle different document types."""
 
-    def __init__(self, input: InputType, information_model: Type[InformationType], output_model: Type[OutputType], label: str) -> None:
+    # Keyword profile used to prune irrelevant pages before OCR, empty to process every page
+    relevance_keywords: list[str] = []
+    # Minimum keyword hits for a page to be considered relevant
+    relevance_min_score: int = 1
+
+    def __init__(self, input: InputType, information_model: Type[InformationType], output_model: Type[OutputType], label: str, source: FileSource | None = None) -> None:
         super().__init__()
         self.input = input
+        # PDF abierto (p. ej. el cuerpo de un UploadFile) leído en vez de input.file_path; no es parte del input serializable
+        self.source = source
         self.output_model = output_model
         self.extractor = self._create_structured_extractor(information_model)
         self.label = label
@@ -35,12 +44,11 @@ class GenericExtractor(BaseExtractor, Generic[InputType, InformationType, Output
         start_time = time.time()
 
         documents: list[Document] = []
-        if file_path := self.input.file_path:
-            # Load documents and capture Textract time
-            loader = PdfLoader(file_path)
-            documents = loader.load()
-            # Get Textract time from loader (captured during parse())
-            metrics.textract_time = round(loader.textract_time, 4)
+        if self.source is not None:
+            # Read the stream directly, without copying it to a temporary file
+            documents = self._load_documents(self.source, metrics)
+        elif file_path := self.input.file_path:
+            documents = self._load_documents(file_path, metrics)
         if content := self.input.content:
             text_splitter = RecursiveCharacterTextSplitter(
                 chunk_size=MAX_SOURCE_CHARACTERS,
@@ -80,6 +88,62 @@ class GenericExtractor(BaseExtractor, Generic[InputType, InformationType, Output
             logging.error(f"  📋 [GenericExtractor] Stack trace: {traceback.format_exc()}")
             raise
 
+    def _load_documents(self, source: FileSource, metrics: Metrics) -> list[Document]:
+        """Loads the PDF pages with OCR, skipping pages pruned by the relevance profile of the extractor."""
+        if self.relevance_keywords and Config.PAGE_PRUNING_ENABLED and count_source_pages(source) >= Config.PAGE_PRUNING_MIN_PAGES:
+            # Page scoring runs in worker processes, which need the file on disk
+            with as_file_path(source) as file_path:
+                return self._load_pruned_documents(file_path, metrics)
+        return self._ocr_documents(source, metrics)
+
+    def _load_pruned_documents(self, file_path: str, metrics: Metrics) -> list[Document]:
+        """Scores pages and only sends the relevant ones to OCR, mapping page numbers back to the original file."""
+        kept_pages: list[int] | None = None
+        try:
+            pruner = PagePruner(self.relevance_keywords, min_score=self.relevance_min_score)
+            total_pages, kept_pages, scores, sampled_pages, unscored_pages = pruner.select_pages(file_path)
+            metrics.page_pruning = PagePruningMetrics(
+                total_pages=total_pages,
+                kept_pages=kept_pages,
+                scores=scores,
+                sampled_pages=sampled_pages,
+                unscored_pages=unscored_pages,
+                time=pruner.time,
+            )
+            if len(kept_pages) == total_pages:
+                kept_pages = None
+        except Exception as pruning_error:
+            logging.warning(f"  ⚠️ [GenericExtractor] No se pudo aplicar poda de páginas, se procesará el archivo completo: {type(pruning_error).__name__}: {pruning_error}")
+            kept_pages = None
+
+        if kept_pages is None:
+            return self._ocr_documents(file_path, metrics)
+
+        subset_path = pruner.write_subset(file_path, kept_pages)
+        try:
+            documents = self._ocr_documents(subset_path, metrics)
+        finally:
+            if os.path.exists(subset_path):
+                os.remove(subset_path)
+        for doc in documents:
+            subset_page = doc.metadata.get("page", 0)
+            doc.metadata["source"] = file_path
+            if subset_page < len(kept_pages):
+                doc.metadata["page"] = kept_pages[subset_page]
+        return documents
+
+    def _ocr_documents(self, source: FileSource, metrics: Metrics) -> list[Document]:
+        """Loads every page of the source with the OCR backend and records its timing in metrics."""
+        # Load documents and capture Textract time
+        loader = PdfLoader(source)
+        documents = loader.load()
+        # Get Textract time from loader (captured during parse())
+        metrics.textract_time = round(loader.textract_time, 4)
+        metrics.textract_mode = loader.textract_mode
+        metrics.ocr_backend = loader.ocr_backend.name
+        metrics.ocr_time = round(loader.ocr_time, 4)
+        return documents
+
     def _create_prompt(self, source: str, partial_information: InformationType | None) -> str:
         """Method to be overridden by subclasses to customize prompt."""
         raise NotImplementedError("Subclasses must implement _create_prompt")
@@ -1,7 +1,4 @@
 import logging
-import os
-import shutil
-import tempfile
 import time
 from fastapi import UploadFile
 
@@ -68,19 +65,11 @@ class PreliminaryMeasureInputExtractor(BaseExtractor):
         return document
 
     def _process_file(self, file: UploadFile) -> CoopeuchReportExtractorOutput | None:
-        temp_file_path = None
         document: CoopeuchReportExtractorOutput | None = None
         try:
-            file.file.seek(0)
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                shutil.copyfileobj(file.file, temp_file)
-                temp_file_path = temp_file.name
-            extractor = CoopeuchReportExtractor(CoopeuchReportExtractorInput(file_path=temp_file_path))
+            extractor = CoopeuchReportExtractor(CoopeuchReportExtractorInput(), file.file)
             document = extractor.extract()
         except Exception as e:
             logging.warning(f"Error processing document {file.filename} ({type(e).__name__}): {e}")
             return None
-        finally:
-            if temp_file_path is not None and os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
         return document
@@ -1,12 +1,14 @@
+from services.loader.file_source import FileSource
 from services.v2.document.generic import GenericExtractor
 from .models import PromissoryNoteExtractorInput, PromissoryNoteExtractorOutput, PromissoryNoteInformation
 
 
 class PromissoryNoteExtractor(GenericExtractor[PromissoryNoteExtractorInput, PromissoryNoteInformation, PromissoryNoteExtractorOutput]):
     """Promissory note information extractor."""
+    relevance_keywords = ["pagare", "suscriptor", "aval", "deudor", "acreedor", "suma", "vencimiento", "interes", "cuotas"]
 
-    def __init__(self, input: PromissoryNoteExtractorInput) -> None:
-        super().__init__(input, PromissoryNoteInformation, PromissoryNoteExtractorOutput, label="PromissoryNote")
+    def __init__(self, input: PromissoryNoteExtractorInput, source: FileSource | None = None) -> None:
+        super().__init__(input, PromissoryNoteInformation, PromissoryNoteExtractorOutput, label="PromissoryNote", source=source)
 
     def _create_prompt(self, source: str, partial_information: PromissoryNoteInformation | None) -> str:
         prompt = f"""
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from collections.abc import Generator
+from typing import BinaryIO
 
 
 class BaseStorage(ABC):
@@ -7,6 +8,10 @@ class BaseStorage(ABC):
     def save(self, filename: str, data: bytes) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def save_stream(self, filename: str, stream: BinaryIO) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     def load_once(self, filename: str) -> bytes:
         raise NotImplementedError
@@ -2,9 +2,11 @@ import logging
 import time
 from collections.abc import Generator
 from contextlib import closing
+from typing import BinaryIO
 from urllib.parse import quote
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import ClientError
 
@@ -13,6 +15,13 @@ from .base_storage import BaseStorage
 
 logger = logging.getLogger(__name__)
 
+# Streams above the threshold are sent as a multipart upload of fixed size parts
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+)
+
 
 class S3Storage(BaseStorage):
     def __init__(self) -> None:
@@ -31,6 +40,10 @@ class S3Storage(BaseStorage):
     def save(self, filename: str, data: bytes) -> None:
         self.client.put_object(Bucket=self.bucket, Key=filename, Body=data)
 
+    def save_stream(self, filename: str, stream: BinaryIO) -> None:
+        """Uploads a binary stream in chunks, without loading the whole file in memory."""
+        self.client.upload_fileobj(stream, self.bucket, filename, Config=UPLOAD_TRANSFER_CONFIG)
+
     def load_once(self, filename: str) -> bytes:
         try:
             with closing(self.client) as client:
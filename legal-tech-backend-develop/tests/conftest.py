@@ -0,0 +1,13 @@
+import os
+import sys
+from pathlib import Path
+
+
+# Los módulos se importan desde la raíz del proyecto, igual que al levantar la API
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# El cliente de OpenAI se crea al importar los servicios y exige una API key aunque los tests no lo usen
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: query plan checks against the local Postgres in DATABASE_URL")
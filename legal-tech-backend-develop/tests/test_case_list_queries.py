@@ -0,0 +1,117 @@
+import asyncio
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from models.pydantic import LegalSubject
+from models.sql import Case, CaseDetail, CaseEvent, CaseEventType, CaseParty, CaseStatus, Court, Litigant, LitigantRole, Tribunal
+from routers.case.case import get_cases
+from util.pagination import TotalMode
+
+
+CASES = 120
+# Página de casos con litigantes, eventos de la página y detalles de la página
+MAX_QUERIES_PER_PAGE = 3
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        court = Court(recepthor_id=uuid4(), name="Corte de Apelaciones de Santiago", code=90)
+        tribunal = Tribunal(recepthor_id=uuid4(), name="1º Juzgado Civil de Santiago", code=259, court_id=court.id)
+        session.add_all([court, tribunal])
+        created_at = datetime(2024, 1, 1)
+        for index in range(CASES):
+            case = Case(
+                title=f"Banco/Deudor {index}",
+                city="Santiago",
+                legal_subject=LegalSubject.PROMISSORY_NOTE_COLLECTION,
+                status=CaseStatus.ACTIVE,
+                created_at=created_at + timedelta(hours=index),
+            )
+            session.add(case)
+            session.add_all([
+                Litigant(name="Banco", rut="97.004.000-5", case_id=case.id, role=LitigantRole.PLAINTIFF),
+                Litigant(name=f"Deudor {index}", rut=f"{index}-9", case_id=case.id, role=LitigantRole.DEFENDANT),
+                CaseDetail(case_id=case.id, year=2024, role=index + 1, court_id=court.id, tribunal_id=tribunal.id),
+            ])
+            for offset, event_type in enumerate((CaseEventType.DEMAND_START, CaseEventType.DISPATCH_RESOLUTION, CaseEventType.NOTIFICATION)):
+                session.add(CaseEvent(
+                    case_id=case.id,
+                    title=event_type.value,
+                    type=event_type,
+                    source=CaseParty.COURT,
+                    target=CaseParty.PLAINTIFFS,
+                    created_at=case.created_at + timedelta(days=offset),
+                ))
+        session.commit()
+    return engine
+
+
+@contextmanager
+def count_queries(engine):
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def list_cases(engine, limit: int, order_by: str | None = None, cursor: str | None = None) -> tuple[dict, list[str]]:
+    with Session(engine) as session, count_queries(engine) as statements:
+        response = asyncio.run(get_cases(
+            skip=0,
+            limit=limit,
+            bank=None,
+            status=None,
+            order_by=order_by,
+            order_direction="asc",
+            cursor=cursor,
+            total=TotalMode.NONE,
+            session=session,
+        ))
+    assert response.status_code == 200
+    return json.loads(response.body), statements
+
+
+@pytest.mark.parametrize("limit", [1, 100])
+@pytest.mark.parametrize("order_by", [None, "title", "events"])
+def test_case_list_query_count(engine, limit, order_by):
+    body, statements = list_cases(engine, limit, order_by)
+
+    assert len(body["cases"]) == limit
+    assert all(len(case["litigants"]) == 2 for case in body["cases"])
+    assert all(case["tribunal"] == "1º Juzgado Civil de Santiago" for case in body["cases"])
+    assert len(statements) <= MAX_QUERIES_PER_PAGE, statements
+
+
+@pytest.mark.parametrize("limit", [1, 100])
+def test_case_list_cursor_query_count(engine, limit):
+    body, statements = list_cases(engine, limit, cursor="")
+
+    assert len(body["cases"]) == limit
+    assert all(len(case["litigants"]) == 2 for case in body["cases"])
+    assert body["next_cursor"] is not None
+    assert len(statements) <= MAX_QUERIES_PER_PAGE, statements
+
+
+def test_case_list_cursor_pages_do_not_overlap(engine):
+    first, _ = list_cases(engine, 100, cursor="")
+    second, _ = list_cases(engine, 100, cursor=first["next_cursor"])
+
+    ids = [case["id"] for case in first["cases"] + second["cases"]]
+    assert len(ids) == len(set(ids)) == CASES
+    assert second["next_cursor"] is None
@@ -0,0 +1,157 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from services.pjud.notebook_table import NotebookDocForm, parse_notebook_table
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "notebook_table.html"
+DOC_COLUMN = 1
+FOLIO_COLUMN = 0
+# Cuaderno sintético para comparar la lectura completa con una resincronización sin folios nuevos
+LARGE_NOTEBOOK_FOLIOS = 2000
+
+NOTEBOOK_ROW = """
+<tr>
+    <td>{folio}</td>
+    <td>
+        <form action="ADIR_871/civil/documentos/docuS.php" method="POST" target="_blank">
+            <input type="hidden" name="dtaDoc" value="eyJhbGciOiJIUzI1NiJ9.folio{folio}.sig">
+            <a href="javascript:void(0);" onclick="this.parentNode.submit();"><i class="fa fa-file-pdf-o fa-lg"></i></a>
+        </form>
+    </td>
+    <td></td><td>Discusión</td><td>Escrito</td><td>Téngase presente</td><td>10/01/2024</td><td>{folio}</td><td></td>
+</tr>
+"""
+
+EMPTY_TABLE = """
+<table class="table table-bordered">
+    <thead><tr><th>Folio</th><th>Doc.</th><th>Anexo</th><th>Etapa</th></tr></thead>
+    <tbody></tbody>
+</table>
+"""
+
+
+@pytest.fixture
+def notebook_html() -> str:
+    return FIXTURE.read_text(encoding="utf-8")
+
+
+def test_parses_headers_rows_and_download_forms(notebook_html):
+    table = parse_notebook_table(notebook_html, DOC_COLUMN, FOLIO_COLUMN)
+
+    assert table.headers == ["Folio", "Doc.", "Anexo", "Etapa", "Trámite", "Desc. Trámite", "Fec. Trámite", "Foja", "Georref."]
+    assert [row[FOLIO_COLUMN] for row in table.rows] == ["5", "4", "3", "2", "1"]
+    assert all(len(row) == len(table.headers) for row in table.rows)
+    assert table.rows[0][5] == "Opone excepciones"
+    # Un <br> dentro de la celda es un salto de línea, como en inner_text()
+    assert table.rows[1][5] == "Receptor certifica notificación\npersonal"
+    assert table.doc_forms[0] == NotebookDocForm(action="ADIR_871/civil/documentos/docuS.php", dta_doc="eyJhbGciOiJIUzI1NiJ9.folio5.sig")
+    assert table.doc_forms[1].action == "ADIR_871/civil/documentos/docuN.php"
+    assert table.reached_known_folio is False
+
+
+def test_empty_table():
+    table = parse_notebook_table(EMPTY_TABLE, DOC_COLUMN, FOLIO_COLUMN)
+
+    assert table.headers == ["Folio", "Doc.", "Anexo", "Etapa"]
+    assert table.rows == []
+    assert table.doc_forms == []
+    assert table.reached_known_folio is False
+
+
+def test_empty_table_with_known_folio():
+    table = parse_notebook_table(EMPTY_TABLE, DOC_COLUMN, FOLIO_COLUMN, stop_at_folio=10)
+
+    assert table.rows == []
+    assert table.reached_known_folio is False
+
+
+def test_row_without_download_form(notebook_html):
+    table = parse_notebook_table(notebook_html, DOC_COLUMN, FOLIO_COLUMN)
+
+    # El folio 3 no tiene documento: la fila se conserva sin formulario y el script de la celda no es texto
+    assert table.rows[2][DOC_COLUMN] == ""
+    assert table.rows[2][5] == "Mero trámite"
+    assert table.doc_forms[2] is None
+    assert len(table.doc_forms) == len(table.rows)
+
+
+def test_form_without_action_or_doc_value():
+    html = """
+    <table>
+        <thead><tr><th>Folio</th><th>Doc.</th></tr></thead>
+        <tbody>
+            <tr><td>2</td><td><form method="POST"><input type="hidden" name="dtaDoc" value="token"></form></td></tr>
+            <tr><td>1</td><td><form action="docuS.php"><input type="hidden" name="dtaDoc" value=""></form></td></tr>
+        </tbody>
+    </table>
+    """
+    table = parse_notebook_table(html, DOC_COLUMN, FOLIO_COLUMN)
+
+    assert [row[FOLIO_COLUMN] for row in table.rows] == ["2", "1"]
+    assert table.doc_forms == [None, None]
+
+
+def test_stops_at_known_folio(notebook_html):
+    table = parse_notebook_table(notebook_html, DOC_COLUMN, FOLIO_COLUMN, stop_at_folio=3)
+
+    # El folio 3 ya está guardado: solo se leen los folios más nuevos
+    assert [row[FOLIO_COLUMN] for row in table.rows] == ["5", "4"]
+    assert len(table.doc_forms) == 2
+    assert table.reached_known_folio is True
+
+
+def test_known_folio_row_is_not_read(notebook_html):
+    table = parse_notebook_table(notebook_html, DOC_COLUMN, FOLIO_COLUMN, stop_at_folio=4)
+
+    # La lectura se detiene en el folio conocido, sin agregar su fila ni su formulario
+    assert [row[FOLIO_COLUMN] for row in table.rows] == ["5"]
+    assert [form.dta_doc for form in table.doc_forms] == ["eyJhbGciOiJIUzI1NiJ9.folio5.sig"]
+    assert table.headers[FOLIO_COLUMN] == "Folio"
+    assert table.reached_known_folio is True
+
+
+def test_known_folio_above_every_row(notebook_html):
+    table = parse_notebook_table(notebook_html, DOC_COLUMN, FOLIO_COLUMN, stop_at_folio=5)
+
+    assert table.rows == []
+    assert table.reached_known_folio is True
+
+
+def test_known_folio_below_every_row(notebook_html):
+    table = parse_notebook_table(notebook_html, DOC_COLUMN, FOLIO_COLUMN, stop_at_folio=0)
+
+    assert len(table.rows) == 5
+    assert table.reached_known_folio is False
+
+
+def large_notebook(folios: int) -> str:
+    rows = "".join(NOTEBOOK_ROW.format(folio=folio) for folio in range(folios, 0, -1))
+    return f"<table><thead><tr><th>Folio</th><th>Doc.</th></tr></thead><tbody>{rows}</tbody></table>"
+
+
+def best_time(parse, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def test_resync_without_new_folios_is_cheap():
+    html = large_notebook(LARGE_NOTEBOOK_FOLIOS)
+
+    full = parse_notebook_table(html, DOC_COLUMN, FOLIO_COLUMN)
+    resync = parse_notebook_table(html, DOC_COLUMN, FOLIO_COLUMN, stop_at_folio=LARGE_NOTEBOOK_FOLIOS)
+    full_time = best_time(lambda: parse_notebook_table(html, DOC_COLUMN, FOLIO_COLUMN))
+    resync_time = best_time(lambda: parse_notebook_table(html, DOC_COLUMN, FOLIO_COLUMN, stop_at_folio=LARGE_NOTEBOOK_FOLIOS))
+
+    print(f"\n{LARGE_NOTEBOOK_FOLIOS} folios: full read {full_time * 1000:.1f} ms, no-change re-sync {resync_time * 1000:.2f} ms")
+    assert len(full.rows) == LARGE_NOTEBOOK_FOLIOS
+    assert resync.rows == [] and resync.doc_forms == []
+    assert resync.reached_known_folio is True
+    # Sin folios nuevos la lectura se detiene en la primera fila en vez de recorrer todo el cuaderno
+    assert resync_time < full_time / 20
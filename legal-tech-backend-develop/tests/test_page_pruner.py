@@ -0,0 +1,87 @@
+import io
+
+import pikepdf
+import pytest
+
+from services.loader import PagePruner
+
+
+KEYWORDS = ["resolucion", "tribunal", "rol", "rut", "por tanto"]
+RELEVANT_PAGE = "Resolucion del tribunal en la causa Rol C-1234-2024, por tanto se provee la demanda"
+IRRELEVANT_PAGE = "Control de calidad del ingreso bruto informado por la empresa durante el periodo"
+COVER_PAGE = "Escrito presentado por la parte demandante en la oficina judicial virtual"
+
+
+def build_pdf(path, pages: list[str | None]) -> str:
+    """Writes a PDF with one text page per string and one page without a text layer per None."""
+    pdf = pikepdf.new()
+    font = pdf.make_indirect(pikepdf.Dictionary(Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1, BaseFont=pikepdf.Name.Helvetica))
+    for text in pages:
+        page = pdf.add_blank_page(page_size=(612, 792))
+        if text is not None:
+            page.Resources = pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font))
+            page.Contents = pdf.make_stream(f"BT /F1 10 Tf 72 720 Td ({text}) Tj ET".encode())
+    pdf.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("text, score", [
+    ("Rol C-1234-2024, RUT 12.345.678-9", 2),
+    # Las palabras clave no cuentan dentro de otras palabras
+    ("Control de ingreso bruto", 0),
+    ("Tribunales y resoluciones", 0),
+    # Mayúsculas y tildes no cambian el puntaje
+    ("RESOLUCIÓN DEL TRIBUNAL", 2),
+    ("Por tanto, ruego a US.", 1),
+    ("Portanto", 0),
+])
+def test_scores_whole_words(text, score):
+    assert PagePruner(KEYWORDS, sample_dpi=0).score(text) == score
+
+
+def test_prunes_irrelevant_text_pages(tmp_path):
+    file_path = build_pdf(tmp_path / "resolucion.pdf", [COVER_PAGE, RELEVANT_PAGE, IRRELEVANT_PAGE, RELEVANT_PAGE])
+
+    total_pages, kept_pages, scores, sampled_pages, unscored_pages = PagePruner(KEYWORDS, sample_dpi=0).select_pages(file_path)
+
+    assert total_pages == 4
+    # La primera página se conserva aunque no tenga palabras clave
+    assert kept_pages == [0, 1, 3]
+    assert scores == {0: 0, 1: 4, 2: 0, 3: 4}
+    assert sampled_pages == unscored_pages == []
+
+
+def test_keeps_unscored_pages(tmp_path):
+    file_path = build_pdf(tmp_path / "escaneado.pdf", [COVER_PAGE, RELEVANT_PAGE, IRRELEVANT_PAGE, None])
+
+    _, kept_pages, scores, sampled_pages, unscored_pages = PagePruner(KEYWORDS, sample_dpi=0).select_pages(file_path)
+
+    assert kept_pages == [0, 1, 3]
+    assert 3 not in scores
+    assert sampled_pages == []
+    assert unscored_pages == [3]
+
+
+def test_keeps_pages_whose_sample_fails(tmp_path):
+    file_path = build_pdf(tmp_path / "escaneado.pdf", [COVER_PAGE, RELEVANT_PAGE, IRRELEVANT_PAGE, None])
+
+    # Tesseract falla con un idioma inexistente (o si no está instalado): la página queda sin puntaje y se conserva
+    _, kept_pages, _, sampled_pages, unscored_pages = PagePruner(KEYWORDS, sample_dpi=72, language="zzz").select_pages(file_path)
+
+    assert kept_pages == [0, 1, 3]
+    assert sampled_pages == []
+    assert unscored_pages == [3]
+
+
+def test_keeps_every_page_without_relevant_ones(tmp_path):
+    file_path = build_pdf(tmp_path / "otro.pdf", [COVER_PAGE, IRRELEVANT_PAGE, IRRELEVANT_PAGE])
+
+    _, kept_pages, _, _, _ = PagePruner(KEYWORDS, sample_dpi=0).select_pages(file_path)
+
+    assert kept_pages == [0, 1, 2]
+
+
+def test_short_files_are_not_scored(tmp_path):
+    file_path = build_pdf(tmp_path / "corto.pdf", [RELEVANT_PAGE, None])
+
+    assert PagePruner(KEYWORDS, min_pages=3).select_pages(file_path) == (2, [0, 1], {}, [], [])
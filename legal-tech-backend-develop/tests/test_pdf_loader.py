@@ -0,0 +1,44 @@
+import io
+
+import pikepdf
+
+from services.loader import PdfLoader, pdf_loader
+
+
+PAGES = ["Pagare suscrito en Santiago", "Monto adeudado 1.000.000 pesos", "Firma del deudor"]
+
+
+def build_pdf(pages: list[str]) -> bytes:
+    pdf = pikepdf.new()
+    font = pdf.make_indirect(pikepdf.Dictionary(Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1, BaseFont=pikepdf.Name.Helvetica))
+    for text in pages:
+        page = pdf.add_blank_page(page_size=(612, 792))
+        page.Resources = pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font))
+        page.Contents = pdf.make_stream(b"BT /F1 12 Tf 72 720 Td (" + text.encode() + b") Tj ET")
+    output = io.BytesIO()
+    pdf.save(output)
+    return output.getvalue()
+
+
+def test_lazy_load_reads_text_layer_in_pool(monkeypatch):
+    calls = []
+
+    def extract_text_pages(file_path, page_numbers=None):
+        calls.append(file_path)
+        return original(file_path, page_numbers)
+
+    original = pdf_loader.extract_text_pages
+    monkeypatch.setattr(pdf_loader, "extract_text_pages", extract_text_pages)
+    stream = io.BytesIO(build_pdf(PAGES))
+
+    documents = list(PdfLoader(stream, ocr_backend="local").lazy_load())
+
+    assert len(calls) == 1
+    assert [document.metadata["page"] for document in documents] == [0, 1, 2]
+    assert [document.page_content for document in documents] == PAGES
+
+
+def test_load_no_ocr_matches_lazy_load():
+    loader = PdfLoader(io.BytesIO(build_pdf(PAGES)), ocr_backend="local")
+
+    assert [document.page_content for document in loader.load_no_ocr()] == PAGES
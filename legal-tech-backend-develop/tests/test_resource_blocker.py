@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from playwright.async_api import async_playwright
+
+from services.pjud.browser_pool import BrowserPool, ResourceBlocker
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PJUD = "https://oficinajudicialvirtual.pjud.cl"
+# Latencia de cada imagen y fuente servida por el fixture, para que bloquearlas se note en el tiempo de carga
+ASSET_DELAY = 0.3
+PAGE_IMAGES = 8
+
+
+class RecordingRoute:
+    """Route with the request attributes ResourceBlocker reads, recording whether it was aborted or continued."""
+
+    def __init__(self, url: str, resource_type: str) -> None:
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome: str | None = None
+
+    async def abort(self, error_code: str | None = None) -> None:
+        self.outcome = f"abort:{error_code}"
+
+    async def continue_(self) -> None:
+        self.outcome = "continue"
+
+
+@pytest.mark.parametrize("url, resource_type", [
+    (f"{PJUD}/imagenes/logo.png", "image"),
+    (f"{PJUD}/fonts/fontawesome-webfont.woff2", "font"),
+    (f"{PJUD}/video/tutorial.mp4", "media"),
+    ("https://www.googletagmanager.com/gtag/js?id=G-PJUD", "script"),
+    ("https://region1.google-analytics.com/g/collect?v=2", "xhr"),
+    ("https://connect.facebook.net/en_US/fbevents.js", "script"),
+])
+def test_blocks_assets_and_analytics(url, resource_type):
+    blocker = ResourceBlocker()
+    route = RecordingRoute(url, resource_type)
+
+    asyncio.run(blocker.handle(route))
+
+    assert route.outcome == "abort:blockedbyclient"
+    assert (blocker.blocked_requests, blocker.allowed_requests) == (1, 0)
+
+
+@pytest.mark.parametrize("url, resource_type", [
+    (f"{PJUD}/indexN.php", "document"),
+    (f"{PJUD}/ADIR_871/civil/modal/causaCivil.php", "xhr"),
+    (f"{PJUD}/ADIR_871/civil/documentos/docuS.php", "fetch"),
+    (f"{PJUD}/js/jquery.min.js", "script"),
+    (f"{PJUD}/css/style.css", "stylesheet"),
+])
+def test_continues_documents_xhr_and_scripts(url, resource_type):
+    blocker = ResourceBlocker()
+    route = RecordingRoute(url, resource_type)
+
+    asyncio.run(blocker.handle(route))
+
+    assert route.outcome == "continue"
+    assert (blocker.blocked_requests, blocker.allowed_requests) == (0, 1)
+
+
+def test_allowed_hosts_are_never_blocked():
+    blocker = ResourceBlocker(allowed_hosts=["pjud.cl"])
+
+    assert blocker.should_block(f"{PJUD}/imagenes/logo.png", "image") is False
+    assert blocker.should_block("https://www.googletagmanager.com/gtag/js", "script") is True
+    # Un subdominio coincide con el dominio configurado, pero no un dominio que solo lo contiene
+    assert blocker.should_block("https://pjud.cl.example.com/logo.png", "image") is True
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Serves the fixture page, with slow images and fonts, a script and the XHR the script calls."""
+
+    def do_GET(self) -> None:
+        if self.path.startswith(("/img/", "/fonts/")):
+            time.sleep(ASSET_DELAY)
+            self._send(b"\0" * 1024, "image/png" if self.path.startswith("/img/") else "font/woff2")
+        elif self.path == "/js/app.js":
+            self._send(b"""
+                document.addEventListener("DOMContentLoaded", async () => {
+                    const causas = await (await fetch("/api/causas")).json();
+                    document.querySelector("#causas tbody").innerHTML = causas.map(rol => `<tr><td>${rol}</td></tr>`).join("");
+                });
+            """, "text/javascript")
+        elif self.path == "/api/causas":
+            self._send(b'["C-1234-2024", "C-5678-2024"]', "application/json")
+        else:
+            super().do_GET()
+
+    def _send(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def fixture_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(FixtureHandler, directory=str(FIXTURES)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/resource_page.html"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def chromium_installed() -> bool:
+    async with async_playwright() as playwright:
+        return Path(playwright.chromium.executable_path).exists()
+
+
+async def load_page(pool: BrowserPool, url: str, block_resources: bool) -> tuple[float, list[str]]:
+    async with pool.context(block_resources=block_resources) as context:
+        page = await context.new_page()
+        start = time.perf_counter()
+        await page.goto(url, wait_until="load")
+        elapsed = time.perf_counter() - start
+        await page.wait_for_selector("#causas tr")
+        return elapsed, await page.locator("#causas td").all_inner_texts()
+
+
+def test_blocking_speeds_up_fixture_page(fixture_url):
+    if not asyncio.run(chromium_installed()):
+        pytest.skip("Chromium is not installed for Playwright")
+
+    async def run() -> tuple[tuple[float, list[str]], tuple[float, list[str]], int]:
+        pool = BrowserPool(max_contexts=1, headless=True)
+        try:
+            # La primera carga calienta el navegador para no cargarle el arranque a ninguna medición
+            await load_page(pool, fixture_url, block_resources=True)
+            allowed = await load_page(pool, fixture_url, block_resources=False)
+            blocked_before = pool.metrics().blocked_requests
+            blocked = await load_page(pool, fixture_url, block_resources=True)
+            return allowed, blocked, pool.metrics().blocked_requests - blocked_before
+        finally:
+            await pool.stop()
+
+    (allowed_time, allowed_rows), (blocked_time, blocked_rows), blocked_requests = asyncio.run(run())
+
+    print(f"\nfixture page load: {allowed_time:.3f}s without blocking, {blocked_time:.3f}s with blocking")
+    # El script y la XHR de la página siguen funcionando con el bloqueo
+    assert allowed_rows == blocked_rows == ["C-1234-2024", "C-5678-2024"]
+    assert blocked_requests >= PAGE_IMAGES
+    assert blocked_time < allowed_time
+    assert allowed_time >= ASSET_DELAY
@@ -0,0 +1,89 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from services.pjud import step_profile
+from services.pjud.step_profile import StepProfile
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(step_profile, "time", SimpleNamespace(perf_counter=clock.perf_counter))
+    return clock
+
+
+def test_records_each_step(clock):
+    profile = StepProfile("PJUD cuaderno C-1234-2024")
+    with profile.step("open_search"):
+        clock.advance(1.5)
+    with profile.step("read_notebook_table"):
+        clock.advance(0.25)
+
+    assert [(timing.step, timing.duration) for timing in profile.timings()] == [("open_search", 1.5), ("read_notebook_table", 0.25)]
+    assert profile.total == 1.75
+
+
+def test_repeated_steps_are_summed_in_first_run_order(clock):
+    profile = StepProfile("PJUD demanda")
+    for seconds in (0.5, 0.75, 1.0):
+        with profile.step("add_defendant"):
+            clock.advance(seconds)
+        with profile.step("wait_modal_closed"):
+            clock.advance(0.1)
+    with profile.step("submit"):
+        clock.advance(2.0)
+
+    assert [(timing.step, timing.duration) for timing in profile.timings()] == [
+        ("add_defendant", 2.25),
+        ("wait_modal_closed", 0.3),
+        ("submit", 2.0),
+    ]
+    assert sum(timing.duration for timing in profile.timings()) == pytest.approx(profile.total)
+
+
+def test_failed_step_is_still_timed(clock):
+    profile = StepProfile("PJUD cuaderno")
+    with pytest.raises(TimeoutError):
+        with profile.step("wait_search_results"):
+            clock.advance(5.0)
+            raise TimeoutError
+
+    assert [(timing.step, timing.duration) for timing in profile.timings()] == [("wait_search_results", 5.0)]
+
+
+def test_durations_are_rounded_to_milliseconds(clock):
+    profile = StepProfile("PJUD cuaderno")
+    with profile.step("download_milestone_pdfs"):
+        clock.advance(0.123456)
+
+    assert profile.timings()[0].duration == 0.123
+
+
+def test_summary_logs_slowest_step_first(clock, caplog):
+    profile = StepProfile("PJUD cuaderno")
+    with profile.step("open_search"):
+        clock.advance(1.0)
+    with profile.step("download_milestone_pdfs"):
+        clock.advance(3.0)
+
+    with caplog.at_level(logging.INFO):
+        profile.log_summary()
+
+    assert caplog.messages == [
+        ">>> ⏱️ [PJUD cuaderno] Perfil de tiempos (4.00s en total):",
+        ">>>    download_milestone_pdfs: 3.00s (75%)",
+        ">>>    open_search: 1.00s (25%)",
+    ]
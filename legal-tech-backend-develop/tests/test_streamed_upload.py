@@ -0,0 +1,107 @@
+import io
+import os
+
+import pikepdf
+import pytest
+from botocore.stub import Stubber
+
+from config import Config
+from services.loader.file_source import COPY_CHUNK_SIZE
+from services.v2.document.base import Metrics
+from services.v2.document.bill import BillExtractor, BillExtractorInput
+from storage import S3Storage
+from storage.s3_storage import UPLOAD_TRANSFER_CONFIG
+
+
+UPLOAD_SIZE = 5 * UPLOAD_TRANSFER_CONFIG.multipart_chunksize
+PDF_PAGES = 4
+# Bytes aleatorios que no se comprimen, para que el PDF supere el límite de Textract síncrono
+PDF_PADDING = 24 * 1024 * 1024
+
+
+class RecordingStream(io.RawIOBase):
+    """Binary stream over an in-memory file that records the largest single read."""
+
+    def __init__(self, data: bytes, seekable: bool = True) -> None:
+        self._data = data
+        self._position = 0
+        self._seekable = seekable
+        self.max_read = 0
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self._seekable
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = len(self._data) - self._position
+        chunk = self._data[self._position:self._position + size]
+        self._position += len(chunk)
+        self.max_read = max(self.max_read, len(chunk))
+        self.bytes_read += len(chunk)
+        return chunk
+
+    def readinto(self, buffer) -> int:
+        chunk = self.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if not self._seekable:
+            raise io.UnsupportedOperation("seek")
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: len(self._data)}[whence]
+        self._position = base + offset
+        return self._position
+
+    def tell(self) -> int:
+        if not self._seekable:
+            raise io.UnsupportedOperation("tell")
+        return self._position
+
+
+def build_pdf() -> bytes:
+    pdf = pikepdf.new()
+    font = pdf.make_indirect(pikepdf.Dictionary(Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1, BaseFont=pikepdf.Name.Helvetica))
+    for page_number in range(PDF_PAGES):
+        page = pdf.add_blank_page(page_size=(612, 792))
+        page.Resources = pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font))
+        text = f"Factura numero {page_number + 1} por la suma total de 1.000.000 pesos"
+        page.Contents = pdf.make_stream(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode())
+    pdf.Root.Padding = pdf.make_stream(os.urandom(PDF_PADDING))
+    output = io.BytesIO()
+    pdf.save(output, compress_streams=False)
+    return output.getvalue()
+
+
+def test_save_stream_reads_in_parts(monkeypatch):
+    monkeypatch.setattr(Config, "AWS_REGION", "us-east-1")
+    monkeypatch.setattr(Config, "S3_BUCKET", "legal-tech-test")
+    storage = S3Storage()
+    stream = RecordingStream(os.urandom(UPLOAD_SIZE), seekable=False)
+    with Stubber(storage.client) as stubber:
+        stubber.add_response("create_multipart_upload", {"UploadId": "upload"})
+        for _ in range(UPLOAD_SIZE // UPLOAD_TRANSFER_CONFIG.multipart_chunksize):
+            stubber.add_response("upload_part", {"ETag": '"etag"'})
+        stubber.add_response("complete_multipart_upload", {})
+        storage.save_stream("textract-temp/large.pdf", stream)
+        stubber.assert_no_pending_responses()
+
+    assert stream.bytes_read == UPLOAD_SIZE
+    assert stream.max_read <= UPLOAD_TRANSFER_CONFIG.multipart_chunksize
+
+
+def test_extractor_reads_source_in_chunks(monkeypatch):
+    monkeypatch.setattr(Config, "OCR_BACKEND", "local")
+    data = build_pdf()
+    stream = RecordingStream(data)
+    extractor = BillExtractor(BillExtractorInput(), stream)
+
+    documents = extractor._load_documents(extractor.source, Metrics(label="test"))
+
+    assert [document.metadata["page"] for document in documents] == list(range(PDF_PAGES))
+    assert documents[0].page_content.startswith("Factura numero 1")
+    assert len(data) > PDF_PADDING
+    assert stream.max_read <= COPY_CHUNK_SIZE
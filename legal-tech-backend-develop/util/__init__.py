@@ -1 +1,2 @@
 from .generator import int_to_ordinal, int_to_roman
+from .pagination import CURSOR_DESCRIPTION, TOTAL_DESCRIPTION, InvalidCursor, TotalMode, count_rows, keyset_page
@@ -0,0 +1,158 @@
+import base64
+import json
+import logging
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Sequence
+from uuid import UUID
+
+from sqlalchemy import text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, func, select
+
+
+CURSOR_DESCRIPTION = (
+    "Opaque cursor for keyset pagination, taken from `next_cursor` of the previous page. "
+    "Send it empty to get the first page; `skip` is ignored when present"
+)
+
+# Header con el cursor de la página siguiente en endpoints que responden una lista
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class TotalMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+TOTAL_DESCRIPTION = "How to compute the total: exact count, planner estimate from table statistics, or none"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "u" in value:
+            return UUID(value["u"])
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise InvalidCursor("Invalid cursor")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encodes the sort key of the last row of a page as an opaque, URL safe cursor."""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """Decodes a cursor built by `encode_cursor`. An empty cursor means the first page."""
+    if not cursor:
+        return []
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+        if not isinstance(values, list):
+            raise InvalidCursor("Invalid cursor")
+        return [_decode_value(value) for value in values]
+    except InvalidCursor:
+        raise
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+def keyset_page(
+        session: Session,
+        query,
+        keys: list,
+        key_of: Callable[[Any], tuple],
+        cursor: str,
+        limit: int,
+        descending: bool = False,
+    ) -> tuple[list, str | None]:
+    """
+    Returns the page of `query` after `cursor` ordered by `keys`, a unique sort key, and the cursor of the next page.
+    Each page is a range scan on the key instead of skipping every previous row, so deep pages cost the same as the
+    first one.
+
+    Args:
+        session: Database session
+        query: Filtered select, without ordering nor pagination
+        keys: Columns or expressions of the sort key, the last one unique (usually the primary key)
+        key_of: Returns the sort key values of a result row, in the order of `keys`
+        cursor: Cursor of the previous page, empty for the first page
+        limit: Maximum number of rows of the page
+        descending: Order by the key descending
+
+    Returns:
+        tuple[list, str | None]: The rows of the page, and the cursor of the next one (None on the last page)
+    """
+    values = decode_cursor(cursor)
+    if values:
+        if len(values) != len(keys):
+            raise InvalidCursor("Invalid cursor")
+        after = tuple_(*keys) < tuple_(*values) if descending else tuple_(*keys) > tuple_(*values)
+        query = query.where(after)
+    query = query.order_by(*(key.desc() if descending else key.asc() for key in keys)).limit(limit + 1)
+    # unique() es necesario cuando la consulta carga colecciones con joinedload
+    rows = list(session.exec(query).unique().all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key_of(rows[-1]))
+
+
+def estimate_rows(session: Session, query) -> int | None:
+    """
+    Returns the planner row estimate of `query`, read from pg_class for a whole table and from EXPLAIN when the query
+    has filters. None if Postgres has no statistics for it yet.
+    """
+    froms = query.get_final_froms()
+    if query.whereclause is None and len(froms) == 1 and getattr(froms[0], "name", None):
+        estimate = session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": froms[0].name},
+        ).scalar()
+        # reltuples es -1 mientras la tabla no se haya analizado
+        return estimate if estimate is not None and estimate >= 0 else None
+    compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(session: Session, query, mode: TotalMode = TotalMode.EXACT) -> int | None:
+    """
+    Returns the number of rows of `query` as requested by `mode`. Estimates fall back to an exact count when no
+    estimate is available.
+    """
+    if mode == TotalMode.NONE:
+        return None
+    if mode == TotalMode.ESTIMATE:
+        try:
+            estimate = estimate_rows(session, query)
+            if estimate is not None:
+                return estimate
+        except Exception as e:
+            logging.warning(f">>> ⚠️ No se pudo estimar el total, se contará exacto: {e}")
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    return session.exec(count_query).one()